@@ -0,0 +1,289 @@
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+class BusScheduler:
+    """
+    Sits between the ClockModules and the hardware i2c buses, keeps one outgoing queue per machine.I2C
+    and drains the queues of different buses at the same time, one of them on the second core of the RP2040
+
+    Outside of a batch every transaction goes out immediately, inside a batch (with scheduler: ...) transactions
+    are queued and sent when the outermost batch ends, so a broadcast to the modules on two buses takes about half
+    the time it takes on one core
+
+    With second_core the second core owns both buses instead: every transaction is put into a ring that a worker
+    on the second core drains while this core carries on, only flush() and reads wait for it. Devices on the same
+    buses that are not driven by the scheduler have to be accessed through shared_bus(). The rp2 port allows a single
+    thread next to the main one and a machine.I2C transfer blocks the core it runs on, so that worker sends the ring
+    one transaction after the other, the buses are not driven in parallel in this mode
+
+    ...
+
+    Attributes
+    ----------
+    buses : List[machine.I2C]
+        the distinct buses handled by the scheduler
+    queues : List[List[tuple]]
+        one queue of (module, buffer, read_count) per bus, buffer is None for reads, written buffers are frame slots
+        of the module that it only reuses once they are transmitted
+    peak_depth : int
+        largest number of transactions that were queued on a single bus at once, with second_core in the ring
+    parallel_buses : bool
+        wether a worker on the second core drains one of the queues while this core drains the others
+    second_core : bool
+        wether the second core owns the buses and drains the ring
+    """
+
+    def __init__(self, i2c_bus_list, parallel_buses=True, second_core=False, ring_size=64):
+        self.buses = []
+        for bus in i2c_bus_list:
+            if bus not in self.buses:
+                self.buses.append(bus)
+
+        self.queues = [[] for _ in self.buses]
+        self.peak_depth = 0
+        self.__batch_depth = 0
+
+        self.__pending_error = None
+        self.__resend_modules = [[] for _ in self.buses] # per bus, only added to by the core that drains the bus
+        # both modes need the only extra thread, the ring takes it if both are asked for
+        self.second_core = second_core and _thread is not None
+        self.parallel_buses = parallel_buses and not self.second_core and _thread is not None and len(self.buses) > 1
+
+        if self.second_core:
+            # single producer single consumer ring, only this core moves the head and only the worker the tail,
+            # so neither needs a lock to touch the entries. One entry stays empty to tell a full ring from an empty one
+            self.__ring_modules = [None] * ring_size
+            self.__ring_buffers = [None] * ring_size
+            self.__ring_reads = [0] * ring_size
+            self.__head = 0
+            self.__tail = 0
+
+            # released by this core when it added work, and by the worker once the ring is empty and flush() waits
+            self.__wake_lock = _thread.allocate_lock()
+            self.__drained_lock = _thread.allocate_lock()
+            self.__wake_lock.acquire()
+            self.__drained_lock.acquire()
+            self.__drain_waiting = False
+            _thread.start_new_thread(self.__owner, ())
+        elif self.parallel_buses:
+            # the worker waits on start_lock for a queue and releases done_lock once it is transmitted
+            self.__worker_queue = None
+            self.__worker_error = None
+            self.__start_lock = _thread.allocate_lock()
+            self.__done_lock = _thread.allocate_lock()
+            self.__start_lock.acquire()
+            self.__done_lock.acquire()
+            _thread.start_new_thread(self.__worker, ())
+
+    def __enter__(self):
+        self.__batch_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__batch_depth -= 1
+        if self.__batch_depth == 0 and not self.second_core:
+            self.flush()
+        return False
+
+    def write(self, module, buffer):
+        if self.second_core:
+            self.__push(module, buffer, 0)
+        elif self.__batch_depth == 0:
+            module.i2c_transmit(buffer)
+            self.__start_resends()
+        else:
+            self.__enqueue(module, buffer, 0)
+
+    def read(self, module, byte_count):
+        """
+        queues a read, the result is stored in module.last_read once the batch is flushed
+        """
+        if self.second_core:
+            self.__push(module, None, byte_count)
+        elif self.__batch_depth == 0:
+            module.last_read = module.i2c_receive(byte_count)
+        else:
+            self.__enqueue(module, None, byte_count)
+
+    def __enqueue(self, module, buffer, read_count):
+        queue = self.queues[self.buses.index(module.i2c_bus)]
+        queue.append((module, buffer, read_count))
+
+        if len(queue) > self.peak_depth:
+            self.peak_depth = len(queue)
+
+    def shared_bus(self, bus):
+        """
+        bus for a device that is accessed directly from this core, with second_core it waits until the worker
+        is done with the bus before every transaction
+        """
+        if not self.second_core:
+            return bus
+        return SharedBus(bus, self)
+
+    def __push(self, module, buffer, read_count):
+        size = len(self.__ring_modules)
+        head = self.__head
+        next_head = (head + 1) % size
+        if next_head == self.__tail:
+            self.flush() # ring is full
+
+        self.__ring_modules[head] = module
+        self.__ring_buffers[head] = buffer
+        self.__ring_reads[head] = read_count
+        self.__head = next_head # publishes the entry, after it is complete
+
+        depth = (next_head - self.__tail) % size
+        if depth > self.peak_depth:
+            self.peak_depth = depth
+
+        self.__wake()
+
+    def __wake(self):
+        # only this core releases the lock, so it can't be released while it is unlocked
+        if self.__wake_lock.locked():
+            self.__wake_lock.release()
+
+    def flush(self):
+        if self.second_core:
+            if self.__tail != self.__head:
+                self.__drain_waiting = True
+                self.__wake()
+                self.__drained_lock.acquire() # the worker releases it once the ring is empty
+            self.__raise_pending_error()
+            return
+
+        pending = [queue for queue in self.queues if len(queue) > 0]
+
+        error = None
+        if self.parallel_buses and len(pending) > 1:
+            # the second core takes the first queue, this core transmits the others in the meantime
+            self.__worker_queue = pending[0]
+            self.__start_lock.release()
+
+            for queue in pending[1:]:
+                queue_error = self.__drain(queue)
+                if error is None:
+                    error = queue_error
+
+            self.__done_lock.acquire() # wait for the second core to finish its bus
+            if error is None:
+                error = self.__worker_error
+            self.__worker_error = None
+        else:
+            for queue in pending:
+                queue_error = self.__drain(queue)
+                if error is None:
+                    error = queue_error
+
+        self.__start_resends()
+        if error is not None:
+            raise error
+
+    def resend_later(self, module):
+        """
+        called by the core that transmitted a dropped acknowledged frame of module, the module resends it from a task
+        that is started on this core once the transmitting is done
+        """
+        self.__resend_modules[self.buses.index(module.i2c_bus)].append(module)
+
+    def __start_resends(self):
+        for modules in self.__resend_modules:
+            for module in modules:
+                module.resend_held()
+            del modules[:]
+
+    def __raise_pending_error(self):
+        if self.__pending_error is not None:
+            error = self.__pending_error
+            self.__pending_error = None
+            raise error
+
+    def __drain(self, queue):
+        # every queued transaction is sent even if one fails, so each frame is consumed, returns the first error
+        error = None
+        for module, buffer, read_count in queue:
+            try:
+                if buffer is not None:
+                    module.i2c_transmit(buffer)
+                else:
+                    module.last_read = module.i2c_receive(read_count)
+            except Exception as e:
+                if error is None:
+                    error = e
+        del queue[:]
+        return error
+
+    def __worker(self):
+        while True:
+            self.__start_lock.acquire()
+            self.__worker_error = self.__drain(self.__worker_queue)
+            self.__done_lock.release()
+
+    def __owner(self):
+        # one transaction at a time across both buses, there is no third thread that could drive the other bus
+        size = len(self.__ring_modules)
+        while True:
+            self.__wake_lock.acquire()
+
+            while self.__tail != self.__head:
+                index = self.__tail
+                module = self.__ring_modules[index]
+                buffer = self.__ring_buffers[index]
+                try:
+                    if buffer is not None:
+                        module.i2c_transmit(buffer)
+                    else:
+                        module.last_read = module.i2c_receive(self.__ring_reads[index])
+                except Exception as e:
+                    if self.__pending_error is None:
+                        self.__pending_error = e # raised on this core by the next flush, the other entries still go out
+
+                self.__ring_modules[index] = None
+                self.__ring_buffers[index] = None
+                self.__tail = (index + 1) % size # frees the entry, after it is sent
+
+            if self.__drain_waiting:
+                self.__drain_waiting = False
+                self.__drained_lock.release()
+
+
+class SharedBus:
+    """
+    stands in for a machine.I2C that the worker of a BusScheduler with second_core owns, waits for the worker to
+    finish its transactions before each of its own, for devices like the rtc that are accessed from the first core
+    """
+
+    def __init__(self, bus, scheduler):
+        self.bus = bus
+        self.scheduler = scheduler
+
+    def readfrom(self, address, nbytes, stop=True):
+        self.scheduler.flush()
+        return self.bus.readfrom(address, nbytes, stop)
+
+    def readfrom_into(self, address, buf, stop=True):
+        self.scheduler.flush()
+        self.bus.readfrom_into(address, buf, stop)
+
+    def writeto(self, address, buf, stop=True):
+        self.scheduler.flush()
+        return self.bus.writeto(address, buf, stop)
+
+    def readfrom_mem(self, address, memaddr, nbytes, addrsize=8):
+        self.scheduler.flush()
+        return self.bus.readfrom_mem(address, memaddr, nbytes, addrsize=addrsize)
+
+    def readfrom_mem_into(self, address, memaddr, buf, addrsize=8):
+        self.scheduler.flush()
+        self.bus.readfrom_mem_into(address, memaddr, buf, addrsize=addrsize)
+
+    def writeto_mem(self, address, memaddr, buf, addrsize=8):
+        self.scheduler.flush()
+        self.bus.writeto_mem(address, memaddr, buf, addrsize=addrsize)
+
+    def scan(self):
+        self.scheduler.flush()
+        return self.bus.scan()
@@ -1,13 +1,17 @@
 import random
 from ClockStepperModule import ClockStepper
 from ClockStepperModule import ClockModule
+from BusScheduler import BusScheduler
 from DigitDisplay import DigitDisplay
 from DS3231_timekeeper import DS3231_timekeeper
 from PersistentStorage import PersistentStorage
+import Trace
 import uasyncio as asyncio
 import os
 import json
+import gc
 from machine import Timer
+from utime import ticks_ms, ticks_diff, ticks_add
 
 class ClockClock24:
     #be carefull that these dont exceed the maxximum speed set in the driver, if so the commands will be ignored
@@ -27,6 +31,18 @@ class ClockClock24:
     stepper_speed_analog = 30
     stepper_accel_analog = 20
     
+    #how long to wait before asking the modules again when they are still running after the predicted end of a movement
+    movement_poll_ms = 100
+    
+    #the garbage collector runs in the idle time after a movement, while the pointers move (an animation window) it only
+    #runs once this many bytes were allocated since the last collection, so a pause doesn't shift the delays of an animation
+    gc_threshold_idle = 8 * 1024
+    gc_threshold_animation = 64 * 1024
+    
+    #commands that match the known state of a stepper are not sent, every this many minutes that state is forgotten
+    #so a missed message is corrected by the next minute handler at the latest, 0 sends every command
+    shadow_refresh_m = 10
+    
     modes = {
       "night mode": 0,
       "visual": 1,  # every timechange has choreographies and stuff
@@ -37,7 +53,7 @@ class ClockClock24:
       "settings": 6,
       }
     
-    def __init__(self, slave_adr_list, i2c_bus_list, clk_i2c_bus, clk_interrupt_pin, ntp_module=None, steps_full_rev=4320, ntp_poll_freq_m=60):
+    def __init__(self, slave_adr_list, i2c_bus_list, clk_i2c_bus, clk_interrupt_pin, ntp_module=None, steps_full_rev=4320, ntp_poll_freq_m=60, shadow_refresh_m=None, acked_writes=False, pose_frames=True, parallel_buses=True, bus_core=False):
         # persistent data
         self.__nightmode_allowed_modes = [ClockClock24.modes["visual"],
                                           ClockClock24.modes["shortest path"],
@@ -65,7 +81,11 @@ class ClockClock24:
         self.persistent = PersistentStorage("settings", var_lst)
         
         self.alarm_flag = False
-        self.rtc = DS3231_timekeeper(self.new_minute_handler, clk_interrupt_pin, clk_i2c_bus)
+        self.__wake_flag = asyncio.ThreadSafeFlag() # set whenever run() has new work, wait_for_work() blocks on it
+        # with parallel_buses the second core sends the batch of one bus while this core sends the other, with bus_core
+        # it owns both buses instead and sends the queued commands while this core carries on
+        self.bus_scheduler = BusScheduler(i2c_bus_list, parallel_buses, bus_core) # lets the modules on different buses be commanded in parallel
+        self.rtc = DS3231_timekeeper(self.new_minute_handler, clk_interrupt_pin, self.bus_scheduler.shared_bus(clk_i2c_bus))
 
         self.steps_full_rev = steps_full_rev
         
@@ -93,6 +113,8 @@ class ClockClock24:
         self.animation_index = 0
         
         self.ntp_module = ntp_module
+        if ntp_module is not None:
+            ntp_module.i2c = self.bus_scheduler.shared_bus(ntp_module.i2c) # on one of the buses of the modules
         self.ntp_poll_freq_m = ntp_poll_freq_m #how often ntp is polled, should be more than the timeout
         self.ntp_timeout_s = 180 #for how long the ntp mopdule tries to retrieve the ntp
         self.ntp_validity_s = self.ntp_timeout_s #for how long the ntp stays valid in the ntp module after receving a ntp time
@@ -107,8 +129,27 @@ class ClockClock24:
         self.async_mode_change_task = None
         self.async_setting_page_task = None
         self.movement_done_event = asyncio.Event()
-        
-        self.clock_modules = [ClockModule(i2c_bus_list[module_index], slave_adr_list[module_index], steps_full_rev) for module_index in range(len(slave_adr_list))]
+        self.__movement_recheck_ms = ticks_ms()
+        
+        # garbage collection
+        self.gc_windows = 0 # animation windows so far
+        self.gc_window_collections = 0 # automatic collections noticed during an animation window
+        self.gc_idle_collections = 0 # collections run in the idle time after a movement
+        self.__gc_window_open = False
+        self.__gc_window_alloc = 0 # allocated heap at the last check of the window
+        self.__gc_collect_pending = False
+        gc.threshold(ClockClock24.gc_threshold_idle)
+        
+        self.clock_modules = [ClockModule(i2c_bus_list[module_index], slave_adr_list[module_index], steps_full_rev, self.bus_scheduler) for module_index in range(len(slave_adr_list))]
+        
+        if shadow_refresh_m is not None:
+            self.shadow_refresh_m = shadow_refresh_m
+        self.__shadow_age_m = 0 # minutes since the known stepper state was last forgotten
+        self.acked_writes = acked_writes # needs module firmware that reports its frame counter
+        for module in self.clock_modules:
+            module.shadow_enabled = self.shadow_refresh_m > 0
+            module.acked_writes = acked_writes
+            module.pose_frames = pose_frames # needs module firmware that understands the pose_frame command
         
         self.minute_steppers = [stepper for stepper_list in (module.minute_steppers for module in self.clock_modules) for stepper in stepper_list]
         self.hour_steppers = [stepper for stepper_list in (module.hour_steppers for module in self.clock_modules) for stepper in stepper_list]
@@ -173,8 +214,6 @@ class ClockClock24:
         
         self.__settings_do_display_new_time = [True, False, False, False, False, False, False, False, False, False, False]
         self.__settings_pagecount = len(self.__settings_display_funcs)
-        self.__persistent_data_changed = False
-        
         self.__reset_settings = False
         
         # night mode
@@ -186,30 +225,176 @@ class ClockClock24:
 
     async def run(self):
         if not self.movement_done_event.is_set():
-            if not self.is_running():
-                self.movement_done_event.set()
+            self.__check_movement_done()
+        
+        if self.__gc_window_open:
+            self.__check_gc_window()
 
         if self.alarm_flag:
+            if __debug__:
+                Trace.begin(Trace.RUN)
             self.send_heartbeat() # send heartbeat to all modules, so they know that the clock is still running at least once per minute
 
             self.alarm_flag = False
+            self.__age_shadow()
             hour, minute = self.rtc.get_hour_minute(bool(self.persistent.get_var("12 hour format")))
             self.display_time(hour, minute)
+            if __debug__:
+                Trace.end(Trace.RUN)
 
         await asyncio.sleep(0)
+        
+        # after the tasks that waited for the movement had their turn, unless they started the next one
+        if self.__gc_collect_pending and not self.__gc_window_open:
+            self.__gc_collect_pending = False
+            self.__idle_collect()
+
+    async def wait_for_work(self, timeout_ms=None):
+        """
+        blocks until run() has something to do, a new time to display or the predicted end of a movement that a task
+        waits for, instead of calling run() at a fixed rate. timeout_ms limits the wait
+        """
+        if self.alarm_flag:
+            return
+
+        deadline_ms = None
+        if not self.movement_done_event.is_set():
+            deadline_ms = self.__movement_deadline_ms()
+        elif self.__gc_window_open and ticks_diff(self.predicted_done_ms(), ticks_ms()) > 0:
+            deadline_ms = self.predicted_done_ms() # closes the animation window once the pointers stand still
+        
+        if deadline_ms is not None:
+            deadline_ms = max(0, ticks_diff(deadline_ms, ticks_ms()))
+            if timeout_ms is None or deadline_ms < timeout_ms:
+                timeout_ms = deadline_ms
+
+        if timeout_ms is None:
+            await self.__wake_flag.wait()
+        elif timeout_ms > 0:
+            try:
+                await asyncio.wait_for_ms(self.__wake_flag.wait(), timeout_ms)
+            except asyncio.TimeoutError:
+                pass
+
+    def clear_movement_done(self):
+        """clears movement_done_event before waiting for it, the main loop then wakes at the predicted end of the movement"""
+        self.movement_done_event.clear()
+        self.__begin_gc_window()
+        self.__wake_flag.set()
+
+    def __movement_deadline_ms(self):
+        deadline = self.predicted_done_ms()
+        if ticks_diff(self.__movement_recheck_ms, deadline) > 0:
+            deadline = self.__movement_recheck_ms
+        return deadline
+
+    def __check_movement_done(self):
+        # the motion model predicts when all steppers stop, the modules are only asked once that time has passed
+        now = ticks_ms()
+        if ticks_diff(now, self.__movement_deadline_ms()) < 0:
+            return
+
+        if self.is_running(): # model was too optimistic, confirm again a bit later
+            self.__movement_recheck_ms = ticks_add(now, ClockClock24.movement_poll_ms)
+        else:
+            self.__movement_recheck_ms = now
+            for module in self.clock_modules:
+                module.settle_model() # so the model never works with timestamps old enough to wrap around
+            self.movement_done_event.set()
+
+#region garbage collection
+
+    def __begin_gc_window(self):
+        if self.__gc_window_open:
+            self.__check_gc_window()
+            return
+        
+        self.__gc_window_open = True
+        self.gc_windows += 1
+        gc.threshold(ClockClock24.gc_threshold_animation)
+        self.__gc_window_alloc = gc.mem_alloc()
+
+    def __check_gc_window(self):
+        # micropython has no collection counter, but only a collection lowers the allocated heap, so several
+        # collections between two checks count once
+        alloc = gc.mem_alloc()
+        if alloc < self.__gc_window_alloc:
+            self.gc_window_collections += 1
+        self.__gc_window_alloc = alloc
+        
+        if not self.movement_done_event.is_set() or ticks_diff(ticks_ms(), self.predicted_done_ms()) < 0:
+            return
+        if self.async_display_task is not None and not self.async_display_task.done():
+            return # a timed animation that waits before starting the next pointers
+        
+        self.__gc_window_open = False
+        gc.threshold(ClockClock24.gc_threshold_idle)
+        self.__gc_collect_pending = True
+
+    def __idle_collect(self):
+        if __debug__:
+            Trace.begin(Trace.GC_COLLECT)
+        gc.collect()
+        self.gc_idle_collections += 1
+        if __debug__:
+            Trace.end(Trace.GC_COLLECT)
+
+    def gc_stats(self):
+        """dictionary of the garbage collection counters, for the repl"""
+        return {"windows": self.gc_windows,
+                "window collections": self.gc_window_collections,
+                "idle collections": self.gc_idle_collections,
+                "free": gc.mem_free(),
+                "allocated": gc.mem_alloc()}
+
+#endregion
+
+    def __age_shadow(self):
+        if self.acked_writes:
+            return # dropped frames are resent right away, the state is only forgotten when a module was reset
+        
+        self.__shadow_age_m += 1
+        if self.__shadow_age_m >= self.shadow_refresh_m:
+            self.invalidate_shadow()
+
+    def invalidate_shadow(self):
+        """the next speed, accel and move commands are sent to every stepper even if they match the known state"""
+        self.__shadow_age_m = 0
+        for module in self.clock_modules:
+            module.invalidate_shadow()
+
+    def predicted_done_ms(self):
+        """ticks_ms at which the motion model expects every stepper to be stopped"""
+        done_ms = self.clock_modules[0].predicted_done_ms
+        for module in self.clock_modules:
+            if ticks_diff(module.predicted_done_ms, done_ms) > 0:
+                done_ms = module.predicted_done_ms
+        return done_ms
 
     def new_minute_handler(self):
         if __debug__:
             print("Interrupt received")
+        self.request_time_display()
+
+    def request_time_display(self):
+        """the current time is displayed by the next run(), also before the next minute"""
         self.alarm_flag = True
+        self.__wake_flag.set()
 
     def display_time(self, hour: int, minute: int):
         if __debug__:
             print("New time displayed:", hour, minute)
             print('Twelve hour format:', bool(self.persistent.get_var("12 hour format")))
+            Trace.begin(Trace.DISPLAY_TIME, hour * 100 + minute)
+            Trace.begin(Trace.NEW_TIME, -1 if self.__current_mode is None else self.__current_mode)
 
+        self.__begin_gc_window()
         self.time_handler(hour, minute)
 
+        if __debug__:
+            Trace.end(Trace.NEW_TIME)
+            Trace.end(Trace.DISPLAY_TIME, hour * 100 + minute)
+
     def cancel_tasks(self):
         if self.async_display_task != None:
             self.async_display_task.cancel()
@@ -243,7 +428,7 @@ class ClockClock24:
         self.set_accel_all(ClockClock24.stepper_accel_fast)
         self.digit_display.display_mode(mode)
         
-        self.movement_done_event.clear()
+        self.clear_movement_done()
         await self.movement_done_event.wait()
         
         await asyncio.sleep(1.2) #so digit is visible for a few seconds
@@ -259,34 +444,34 @@ class ClockClock24:
             self.set_speed_all(ClockClock24.stepper_speed_stealth)
             self.set_accel_all(ClockClock24.stepper_accel_stealth)
             self.time_handler = self.time_change_handlers[ClockClock24.modes["stealth"]]
-            self.alarm_flag = True # so a new time is displayed instead of the mode number even before next minute
+            self.request_time_display() # so a new time is displayed instead of the mode number even before next minute
     
     def __shortest_path(self, start):
         if start:
             self.set_speed_all(ClockClock24.stepper_speed_default)
             self.set_accel_all(ClockClock24.stepper_accel_default)
             self.time_handler = self.time_change_handlers[ClockClock24.modes["shortest path"]]
-            self.alarm_flag = True # so a new time is displayed instead of the mode number even before next minute
+            self.request_time_display() # so a new time is displayed instead of the mode number even before next minute
     
     def __visual(self, start):
         if start:
             self.set_speed_all(ClockClock24.stepper_speed_default)
             self.set_accel_all(ClockClock24.stepper_accel_default)
             self.time_handler = self.time_change_handlers[ClockClock24.modes["visual"]]
-            self.alarm_flag = True # so a new time is displayed instead of the mode number even before next minute
+            self.request_time_display() # so a new time is displayed instead of the mode number even before next minute
     
     def __analog(self, start):
         if start:
             self.set_speed_all(ClockClock24.stepper_speed_analog)
             self.set_accel_all(ClockClock24.stepper_accel_analog)
             self.time_handler = self.time_change_handlers[ClockClock24.modes["analog"]]
-            self.alarm_flag = True # so a new time is displayed instead of the mode number even before next minute
+            self.request_time_display() # so a new time is displayed instead of the mode number even before next minute
     
     def __night_mode(self, start):
         if start:
             self.time_handler = self.time_change_handlers[ClockClock24.modes["night mode"]]
             self.__current_mode_night = -1
-            self.alarm_flag = True # so a new time is displayed instead of the mode number even before next minute
+            self.request_time_display() # so a new time is displayed instead of the mode number even before next minute
     
     def __settings(self, start):
         if start:
@@ -298,7 +483,6 @@ class ClockClock24:
             self.set_accel_all(ClockClock24.stepper_accel_fast)
             self.time_handler = self.time_change_handlers[ClockClock24.modes["settings"]]
             
-            self.__persistent_data_changed = False
             self.async_setting_page_task = asyncio.create_task(self.__settings_set_page(0))
         else:
             if __debug__:
@@ -311,10 +495,7 @@ class ClockClock24:
             if self.__reset_settings:
                 self.reset_settings()
                 
-            if self.__persistent_data_changed:
-                self.__persistent_data_changed = False
-
-                self.persistent.write_flash()
+            self.persistent.flush_if_dirty() # only written if a setting actually changed
 
     def __sleep(self, start):
         if start:
@@ -322,7 +503,7 @@ class ClockClock24:
             self.set_accel_all(ClockClock24.stepper_accel_default)
             self.time_handler = self.time_change_handlers[self.__current_mode]
 
-            self.alarm_flag = True # so a new time is displayed instead of the mode number even before next minute
+            self.request_time_display() # so a new time is displayed instead of the mode number even before next minute
 
 #endregion
 
@@ -377,11 +558,12 @@ class ClockClock24:
         # but there is a lot of spare capacity on the i2c bus.
         # Usually set acceleration is relatively expensive due to a sqrt, but if the acceleration is already set
         # it is not update by the driver, so this is not a problem.
+        # Commands matching the known state of the steppers are not sent, so unless the speed changed these
+        # only go out once every shadow_refresh_m minutes, with acked_writes only after a module was reset.
         self.set_speed_all(ClockClock24.stepper_speed_stealth)
         self.set_accel_all(ClockClock24.stepper_accel_stealth)
 
-        digits = [hour//10, hour%10, minute//10, minute%10]
-        self.digit_display.display_digits(digits, DigitDisplay.animations["stealth"])
+        self.digit_display.display_time(hour, minute, DigitDisplay.animations["stealth"])
         
     def __shortest_path_new_time(self, hour: int, minute: int):
         self.cancel_tasks()
@@ -390,8 +572,7 @@ class ClockClock24:
         self.set_speed_all(ClockClock24.stepper_speed_default)
         self.set_accel_all(ClockClock24.stepper_accel_default)
         
-        digits = [hour//10, hour%10, minute//10, minute%10]
-        self.digit_display.display_digits(digits, DigitDisplay.animations["shortest path"])
+        self.digit_display.display_time(hour, minute, DigitDisplay.animations["shortest path"])
         
     def __visual_new_time(self, hour: int, minute: int):
         self.cancel_tasks()
@@ -400,11 +581,10 @@ class ClockClock24:
         self.set_speed_all(ClockClock24.stepper_speed_default)
         self.set_accel_all(ClockClock24.stepper_accel_default)
         
-        digits = [hour//10, hour%10, minute//10, minute%10]
         if __debug__:
             print("animation id:", self.visual_animation_ids[self.animation_index],", current queue:", self.visual_animation_ids)
             
-        self.digit_display.display_digits(digits, self.visual_animation_ids[self.animation_index])
+        self.digit_display.display_time(hour, minute, self.visual_animation_ids[self.animation_index])
         
         self.animation_index += 1
         
@@ -505,7 +685,7 @@ class ClockClock24:
             if(rtc_hour != hour or rtc_minute != minute): #so time animations are definitely displayed
                 if __debug__:
                     print("Forced Display of new time since new ntp time differed")
-                self.alarm_flag = True
+                self.request_time_display()
         
     
 #endregion
@@ -536,7 +716,7 @@ class ClockClock24:
         self.input_lock_2 = True
         self.time_handler = self.__no_new_time # an empty time handler so a new time doesnt interrupt the displaying of the current mode
         self.digit_display.display_mode(self.__settings_current_page, True)
-        self.movement_done_event.clear() # wait until movement is completed
+        self.clear_movement_done() # wait until movement is completed
         await self.movement_done_event.wait()
         await asyncio.sleep(.8) #so digit is visible for a bit
         self.time_handler = self.time_change_handlers[self.__current_mode]
@@ -565,8 +745,6 @@ class ClockClock24:
             if __debug__:
                 print("settings time increment direction ", direction)
                 
-            self.__persistent_data_changed = True
-            
             self.__settings_modify_val_funcs[self.__settings_current_page](direction)
             
             self.__settings_update_display()
@@ -661,7 +839,7 @@ class ClockClock24:
                 
         self.persistent.set_var("one style", new_style)
         
-        self.digit_display.number_style_options[1] = new_style
+        self.digit_display.set_number_style(1, new_style)
         
         if __debug__:
             print("new one style:", new_style)
@@ -671,7 +849,7 @@ class ClockClock24:
                 
         self.persistent.set_var("eight style", new_style)
         
-        self.digit_display.number_style_options[8] = new_style
+        self.digit_display.set_number_style(8, new_style)
         
         if __debug__:
             print("new eight style:", new_style)
@@ -726,8 +904,7 @@ class ClockClock24:
 
     def __settings_display_time(self, hour, minute):
         self.cancel_display_tasks()
-        digits = [hour // 10, hour % 10, minute // 10, minute % 10]
-        self.digit_display.display_digits(digits, DigitDisplay.animations["shortest path"])
+        self.digit_display.display_time(hour, minute, DigitDisplay.animations["shortest path"])
         
     def __settings_time_format_disp(self):
         if bool(self.persistent.get_var("12 hour format")):
@@ -772,7 +949,6 @@ class ClockClock24:
     def reset_settings(self): 
         if __debug__:
             print("resetting all settings and time")   
-        self.__persistent_data_changed = False
         self.__reset_settings = False
         self.rtc.set_hour_minute(0, 0)
         self.persistent.reset_flash()
@@ -782,9 +958,9 @@ class ClockClock24:
         
         self.start_ntp()
 
-        self.digit_display.number_style_options[1] = self.persistent.get_var("one style")
-        self.digit_display.number_style_options[8] = self.persistent.get_var("eight style")
-        self.alarm_flag = True
+        self.digit_display.set_number_style(1, self.persistent.get_var("one style"))
+        self.digit_display.set_number_style(8, self.persistent.get_var("eight style"))
+        self.request_time_display()
     
 #endregion
         
@@ -797,8 +973,9 @@ class ClockClock24:
         true to enable driver of module
         false to disable
         """
-        for module in self.clock_modules:
-            module.enable_disable_driver_module(enable_disable)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.enable_disable_driver_module(enable_disable)
 
     def is_running(self) -> bool: #returns True if stepper is running
         for module in self.clock_modules:
@@ -811,141 +988,161 @@ class ClockClock24:
         """
         sends a heartbeat to all modules, so they can reset their watchdogs
         """
-        for module in self.clock_modules:
-            module.is_running_module()  # this will send a heartbeat to all modules
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                self.bus_scheduler.read(module, 1)  # any read counts as a heartbeat for the modules
     
     def set_speed_all(self, speed: int):
         self.current_speed = speed
-        for module in self.clock_modules:
-            module.all_steppers.set_speed(speed)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_steppers.set_speed(speed)
     
     def set_accel_all(self, accel: int):
         self.current_accel = accel
-        for module in self.clock_modules:
-            module.all_steppers.set_accel(accel)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_steppers.set_accel(accel)
     
     def move_to_all(self, position: int, direction = 0):
-        for module in self.clock_modules:
-            for stepper in module.steppers:
-                stepper.current_target_pos = position
-                
-            module.all_steppers.move_to(position, direction)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_steppers.move_to(position, direction)
     
     def move_to_extra_revs_all(self, position: int, direction: int, extra_revs: int):
-        for module in self.clock_modules:
-            for stepper in module.steppers:
-                stepper.current_target_pos = position
-                
-            module.all_steppers.move_to_extra_revs(position, direction, extra_revs)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_steppers.move_to_extra_revs(position, direction, extra_revs)
 
     def moveTo_min_steps_all(self, position: int, direction: int, min_steps: int): 
-        for module in self.clock_modules:
-            for stepper in module.steppers:
-                stepper.current_target_pos = position
-                
-            module.all_steppers.move_to_min_steps(position, direction, min_steps)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_steppers.move_to_min_steps(position, direction, min_steps)
     
     def move_all(self, distance: int, direction: int):
-        for module in self.clock_modules:
-            for stepper in module.steppers:
-                stepper.current_target_pos = (distance * direction) % module.steps_full_rev
-                
-            module.all_steppers.move(distance, direction)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_steppers.move(distance, direction)
         
     def stop_all(self):
-        for module in self.clock_modules:
-            for stepper in module.steppers:
-                stepper.current_target_pos = -1
-                
-            module.all_steppers.stop()
-    
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_steppers.stop()
+
+    # control every stepper individually with one frame per module
+    # directions and extras can be a single int for all pointers or a list of 24, a list of positions of None skips those pointers
+    def move_to_pose(self, new_positions_h, new_positions_m, direction_h = 0, direction_m = 0):
+        self.move_pose(ClockModule.cmd_id["moveTo"], new_positions_h, new_positions_m, direction_h, direction_m, 0, 0)
+
+    def move_to_extra_revs_pose(self, new_positions_h, new_positions_m, direction_h: int, direction_m: int, extra_revs: int):
+        self.move_pose(ClockModule.cmd_id["moveTo_extra_revs"], new_positions_h, new_positions_m, direction_h, direction_m, extra_revs, extra_revs)
+
+    def moveTo_min_steps_pose(self, new_positions_h, new_positions_m, direction_h, direction_m, min_steps_h, min_steps_m):
+        self.move_pose(ClockModule.cmd_id["moveTo_min_steps"], new_positions_h, new_positions_m, direction_h, direction_m, min_steps_h, min_steps_m)
+
+    def move_pose(self, mode, new_positions_h, new_positions_m, direction_h, direction_m, extra_h, extra_m):
+        """
+        one pose frame per module, mode is the ClockModule.cmd_id of the move command, directions and extras are an
+        int for every pointer or a list by clk index, a position of None leaves the pointer untouched
+        """
+        positions = [None] * 8
+        directions = [0] * 8
+        extras = [0] * 8
+
+        with self.bus_scheduler:
+            for module_index, module in enumerate(self.clock_modules):
+                for sub_index in range(4):
+                    clk_index = module_index * 4 + sub_index
+
+                    # sub ids 0-3 are the minute steppers, 4-7 the hour steppers of a module
+                    if new_positions_m is not None:
+                        positions[sub_index] = new_positions_m[clk_index]
+                        directions[sub_index] = self.__pose_value(direction_m, clk_index)
+                        extras[sub_index] = self.__pose_value(extra_m, clk_index)
+                    if new_positions_h is not None:
+                        positions[sub_index + 4] = new_positions_h[clk_index]
+                        directions[sub_index + 4] = self.__pose_value(direction_h, clk_index)
+                        extras[sub_index + 4] = self.__pose_value(extra_h, clk_index)
+
+                module.move_pose(mode, positions, directions, extras)
+
+    @staticmethod
+    def __pose_value(value, clk_index):
+        if type(value) is int:
+            return value
+        return value[clk_index]
+
     # control hour steppers
     def set_speed_hour(self, speed: int):
-        for module in self.clock_modules:
-            module.all_hour_steppers.set_speed(speed)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_hour_steppers.set_speed(speed)
     
     def set_accel_hour(self, accel: int):
-        for module in self.clock_modules:
-            module.all_hour_steppers.set_accel(accel)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_hour_steppers.set_accel(accel)
     
     def move_to_hour(self, position: int, direction = 0):
-        for module in self.clock_modules:
-            for stepper in module.hour_steppers:
-                stepper.current_target_pos = position
-                
-            module.all_hour_steppers.move_to(position, direction)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_hour_steppers.move_to(position, direction)
     
     def move_to_extra_revs_hour(self, position: int, direction: int, extra_revs: int):
-        for module in self.clock_modules:
-            for stepper in module.hour_steppers:
-                stepper.current_target_pos = position
-                
-            module.all_hour_steppers.move_to_extra_revs(position, direction, extra_revs)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_hour_steppers.move_to_extra_revs(position, direction, extra_revs)
 
     def moveTo_min_steps_hour(self, position: int, direction: int, min_steps: int): 
-        for module in self.clock_modules:
-            for stepper in module.hour_steppers:
-                stepper.current_target_pos = position
-                
-            module.all_hour_steppers.move_to_min_steps(position, direction, min_steps)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_hour_steppers.move_to_min_steps(position, direction, min_steps)
     
     def move_hour(self, distance: int, direction: int):
-        for module in self.clock_modules:
-            for stepper in module.hour_steppers:
-                stepper.current_target_pos = (distance * direction) % module.steps_full_rev
-                
-            module.all_hour_steppers.move(distance, direction)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_hour_steppers.move(distance, direction)
         
     def stop_hour(self):
-        for module in self.clock_modules:
-            for stepper in module.hour_steppers:
-                stepper.current_target_pos = -1
-                
-            module.all_hour_steppers.stop()
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_hour_steppers.stop()
     
     # control minute steppers
     def set_speed_minute(self, speed: int):
-        for module in self.clock_modules:
-            module.all_minute_steppers.set_speed(speed)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_minute_steppers.set_speed(speed)
     
     def set_accel_minute(self, accel: int):
-        for module in self.clock_modules:
-            module.all_minute_steppers.set_accel(accel)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_minute_steppers.set_accel(accel)
     
     def move_to_minute(self, position: int, direction = 0):
-        for module in self.clock_modules:
-            for stepper in module.minute_steppers:
-                stepper.current_target_pos = position
-                
-            module.all_minute_steppers.move_to(position, direction)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_minute_steppers.move_to(position, direction)
     
     def move_to_extra_revs_minute(self, position: int, direction: int, extra_revs: int):
-        for module in self.clock_modules:
-            for stepper in module.minute_steppers:
-                stepper.current_target_pos = position
-                
-            module.all_minute_steppers.move_to_extra_revs(position, direction, extra_revs)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_minute_steppers.move_to_extra_revs(position, direction, extra_revs)
 
     def moveTo_min_steps_minute(self, position: int, direction: int, min_steps: int): 
-        for module in self.clock_modules:
-            for stepper in module.minute_steppers:
-                stepper.current_target_pos = position
-                
-            module.all_minute_steppers.move_to_min_steps(position, direction, min_steps)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_minute_steppers.move_to_min_steps(position, direction, min_steps)
     
     def move_minute(self, distance: int, direction: int):
-        for module in self.clock_modules:
-            for stepper in module.minute_steppers:
-                stepper.current_target_pos = (distance * direction) % module.steps_full_rev
-                
-            module.all_minute_steppers.move(distance, direction)
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_minute_steppers.move(distance, direction)
         
     def stop_minute(self):
-        for module in self.clock_modules:
-            for stepper in module.minute_steppers:
-                stepper.current_target_pos = -1
-                
-            module.all_minute_steppers.stop()
+        with self.bus_scheduler:
+            for module in self.clock_modules:
+                module.all_minute_steppers.stop()
 
 #endregion
     
@@ -1,5 +1,10 @@
-from struct import pack
+from struct import pack_into
+from utime import ticks_ms, ticks_us, ticks_diff, ticks_add, sleep_ms
+import uasyncio as asyncio
 import machine
+import MotionModel
+import Trace
+from I2CMetrics import metrics
 
 #region clock moudle
 
@@ -13,19 +18,51 @@ class ClockModule: # module for 1 of the 6 pcbs in the clock
       "move": 5,
       "stop": 6,
       "wiggle": 7,
-      "moveTo_min_steps": 8
+      "moveTo_min_steps": 8,
+      "pose_frame": 9
     }
     
     stepper_selector = {"minute":-3,
                         "hour": -2,
                         "all": -1}
     
-    def __init__(self, i2c_bus: machine.I2C, i2c_address: int, steps_full_rev: int):
+    # acknowledged writes, how often a dropped frame is sent again and the wait before the first retry, doubled after each.
+    # the wait is awaited on the asyncio loop, only the worker of a scheduler on the second core sleeps through it
+    acked_retries = 3
+    acked_backoff_ms = 1
+    
+    # frames are encoded into a ring of preallocated buffers, a frame queued on the scheduler keeps its slot until it is sent
+    frame_slots = 4
+    
+    # the Wire library of the module firmware receives at most slave_rx_buffer bytes per write. A pose frame has 3 header
+    # bytes, 3 per stepper for moveTo (5 with the extra revs or min steps of the other modes) and the checksum, so a
+    # moveTo pose of all 8 steppers fits one frame and the other modes are split after pose_frame_steppers steppers
+    slave_rx_buffer = 32
+    pose_frame_steppers = (slave_rx_buffer - 4) // 5
+    frame_size = 4 + 5 * pose_frame_steppers # longest frame, a full pose frame followed by the checksum
+    
+    def __init__(self, i2c_bus: machine.I2C, i2c_address: int, steps_full_rev: int, scheduler=None):
         self.steps_full_rev = steps_full_rev
         self.i2c_bus = i2c_bus
         self.i2c_address = i2c_address
+        self.scheduler = scheduler # optional BusScheduler that queues the transactions of this module
+        self.last_read = (0,) # result of the last read queued on the scheduler
+        self.predicted_done_ms = ticks_ms() # when the motion model expects the last stepper of the module to stop
         self.sub_stepper_id = -1 # so it addresses all steppers
         self.is_driver_enabled = True
+        self.shadow_enabled = True # commands that match the known state of the steppers are not sent
+        self.acked_writes = False # every frame is verified with the frame counter of the module and resent if it was dropped
+        self.pose_frames = False # moves of several steppers are sent as pose frames instead of one command per stepper
+        self.__accepted_frames = None # frame counter of the module after the last verified frame, None if unknown
+        self.__held = [] # a dropped frame and the frames queued behind it, they keep their slots until they are resent
+        
+        self.__frames = [bytearray(ClockModule.frame_size) for _ in range(ClockModule.frame_slots)]
+        self.__frame_views = [[None] * (ClockModule.frame_size + 1) for _ in range(ClockModule.frame_slots)] # per slot and frame length, created on first use
+        self.__slot = 0
+        # frames handed on, only counted by this core, and frames transmitted, only counted by the core that transmits
+        # them, modulo 0x10000 so the worker of the scheduler can transmit while this core queues the next frames
+        self.__frames_queued = 0
+        self.__frames_sent = 0
             
         self.steppers = [ClockStepper(sub_id, self, self.steps_full_rev) for sub_id in range(8)]
         self.minute_steppers = self.steppers[:4]
@@ -43,45 +80,370 @@ class ClockModule: # module for 1 of the 6 pcbs in the clock
         true to enable driver of module
         false to disable
         """
-        buffer = pack("<BB", self.cmd_id["enable_driver"], int(enable_disable)) #cmd_id uint8, enable uint8         
+        pack_into("<BB", self.frame(), 0, self.cmd_id["enable_driver"], int(enable_disable)) #cmd_id uint8, enable uint8         
         
-        self.i2c_write(buffer)
+        self.i2c_write_frame(2)
             
         self.is_driver_enabled = enable_disable
+
+        if not enable_disable:
+            self.invalidate_shadow() # without holding torque the pointers could have been moved by hand
+    
+    def move_pose(self, mode: int, positions, directions, extras):
+        """
+        moves all 8 steppers of the module, with pose_frames in as few checksummed frames as fit the slave
+        mode is the cmd_id of the move command applied to each stepper (moveTo, moveTo_extra_revs or moveTo_min_steps)
+        positions, directions and extras are indexed by sub stepper id (0-3 minute, 4-7 hour steppers),
+        extras are the extra revs or min steps depending on the mode, a position of None leaves the stepper untouched
+        """
+        if not self.pose_frames: # module firmware without the pose_frame command
+            for sub_id in range(8):
+                if positions[sub_id] is not None:
+                    stepper = self.steppers[sub_id]
+                    if mode == self.cmd_id["moveTo_extra_revs"]:
+                        stepper.move_to_extra_revs(positions[sub_id], directions[sub_id], extras[sub_id])
+                    elif mode == self.cmd_id["moveTo_min_steps"]:
+                        stepper.move_to_min_steps(positions[sub_id], directions[sub_id], extras[sub_id])
+                    else:
+                        stepper.move_to(positions[sub_id], directions[sub_id])
+            return
+        
+        if mode == self.cmd_id["moveTo"]:
+            full_length = 3 + 3 * 8
+        else:
+            full_length = 3 + 5 * ClockModule.pose_frame_steppers
+        
+        mask = 0
+        length = 3
+        for sub_id in range(8):
+            if positions[sub_id] is not None:
+                if mode == self.cmd_id["moveTo"] and directions[sub_id] == 0 and self.steppers[sub_id].is_resting_at(positions[sub_id]):
+                    continue # already standing at the target, shortest path move would be a no-op
+
+                mask |= 1 << sub_id
+                if mode == self.cmd_id["moveTo"]:
+                    pack_into("<hb", self.frame(), length, positions[sub_id], directions[sub_id]) #position int16, dir int8
+                    length += 3
+                else:
+                    pack_into("<hbH", self.frame(), length, positions[sub_id], directions[sub_id], extras[sub_id]) #position int16, dir int8, extra uint16
+                    length += 5
+                
+                if length == full_length: # frame is full
+                    self.__send_pose_frame(mode, mask, length, positions, directions, extras)
+                    mask = 0
+                    length = 3
+
+        if mask != 0:
+            self.__send_pose_frame(mode, mask, length, positions, directions, extras)
+    
+    def __send_pose_frame(self, mode: int, mask: int, length: int, positions, directions, extras):
+        pack_into("<BBB", self.frame(), 0, self.cmd_id["pose_frame"], mode, mask) #cmd_id uint8, mode uint8, stepper mask uint8, followed by the masked steppers
+
+        for sub_id in range(8):
+            if mask & (1 << sub_id):
+                self.steppers[sub_id].shadow_valid |= ClockStepper.shadow_target
+
+        self.i2c_write_frame(length)
+
+        for sub_id in range(8):
+            if mask & (1 << sub_id):
+                stepper = self.steppers[sub_id]
+                if mode == self.cmd_id["moveTo_extra_revs"]:
+                    stepper.predict_move_to(positions[sub_id], directions[sub_id], extra_revs=extras[sub_id])
+                elif mode == self.cmd_id["moveTo_min_steps"]:
+                    stepper.predict_move_to(positions[sub_id], directions[sub_id], min_steps=extras[sub_id])
+                else:
+                    stepper.predict_move_to(positions[sub_id], directions[sub_id])
+                stepper.current_target_pos = positions[sub_id]
+    
+    def settle_model(self):
+        """
+        tells the motion model that all steppers of the module are confirmed to be stopped
+        """
+        now = ticks_ms()
+        for stepper in self.steppers:
+            stepper.move_start_pos = (stepper.move_start_pos + stepper.move_distance) % self.steps_full_rev
+            stepper.move_start_ms = now
+            stepper.move_distance = 0
+            stepper.move_done_ms = now
+        self.predicted_done_ms = now
+    
+    def note_move_done(self, done_ms):
+        """
+        called by the steppers of the module whenever the motion model predicts a new end of movement
+        """
+        if ticks_diff(done_ms, self.predicted_done_ms) > 0:
+            self.predicted_done_ms = done_ms
+    
+    def invalidate_shadow(self):
+        """
+        forgets the known state of all steppers, so the next command of each kind is sent again
+        """
+        for stepper in self.steppers:
+            stepper.shadow_valid = 0
+    
+    def is_ready(self) -> bool:
+        """
+        wether the module answers on the bus, a module that is still booting does not acknowledge its address
+        """
+        try:
+            self.i2c_bus.readfrom(self.i2c_address, 1) # running state, has no side effects on the module
+        except OSError:
+            return False
+        return True
     
     def is_running_module(self) -> bool: #returns True if stepper is running
         buffer = self.i2c_read(1)
         
         return (buffer[0] != 0)
     
+    def frame(self):
+        """
+        the preallocated buffer the next frame is encoded into with pack_into, sent with i2c_write_frame
+        """
+        if (self.__frames_queued - self.__frames_sent) & 0xffff >= ClockModule.frame_slots:
+            if self.scheduler is not None:
+                self.scheduler.flush() # every slot still holds a queued frame, the scheduler consumes all of them even if one fails
+            
+            if len(self.__held) > 0 and (self.__frames_queued - self.__frames_sent) & 0xffff >= ClockModule.frame_slots:
+                if not self.__send_held(): # held frames take every slot, no time left to wait for their backoff
+                    self.__drop_held()
+        
+        return self.__frames[self.__slot]
+    
+    def i2c_write_frame(self, length: int):
+        """
+        appends the checksum to the first length bytes of the frame and sends them, without allocating once the
+        memoryview for the slot and length exists
+        """
+        frame = self.__frames[self.__slot]
+        frame[length] = self.calculate_Checksum(frame, length)
+        
+        views = self.__frame_views[self.__slot]
+        view = views[length]
+        if view is None:
+            view = views[length] = memoryview(frame)[:length + 1]
+        
+        self.__slot = (self.__slot + 1) % ClockModule.frame_slots
+        self.__frames_queued = (self.__frames_queued + 1) & 0xffff
+        
+        if self.scheduler is not None:
+            self.scheduler.write(self, view)
+        else:
+            self.i2c_transmit(view)
+    
     def i2c_write(self, buffer):
-        checksum = self.calculate_Checksum(buffer)
-        buffer += pack("<B", checksum)
-
+        frame = self.frame()
+        frame[:len(buffer)] = buffer
+        self.i2c_write_frame(len(buffer))
+    
+    def i2c_read(self, byte_count):
+        if self.scheduler is not None:
+            self.scheduler.flush() # so the read is not overtaking queued writes
+            
+        return self.i2c_receive(byte_count)
+    
+    def i2c_transmit(self, buffer):
+        if self.acked_writes:
+            self.__transmit_acked(buffer) # counts the frame as sent itself, a dropped one only once it is resent
+            return
+        
+        try:
+            self.__transmit(buffer)
+        finally:
+            self.__frame_sent()
+    
+    def __frame_sent(self):
+        self.__frames_sent = (self.__frames_sent + 1) & 0xffff # its slot can be reused once it is on the bus
+    
+    def __transmit(self, buffer):
         if __debug__:
+            Trace.begin(Trace.I2C_WRITE, self.i2c_address)
+            start_us = ticks_us()
             try:
                 self.i2c_bus.writeto(self.i2c_address, buffer)
+                metrics.record(self.i2c_bus, self.i2c_address, len(buffer), start_us, True)
             except:
+                metrics.record(self.i2c_bus, self.i2c_address, len(buffer), start_us, False)
+                self.invalidate_shadow() # unknown what the slave received
                 if self.verbose:
-                    print("Slave not found:", self.i2c_address, " Data:", buffer)
+                    print("Slave not found:", self.i2c_address, " Data:", bytes(buffer))
+            Trace.end(Trace.I2C_WRITE, self.i2c_address)
         else:
-            self.i2c_bus.writeto(self.i2c_address, buffer)
+            start_us = ticks_us()
+            try:
+                self.i2c_bus.writeto(self.i2c_address, buffer)
+                metrics.record(self.i2c_bus, self.i2c_address, len(buffer), start_us, True)
+            except:
+                metrics.record(self.i2c_bus, self.i2c_address, len(buffer), start_us, False)
+                self.invalidate_shadow()
+                raise
     
-    def i2c_read(self, byte_count):
+    def i2c_receive(self, byte_count):
         if __debug__:
+            Trace.mark(Trace.I2C_READ, self.i2c_address)
+            start_us = ticks_us()
             try:
-                return self.i2c_bus.readfrom(self.i2c_address, byte_count)
+                buffer = self.i2c_bus.readfrom(self.i2c_address, byte_count)
+                metrics.record(self.i2c_bus, self.i2c_address, byte_count, start_us, True)
+                return buffer
             except:
+                metrics.record(self.i2c_bus, self.i2c_address, byte_count, start_us, False)
                 if self.verbose:
                     print("Slave not found:", self.i2c_address, "Tried to read ", byte_count, "byte(s)")
                 return (0,)
         else:
-            return self.i2c_bus.readfrom(self.i2c_address, byte_count)
+            start_us = ticks_us()
+            try:
+                buffer = self.i2c_bus.readfrom(self.i2c_address, byte_count)
+                metrics.record(self.i2c_bus, self.i2c_address, byte_count, start_us, True)
+                return buffer
+            except:
+                metrics.record(self.i2c_bus, self.i2c_address, byte_count, start_us, False)
+                raise
+        
+    def __transmit_acked(self, buffer):
+        if len(self.__held) > 0:
+            self.__held.append(buffer) # behind a dropped frame, so the module gets the frames in order
+            return
+        
+        if self.scheduler is not None and self.scheduler.second_core:
+            # the worker on the second core can sleep through the backoff without stalling the asyncio loop
+            backoff_ms = ClockModule.acked_backoff_ms
+            accepted = self.__send_acked(buffer)
+            for _ in range(ClockModule.acked_retries):
+                if accepted is not False:
+                    break
+                metrics.retry(self.i2c_address)
+                sleep_ms(backoff_ms)
+                backoff_ms *= 2
+                accepted = self.__send_acked(buffer)
+            
+            self.__frame_sent()
+            if not accepted:
+                self.__not_acknowledged(buffer)
+                if not __debug__:
+                    raise OSError(5)
+            return
+        
+        accepted = self.__send_acked(buffer)
+        if accepted is False:
+            self.__held.append(buffer)
+            if self.scheduler is not None:
+                self.scheduler.resend_later(self) # this may be the worker of the scheduler, it has no asyncio loop
+            else:
+                self.resend_held()
+            return
         
-    def calculate_Checksum(self, buffer):
-        checksum = sum(buffer[i] for i in range(len(buffer))) % 256
+        self.__frame_sent()
+        if accepted is None:
+            self.__not_acknowledged(buffer)
+    
+    def resend_held(self):
+        """
+        starts the task that resends the held frames after the backoff, on the core that runs the asyncio loop
+        """
+        asyncio.create_task(self.__resend_held())
+    
+    async def __resend_held(self):
+        backoff_ms = ClockModule.acked_backoff_ms
+        for _ in range(ClockModule.acked_retries):
+            await asyncio.sleep_ms(backoff_ms)
+            backoff_ms *= 2
+            
+            if len(self.__held) == 0:
+                return # already sent by frame() when it needed their slots
+            
+            metrics.retry(self.i2c_address)
+            if self.__send_held():
+                return
+        
+        self.__drop_held()
+    
+    def __send_held(self):
+        # sends the held frames in order until one is dropped again, true once none is left
+        while len(self.__held) > 0:
+            accepted = self.__send_acked(self.__held[0])
+            if accepted is False:
+                return False
+            
+            buffer = self.__held.pop(0)
+            self.__frame_sent()
+            if accepted is None:
+                self.__not_acknowledged(buffer)
+        return True
+    
+    def __drop_held(self):
+        if len(self.__held) == 0:
+            return
+        
+        self.__not_acknowledged(self.__held[0])
+        for _ in range(len(self.__held)):
+            self.__frame_sent()
+        del self.__held[:]
+    
+    def __send_acked(self, buffer):
+        # needs module firmware that answers a 2 byte read with the running steppers and the number of frames it
+        # accepted modulo 256, a frame that didn't increase the counter was dropped.
+        # true once the module accepted the frame, false if it is worth sending again, None if unknown wether it arrived
+        if self.__accepted_frames is None:
+            self.__accepted_frames = self.__read_accepted_frames()
+            if self.__accepted_frames is None:
+                return False
+        
+        if __debug__:
+            Trace.begin(Trace.I2C_WRITE, self.i2c_address)
+        start_us = ticks_us()
+        try:
+            self.i2c_bus.writeto(self.i2c_address, buffer)
+            metrics.record(self.i2c_bus, self.i2c_address, len(buffer), start_us, True)
+        except OSError:
+            metrics.record(self.i2c_bus, self.i2c_address, len(buffer), start_us, False)
+            return False
+        finally:
+            if __debug__:
+                Trace.end(Trace.I2C_WRITE, self.i2c_address)
+        
+        accepted_frames = self.__read_accepted_frames()
+        if accepted_frames is None:
+            return None
+        
+        if accepted_frames == self.__accepted_frames:
+            return False # dropped
+        
+        if accepted_frames != (self.__accepted_frames + 1) & 0xff:
+            self.invalidate_shadow() # counter jumped, the module was probably reset and lost its state
+        
+        self.__accepted_frames = accepted_frames
+        return True
+    
+    def __not_acknowledged(self, buffer):
+        self.__accepted_frames = None
+        self.invalidate_shadow()
+        if __debug__:
+            if self.verbose:
+                print("Frame not acknowledged:", self.i2c_address, " Data:", bytes(buffer))
+    
+    def __read_accepted_frames(self):
+        start_us = ticks_us()
+        try:
+            status = self.i2c_bus.readfrom(self.i2c_address, 2)
+        except OSError:
+            metrics.record(self.i2c_bus, self.i2c_address, 2, start_us, False)
+            return None
+        
+        metrics.record(self.i2c_bus, self.i2c_address, 2, start_us, True)
+        return status[1]
+        
+    def calculate_Checksum(self, buffer, length=None):
+        if length is None:
+            length = len(buffer)
+        
+        checksum = 0
+        for i in range(length): # plain loop, a generator would allocate
+            checksum += buffer[i]
 
-        return checksum
+        return checksum & 0xff
 
 #endregion
         
@@ -107,6 +469,11 @@ class ClockStepper:
         the target position where stepper is currently moving to or is at
     steps_per_rev : int
         number of steps a stepper needs to make one revolution
+    move_done_ms : int
+        ticks_ms at which the motion model expects the current move to be finished
+    shadow_valid : int
+        bits (shadow_speed, shadow_accel, shadow_target) of the state that is known to be set on the slave,
+        a command that would not change a known state is not sent, cleared on i2c errors and by a periodic refresh
     """
     
     cmd_id = {
@@ -118,9 +485,14 @@ class ClockStepper:
       "move": 5,
       "stop": 6,
       "wiggle": 7,
-      "moveTo_min_steps": 8
+      "moveTo_min_steps": 8,
+      "pose_frame": 9
     }
     
+    shadow_speed = 1
+    shadow_accel = 2
+    shadow_target = 4
+    
     def __init__(self, sub_stepper_id: int, module: ClockModule, steps_per_rev: int, current_target_pos = 0, children=None):
         self.module = module
         self.sub_stepper_id = sub_stepper_id
@@ -129,13 +501,26 @@ class ClockStepper:
         self.current_accel = -1
         self.steps_per_rev = steps_per_rev
         self.children = children
+        self.shadow_valid = 0
+        
+        # state of the current move in the motion model, mirrors the trapezoidal profile of the slave firmware
+        self.move_start_ms = ticks_ms()
+        self.move_start_pos = current_target_pos
+        self.move_distance = 0 # signed, positive is cw
+        self.move_speed = -1
+        self.move_accel = -1
+        self.move_done_ms = self.move_start_ms
         
         self.verbose = False
         
     def set_speed(self, speed: int):
-        buffer = pack("<BHb", self.cmd_id["set_speed"], speed, self.sub_stepper_id) #cmd_id uint8, speed uint16, stepper_id int8           
+        if self.__shadow_matches(ClockStepper.shadow_speed, "current_speed", speed):
+            return
         
-        self.module.i2c_write(buffer)
+        pack_into("<BHb", self.module.frame(), 0, self.cmd_id["set_speed"], speed, self.sub_stepper_id) #cmd_id uint8, speed uint16, stepper_id int8           
+        
+        self.__shadow_mark(ClockStepper.shadow_speed)
+        self.module.i2c_write_frame(4)
 
         if self.children is not None: # if this is a parent stepper, set speed for all children
             for child in self.children:
@@ -144,9 +529,13 @@ class ClockStepper:
         self.current_speed = speed
     
     def set_accel(self, accel: int):
-        buffer = pack("<BHb", self.cmd_id["set_accel"], accel, self.sub_stepper_id) #cmd_id uint8, accel uint16, stepper_id int8  
+        if self.__shadow_matches(ClockStepper.shadow_accel, "current_accel", accel):
+            return
+        
+        pack_into("<BHb", self.module.frame(), 0, self.cmd_id["set_accel"], accel, self.sub_stepper_id) #cmd_id uint8, accel uint16, stepper_id int8  
 
-        self.module.i2c_write(buffer)
+        self.__shadow_mark(ClockStepper.shadow_accel)
+        self.module.i2c_write_frame(4)
 
         if self.children is not None: # if this is a parent stepper, set accel for all children
             for child in self.children:
@@ -155,9 +544,14 @@ class ClockStepper:
         self.current_accel = accel         
     
     def move_to(self, position: int, direction: int):
-        buffer = pack("<Bhbb", self.cmd_id["moveTo"], position, direction, self.sub_stepper_id) #cmd_id uint8, position int16, dir int8, stepper_id int8           
+        if direction == 0 and self.is_resting_at(position): # shortest path to where it already stands
+            return
+        
+        pack_into("<Bhbb", self.module.frame(), 0, self.cmd_id["moveTo"], position, direction, self.sub_stepper_id) #cmd_id uint8, position int16, dir int8, stepper_id int8           
         
-        self.module.i2c_write(buffer)
+        self.__shadow_mark(ClockStepper.shadow_target)
+        self.module.i2c_write_frame(5)
+        self.predict_move_to(position, direction)
 
         if self.children is not None:
             for child in self.children:
@@ -166,16 +560,24 @@ class ClockStepper:
         self.current_target_pos = position
     
     def move_to_extra_revs(self, position: int, direction: int, extra_revs: int):
-        buffer = pack("<BhbBb", self.cmd_id["moveTo_extra_revs"], position, direction, extra_revs, self.sub_stepper_id) #cmd_id uint8, position int16, dir int8, extra_revs uint8, stepper_id int8           
+        pack_into("<BhbBb", self.module.frame(), 0, self.cmd_id["moveTo_extra_revs"], position, direction, extra_revs, self.sub_stepper_id) #cmd_id uint8, position int16, dir int8, extra_revs uint8, stepper_id int8           
         
-        self.module.i2c_write(buffer)
+        self.__shadow_mark(ClockStepper.shadow_target)
+        self.module.i2c_write_frame(6)
+        self.predict_move_to(position, direction, extra_revs=extra_revs)
+
+        if self.children is not None:
+            for child in self.children:
+                child.current_target_pos = position
         
         self.current_target_pos = position
     
     def move_to_min_steps(self, position: int, direction: int, min_steps: int):
-        buffer = pack("<BhbHb", self.cmd_id["moveTo_min_steps"], position, direction, min_steps, self.sub_stepper_id) #cmd_id uint8, position int16, dir int8, min_steps uint16, stepper_id int8           
+        pack_into("<BhbHb", self.module.frame(), 0, self.cmd_id["moveTo_min_steps"], position, direction, min_steps, self.sub_stepper_id) #cmd_id uint8, position int16, dir int8, min_steps uint16, stepper_id int8           
         
-        self.module.i2c_write(buffer)
+        self.__shadow_mark(ClockStepper.shadow_target)
+        self.module.i2c_write_frame(7)
+        self.predict_move_to(position, direction, min_steps=min_steps)
 
         if self.children is not None:
             for child in self.children:
@@ -184,9 +586,11 @@ class ClockStepper:
         self.current_target_pos = position
     
     def move(self, distance: int, direction: int):
-        buffer = pack("<BHbb", self.cmd_id["move"], distance, direction, self.sub_stepper_id) #cmd_id uint8, distance uint16, dir int8, stepper_id int8           
+        pack_into("<BHbb", self.module.frame(), 0, self.cmd_id["move"], distance, direction, self.sub_stepper_id) #cmd_id uint8, distance uint16, dir int8, stepper_id int8           
         
-        self.module.i2c_write(buffer)
+        self.__shadow_mark(ClockStepper.shadow_target)
+        self.module.i2c_write_frame(5)
+        self.predict_move(distance * direction)
             
         relative = (distance * direction) % self.steps_per_rev
         self.current_target_pos = (self.steps_per_rev + self.current_target_pos + relative) % self.steps_per_rev
@@ -196,9 +600,10 @@ class ClockStepper:
                 child.current_target_pos = (self.steps_per_rev + child.current_target_pos + relative) % self.steps_per_rev
         
     def stop(self):
-        buffer = pack("<Bb", self.cmd_id["stop"], self.sub_stepper_id) #cmd_id uint8, stepper_id int8     
+        pack_into("<Bb", self.module.frame(), 0, self.cmd_id["stop"], self.sub_stepper_id) #cmd_id uint8, stepper_id int8     
         
-        self.module.i2c_write(buffer)
+        self.module.i2c_write_frame(2)
+        self.predict_stop()
         
         self.current_target_pos = -1
 
@@ -207,9 +612,10 @@ class ClockStepper:
                 child.current_target_pos = -1
 
     def wiggle(self, distance: int, direction: int):
-        buffer = pack("<BHbb", self.cmd_id["wiggle"], distance, direction, self.sub_stepper_id) #cmd_id uint8, distance uint16, dir int8, stepper_id int8
+        pack_into("<BHbb", self.module.frame(), 0, self.cmd_id["wiggle"], distance, direction, self.sub_stepper_id) #cmd_id uint8, distance uint16, dir int8, stepper_id int8
 
-        self.module.i2c_write(buffer)
+        self.module.i2c_write_frame(5)
+        self.predict_move(0, timing_steps=2 * distance) # moves out and back to where it started
     
     def is_running(self) -> bool: #returns True if stepper is running
         buffer = self.module.i2c_read(1)
@@ -222,5 +628,101 @@ class ClockStepper:
             return running
         else:
             return ((1 << self.sub_stepper_id) & buffer[0] != 0)
+
+#region shadow state
+
+    def is_resting_at(self, position: int) -> bool:
+        """wether the stepper is known to stand still at position, for a parent all of its children"""
+        if not self.module.shadow_enabled:
+            return False
+        
+        now = ticks_ms()
+        for stepper in self.__model_steppers():
+            if not stepper.shadow_valid & ClockStepper.shadow_target or stepper.current_target_pos != position:
+                return False
+            if stepper.__is_moving(now):
+                return False
+        return True
+
+    def __shadow_matches(self, bit, attribute, value):
+        if not self.module.shadow_enabled:
+            return False
+        
+        for stepper in self.__model_steppers():
+            if not stepper.shadow_valid & bit or getattr(stepper, attribute) != value:
+                return False
+        return True
+
+    def __shadow_mark(self, bit):
+        # marked before the write, so a failed transmission clears it again
+        for stepper in self.__model_steppers():
+            stepper.shadow_valid |= bit
+
+#endregion
+
+#region motion model
+
+    def estimated_position(self) -> int:
+        """position the motion model expects the stepper to be at right now"""
+        elapsed = ticks_diff(ticks_ms(), self.move_start_ms)
+        travelled = MotionModel.travelled_steps(abs(self.move_distance), self.move_speed, self.move_accel, elapsed)
+
+        if self.move_distance < 0:
+            travelled = -travelled
+
+        return (self.move_start_pos + travelled) % self.steps_per_rev
+
+    def predict_move_to(self, position: int, direction: int, extra_revs=0, min_steps=0):
+        for stepper in self.__model_steppers():
+            start_pos = stepper.estimated_position()
+            distance = MotionModel.move_to_distance(start_pos, position, direction, self.steps_per_rev, extra_revs, min_steps)
+            stepper.__start_move(start_pos, distance, abs(distance))
+
+    def predict_move(self, distance: int, timing_steps=None):
+        for stepper in self.__model_steppers():
+            stepper.__start_move(stepper.estimated_position(), distance, abs(distance) if timing_steps is None else timing_steps)
+
+    def predict_stop(self):
+        for stepper in self.__model_steppers():
+            now = ticks_ms()
+            running = stepper.__is_moving(now)
+            
+            stepper.move_start_pos = stepper.estimated_position()
+            stepper.move_start_ms = now
+            stepper.move_distance = 0
+            stepper.move_done_ms = ticks_add(now, MotionModel.stop_duration_ms(stepper.current_speed, stepper.current_accel) if running else 0)
+            stepper.module.note_move_done(stepper.move_done_ms)
+
+    def __model_steppers(self):
+        if self.children is not None:
+            return self.children
+        return (self,)
+
+    def __is_moving(self, now):
+        # move_done_ms includes the safety margin, whether the firmware still has to brake follows from the profile itself
+        if self.move_distance == 0: # wiggle, only the timing is modelled
+            return ticks_diff(self.move_done_ms, now) > 0
+        
+        distance = abs(self.move_distance)
+        elapsed = ticks_diff(now, self.move_start_ms)
+        return MotionModel.travelled_steps(distance, self.move_speed, self.move_accel, elapsed) < distance
+
+    def __start_move(self, start_pos, distance, timing_steps):
+        now = ticks_ms()
+        duration = MotionModel.move_duration_ms(timing_steps, self.current_speed, self.current_accel)
+
+        if self.__is_moving(now): # still moving, the firmware has to brake or reverse first
+            duration += MotionModel.stop_duration_ms(self.current_speed, self.current_accel)
+
+        self.move_start_ms = now
+        self.move_start_pos = start_pos
+        self.move_distance = distance
+        self.move_speed = self.current_speed
+        self.move_accel = self.current_accel
+        self.move_done_ms = ticks_add(now, duration)
+
+        self.module.note_move_done(self.move_done_ms)
+
+#endregion
   
 #endregion
@@ -1,5 +1,6 @@
 import machine
 import urtc
+import Trace
 
 class DS3231_timekeeper:
     def __init__(self, new_minute_handler, alarm_pin: int, i2c_bus: machine.I2C, second=0, enable_minute_alarm=True):
@@ -51,6 +52,8 @@ class DS3231_timekeeper:
         self.set_datetime(urtc.datetime_tuple(year=2000, month=1, day=21, weekday=5, hour=hour, minute=minute, second=second, millisecond=0)) 
 
     def alarm_handler(self, pin):
+        if __debug__:
+            Trace.mark(Trace.ALARM)
         self.rtc.alarm(False)
         if self.enable_minute_alarm:
             self.new_minute_handler()
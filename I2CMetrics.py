@@ -0,0 +1,105 @@
+from array import array
+from utime import ticks_us, ticks_diff
+
+class I2CMetrics:
+    """
+    Health and throughput counters of the i2c devices, so a module or bus that starts failing is noticed before the
+    clock visibly desyncs
+
+    Counters are kept per address, the duration of the transactions per bus in a histogram. Recording only indexes
+    into preallocated arrays once a device has been seen. The modules on the second core record into the same
+    arrays, a count can get lost if both cores update the same device at the very same time.
+
+    ...
+
+    Attributes
+    ----------
+    counter_names : tuple
+        names of the counters of each address, in the order of the counter indices
+    latency_bounds_us : tuple
+        upper bounds of the histogram bins in us, the last bin holds everything that took longer
+    """
+    TRANSACTIONS = 0
+    BYTES = 1 # payload bytes, without the address byte
+    NACKS = 2 # transactions that raised, a nack or a bus timeout
+    CHECKSUM_ERRORS = 3 # answers that were received but didn't match their checksum
+    RETRIES = 4 # transactions that were repeated after a failure
+
+    counter_names = ("transactions", "bytes", "nacks", "checksum errors", "retries")
+    latency_bounds_us = (500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+    def __init__(self):
+        self.__counters = {} # address -> array of counters
+        self.__histograms = {} # bus -> array of bin counts
+
+    def record(self, bus, address, byte_count, start_us, success):
+        """records a transaction that started at ticks_us start_us and just ended"""
+        duration_us = ticks_diff(ticks_us(), start_us)
+
+        counters = self.__get_counters(address)
+        counters[I2CMetrics.TRANSACTIONS] += 1
+        if success:
+            counters[I2CMetrics.BYTES] += byte_count
+        else:
+            counters[I2CMetrics.NACKS] += 1
+
+        histogram = self.__histograms.get(bus)
+        if histogram is None:
+            histogram = array('I', [0] * (len(I2CMetrics.latency_bounds_us) + 1))
+            self.__histograms[bus] = histogram
+
+        bin_index = 0
+        for bound_us in I2CMetrics.latency_bounds_us:
+            if duration_us < bound_us:
+                break
+            bin_index += 1
+        histogram[bin_index] += 1
+
+    def checksum_error(self, address):
+        self.__get_counters(address)[I2CMetrics.CHECKSUM_ERRORS] += 1
+
+    def retry(self, address):
+        self.__get_counters(address)[I2CMetrics.RETRIES] += 1
+
+    def __get_counters(self, address):
+        counters = self.__counters.get(address)
+        if counters is None:
+            counters = array('I', [0] * len(I2CMetrics.counter_names))
+            self.__counters[address] = counters
+        return counters
+
+    def counters(self, address):
+        """dictionary of counter name to value for the address"""
+        counters = self.__get_counters(address)
+        return {name: counters[index] for index, name in enumerate(I2CMetrics.counter_names)}
+
+    def histogram(self, bus):
+        """list of transaction counts per bin of latency_bounds_us"""
+        histogram = self.__histograms.get(bus)
+        if histogram is None:
+            return [0] * (len(I2CMetrics.latency_bounds_us) + 1)
+        return list(histogram)
+
+    def addresses(self):
+        return sorted(self.__counters)
+
+    def reset(self):
+        for counters in self.__counters.values():
+            for index in range(len(counters)):
+                counters[index] = 0
+        for histogram in self.__histograms.values():
+            for index in range(len(histogram)):
+                histogram[index] = 0
+
+    def report(self):
+        """prints every counter and histogram, for the repl"""
+        print("address", " ".join(I2CMetrics.counter_names))
+        for address in self.addresses():
+            print(address, " ".join(str(value) for value in self.__counters[address]))
+
+        print("latency bins [us] <" + " <".join(str(bound) for bound in I2CMetrics.latency_bounds_us) + " more")
+        for bus, histogram in self.__histograms.items():
+            print(bus, " ".join(str(count) for count in histogram))
+
+# shared by all devices, query it from the repl with I2CMetrics.metrics.report()
+metrics = I2CMetrics()
@@ -0,0 +1,78 @@
+import math
+
+# Kinematic model of the stepper moves on the modules. The slave firmware accelerates with a constant acceleration
+# up to the set speed, cruises and decelerates again (trapezoidal speed profile, triangular for short moves),
+# these functions mirror that so the master can predict when and where a stepper stops without asking the module.
+
+# added to every predicted duration, covers i2c latency and the rounding of the step timing in the firmware
+margin_ms = 30
+margin_frac = 0.03
+
+
+def move_to_distance(start_pos: int, target_pos: int, direction: int, steps_per_rev: int, extra_revs=0, min_steps=0) -> int:
+    """signed number of steps (positive is cw) the firmware takes from start_pos to target_pos
+
+    direction 0 takes the shortest path, 1 cw and -1 ccw,
+    extra_revs adds full revolutions and min_steps adds revolutions until at least that many steps are made
+    """
+    distance_cw = (target_pos - start_pos) % steps_per_rev
+    distance_ccw = (start_pos - target_pos) % steps_per_rev
+
+    if direction == 0:
+        direction = 1 if distance_cw <= distance_ccw else -1
+
+    distance = distance_cw if direction == 1 else distance_ccw
+    distance += extra_revs * steps_per_rev
+
+    if distance < min_steps:
+        distance += ((min_steps - distance + steps_per_rev - 1) // steps_per_rev) * steps_per_rev
+
+    return distance * direction
+
+
+def move_duration_ms(distance: int, speed: int, accel: int) -> int:
+    """time in ms a stepper starting from standstill needs for distance steps, 0 if speed or accel are unknown"""
+    if distance <= 0 or speed <= 0 or accel <= 0:
+        return 0
+
+    if distance >= speed * speed / accel: # reaches full speed
+        duration_s = distance / speed + speed / accel
+    else:
+        duration_s = 2 * math.sqrt(distance / accel)
+
+    return int(duration_s * 1000 * (1 + margin_frac)) + margin_ms
+
+
+def stop_duration_ms(speed: int, accel: int) -> int:
+    """worst case time in ms to decelerate from full speed to standstill"""
+    if speed <= 0 or accel <= 0:
+        return 0
+
+    return int(speed / accel * 1000)
+
+
+def travelled_steps(distance: int, speed: int, accel: int, elapsed_ms: int) -> int:
+    """number of steps of a move of distance steps that are done after elapsed_ms"""
+    if distance <= 0 or elapsed_ms <= 0:
+        return 0
+    if speed <= 0 or accel <= 0:
+        return distance
+
+    t = elapsed_ms / 1000
+
+    if distance >= speed * speed / accel:
+        t_ramp = speed / accel
+        t_total = distance / speed + t_ramp
+        peak = speed
+    else:
+        t_ramp = math.sqrt(distance / accel)
+        t_total = 2 * t_ramp
+        peak = accel * t_ramp
+
+    if t >= t_total:
+        return distance
+    if t < t_ramp:
+        return int(0.5 * accel * t * t)
+    if t < t_total - t_ramp:
+        return int(0.5 * peak * t_ramp + peak * (t - t_ramp))
+    return int(distance - 0.5 * accel * (t_total - t) ** 2)
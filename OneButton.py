@@ -9,9 +9,11 @@
 # 23.03.2014 Enhanced long press functionalities by adding longPressStart and longPressStop callbacks
 # 21.09.2015 A simple way for debounce detection added.
 # 21.05.2016 Ported to micropython by Thomas Gfüllner
+# OneButtonIRQ added, runs the state machine from pin interrupts instead of polling
 
 from machine import Pin
-from utime import ticks_ms, ticks_diff
+from utime import ticks_ms, ticks_diff, ticks_add
+import uasyncio as asyncio
 
 class OneButton:
 
@@ -82,9 +84,10 @@ class OneButton:
   # call this function every some milliseconds for handling button events.
   def tick(self):
     # Detect the input information 
-    buttonLevel = self._pin.value()
-    now = ticks_ms()
+    self._process(self._pin.value(), ticks_ms())
 
+  # advance the state machine with the button level at time now.
+  def _process(self, buttonLevel, now):
     # Implementation of the state machine
     if self._state == 0: # waiting for menu pin being pressed.
       if (buttonLevel == self._buttonPressed):
@@ -142,4 +145,74 @@ class OneButton:
         # button is being long pressed
         self._isLongPressed = True
         if self._duringLongPressFunc:
-          self._duringLongPressFunc(self)
\ No newline at end of file
+          self._duringLongPressFunc(self)
+
+
+class OneButtonIRQ(OneButton):
+  """
+  OneButton driven by pin interrupts, the state machine only runs when an edge arrived or a click or long press
+  timeout is due, so nothing runs while the button is not touched.
+
+  The interrupt only timestamps the edge and sets a ThreadSafeFlag, run() waits for the level to be stable for the
+  debounce time and then feeds it to the state machine with the time of the last edge.
+  """
+
+  def __init__(self, pinNr, activeLow, externalResistor=False):
+    super().__init__(pinNr, activeLow, externalResistor)
+
+    self._edgeFlag = asyncio.ThreadSafeFlag()
+    self._edgeTime = 0
+    self._edgePending = False
+
+    self._pin.irq(handler=self._edgeHandler, trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING)
+
+  def _edgeHandler(self, pin):
+    # runs in interrupt context, must not allocate
+    self._edgeTime = ticks_ms()
+    self._edgePending = True
+    self._edgeFlag.set()
+
+  # millisec until the state machine has to run even without another edge, None if it only waits for an edge.
+  def _timeout(self, now):
+    if self._edgePending:
+      deadline = ticks_add(self._edgeTime, self._debounceTicks)
+    elif self._state == 1:
+      deadline = ticks_add(self._startTime, self._pressTicks + 1)
+    elif self._state == 2:
+      deadline = ticks_add(self._startTime, self._clickTicks + 1)
+    elif self._state == 6 and self._duringLongPressFunc:
+      return self._debounceTicks
+    else:
+      return None
+
+    return max(0, ticks_diff(deadline, now))
+
+  # handles the button events for as long as the task runs, replaces calling tick().
+  async def run(self):
+    while True:
+      timeout = self._timeout(ticks_ms())
+
+      if timeout is None:
+        await self._edgeFlag.wait()
+      elif timeout > 0:
+        try:
+          await asyncio.wait_for_ms(self._edgeFlag.wait(), timeout)
+        except asyncio.TimeoutError:
+          pass
+
+      now = ticks_ms()
+      if self._edgePending:
+        edgeTime = self._edgeTime
+        if ticks_diff(now, edgeTime) < self._debounceTicks:
+          continue # still bouncing
+        self._edgePending = False
+        if self._edgeTime != edgeTime:
+          self._edgePending = True # another edge arrived meanwhile
+        now = edgeTime
+
+      # a polled button would see the same level again on the next tick, so run until the state settles
+      buttonLevel = self._pin.value()
+      state = None
+      while state != self._state:
+        state = self._state
+        self._process(buttonLevel, now)
@@ -1,80 +1,245 @@
 from collections import namedtuple
+from struct import pack, unpack_from, calcsize
+from binascii import crc32
 import json
+import os
 
 
 class PersistentStorage:
+    """
+    Stores a fixed list of variables on the flash of the pico
+
+    Every save appends one fixed layout binary record (magic, layout id, sequence number, values, crc32) to a small
+    ring of files, a file is only truncated once the ring wraps around to it. At boot the newest record with a valid
+    crc is used, so a power cut during a save only loses the record that was being written.
+    Variables are ints or fixed length lists of ints, the layout is derived from the default values.
+    Names are resolved to slots with a dict, set_var keeps a dirty bit per variable that differs from the flash so
+    flush_if_dirty() only writes when a value actually changed.
+
+    Attributes
+    ----------
+    filename : str
+        base name of the ring files, filename_0.bin, filename_1.bin, ...
+    legacy_filename : str
+        json file of older firmware, migrated to the ring at boot if no valid record exists
+    file_count : int
+        number of files in the ring, at least 2 so the newest record is never in the file being truncated
+    records_per_file : int
+        number of records appended to a file before the next one in the ring is started
+    """
     # checkFunc optional check function that should return true when the value is in range
     persistent_var = namedtuple("storedVar", ("name", "defaultValue", "checkFunc"))
 
-    def __init__(self, filename, stored_var_lst : List[persistent_var]):
-        self.filename = filename + ".txt"
-        
+    record_magic = b"CS"
+    file_count = 2
+    records_per_file = 32
+
+    def __init__(self, filename, stored_var_lst : list):
+        self.filename = filename
+        self.legacy_filename = filename + ".txt"
+
         self.__var_values = []
         self.__var_default_values = []
         self.__var_check_funcs = []
         self.__var_names = []
-        
+        self.__var_slots = {} # name -> index of the variable
+        self.__var_lengths = [] # 0 for an int, otherwise the length of the list
+        self.__flash_values = [] # values of the newest record on the flash
+        self.__dirty = 0 # bit i is set while variable i differs from the flash
+
         for var in stored_var_lst:
+            self.__var_slots[var.name] = len(self.__var_names)
             self.__var_default_values.append(var.defaultValue)
             self.__var_check_funcs.append(var.checkFunc)
             self.__var_names.append(var.name)
-        
+            self.__var_lengths.append(0 if type(var.defaultValue) is int else len(var.defaultValue))
+
+        # header: magic, layout id, sequence number; the crc32 of header and values follows the values
+        values_format = "".join("h" * max(1, length) for length in self.__var_lengths)
+        self.__body_format = "<2sHI" + values_format
+        self.__body_size = calcsize(self.__body_format)
+        self.__record_size = self.__body_size + 4
+
+        # records written with a different list of variables are not read
+        self.__layout_id = crc32(",".join(self.__var_names + [values_format]).encode()) & 0xffff
+
+        self.__sequence = 0
+        self.__file_index = self.file_count - 1
+        self.__file_records = self.records_per_file
+
         self.read_flash()
-        
+
     def set_var(self, name, value):
         ind = self.__get_index(name)
         check_func = self.__var_check_funcs[ind]
         if check_func != None:
             if check_func(value):
                 self.__var_values[ind] = value
-    
+
+                if value != self.__flash_values[ind]:
+                    self.__dirty |= 1 << ind
+                else:
+                    self.__dirty &= ~(1 << ind)
+
     def get_var(self, name):
         ind = self.__get_index(name)
         return self.__var_values[ind]
-            
+
     def __get_index(self, name):
-        return self.__var_names.index(name)
-            
+        return self.__var_slots[name]
+
+    def is_dirty(self, name=None):
+        """wether the variable, or any variable if no name is given, differs from the value on the flash"""
+        if name is None:
+            return self.__dirty != 0
+        return self.__dirty & (1 << self.__get_index(name)) != 0
+
+    def flush_if_dirty(self):
+        """writes a record only if a variable changed since the last one, returns wether it wrote"""
+        if self.__dirty == 0:
+            return False
+
+        self.write_flash()
+        return True
+
+    def __ring_filename(self, file_index):
+        return self.filename + "_" + str(file_index) + ".bin"
+
     def read_flash(self):
-        try:
-            if __debug__:
-                print("trying to read from flash:", self.filename)
-                
-            f = open(self.filename, "r")
-            string = f.readline()
-            self.__var_values = json.loads(string)
-            f.close()
-
-            for index, check_func in enumerate(self.__var_check_funcs):
-                if check_func != None:
-                    if not check_func(self.__var_values[index]):
-                        raise ValueError("Bad stored data", index)
-        except Exception as e:
-            if __debug__:
-                print(str(e))
-                
-            self.reset_flash()
-            
+        if __debug__:
+            print("trying to read from flash:", self.filename)
+
+        newest_sequence = -1
+
+        for file_index in range(self.file_count):
+            try:
+                with open(self.__ring_filename(file_index), "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+
+            record_count = len(data) // self.__record_size
+
+            # the newest record of a file is the last valid one
+            for record_index in range(record_count - 1, -1, -1):
+                record = self.__decode_record(data, record_index * self.__record_size)
+                if record is None:
+                    continue
+
+                sequence, values = record
+                if sequence > newest_sequence:
+                    newest_sequence = sequence
+                    self.__var_values = values
+                    self.__sequence = sequence
+                    self.__file_index = file_index
+
+                    # only keep appending to a file that ends with this record, after a torn write the ring moves on
+                    if record_index == record_count - 1 and len(data) == record_count * self.__record_size:
+                        self.__file_records = record_count
+                    else:
+                        self.__file_records = self.records_per_file
+                break
+
+        if newest_sequence < 0:
+            self.__migrate_legacy_file()
+        else:
+            self.__flash_values = list(self.__var_values)
+            self.__dirty = 0
+
         if __debug__:
             print("read data:", list(zip(self.__var_names, self.__var_values)))
 
     def write_flash(self):
-        data_str = json.dumps(self.__var_values)
-        f = open(self.filename, "w")
-        f.write(data_str)
-        f.close()
-        
+        self.__sequence += 1
+
+        if self.__file_records >= self.records_per_file:
+            self.__file_index = (self.__file_index + 1) % self.file_count
+            self.__file_records = 0
+
+        with open(self.__ring_filename(self.__file_index), "wb" if self.__file_records == 0 else "ab") as f:
+            f.write(self.__encode_record())
+        self.__file_records += 1
+
+        self.__flash_values = list(self.__var_values)
+        self.__dirty = 0
+
         if __debug__:
-            print("wrote to flash:", self.filename)
+            print("wrote to flash:", self.__ring_filename(self.__file_index), "record", self.__sequence)
             print("data:", list(zip(self.__var_names, self.__var_values)))
 
     def reset_flash(self):
         self.__var_values = []
-            
+
         for val in self.__var_default_values:
             self.__var_values.append(val)
 
         self.write_flash()
-            
+
         if __debug__:
             print("Resetting flash to default values")
+
+    def __encode_record(self):
+        flat_values = []
+        for value, length in zip(self.__var_values, self.__var_lengths):
+            if length == 0:
+                flat_values.append(value)
+            else:
+                flat_values.extend(value)
+
+        body = pack(self.__body_format, PersistentStorage.record_magic, self.__layout_id, self.__sequence, *flat_values)
+        return body + pack("<I", crc32(body))
+
+    def __decode_record(self, data, offset):
+        """returns (sequence, values) of the record at offset, None if it is damaged, of another layout or out of range"""
+        body = data[offset:offset + self.__body_size]
+        (crc,) = unpack_from("<I", data, offset + self.__body_size)
+        if crc32(body) != crc:
+            return None
+
+        fields = unpack_from(self.__body_format, body, 0)
+        if fields[0] != PersistentStorage.record_magic or fields[1] != self.__layout_id:
+            return None
+
+        values = []
+        field_index = 3
+        for length in self.__var_lengths:
+            if length == 0:
+                values.append(fields[field_index])
+                field_index += 1
+            else:
+                values.append(list(fields[field_index:field_index + length]))
+                field_index += length
+
+        if not self.__check_values(values):
+            return None
+
+        return fields[2], values
+
+    def __check_values(self, values):
+        for index, check_func in enumerate(self.__var_check_funcs):
+            if check_func != None:
+                if not check_func(values[index]):
+                    return False
+        return True
+
+    def __migrate_legacy_file(self):
+        # settings of firmware that stored them as a json line, used once and removed after they are in the ring
+        try:
+            with open(self.legacy_filename, "r") as f:
+                values = json.loads(f.readline())
+
+            if len(values) != len(self.__var_names) or not self.__check_values(values):
+                raise ValueError("Bad stored data")
+        except Exception as e:
+            if __debug__:
+                print(str(e))
+
+            self.reset_flash()
+            return
+
+        self.__var_values = values
+        self.write_flash()
+        os.remove(self.legacy_filename)
+
+        if __debug__:
+            print("Migrated settings from", self.legacy_filename)
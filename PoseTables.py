@@ -0,0 +1,220 @@
+"""
+Precalculated start poses of the circle, field lines and equipotential animations
+
+generated by test/generate_pose_tables.py, do not edit, indices are clk indices like in ClockClock24
+"""
+from array import array
+
+steps_full_rev = 4320
+
+# circle, one pose per center [[0, 0], [0, 20], [9, -20]]
+circle_h = (
+    array('h', [
+        2313, 2370, 2487, 2797, 1523, 1833, 1950, 2007,
+        39, 55, 91, 282, 4038, 4229, 4265, 4281,
+        4167, 4110, 3993, 3683, 637, 327, 210, 153,
+    ]),
+    array('h', [
+        4167, 4110, 3993, 3683, 637, 327, 210, 153,
+        3998, 3900, 3738, 3476, 844, 582, 420, 322,
+        3863, 3753, 3600, 3399, 921, 720, 567, 457,
+    ]),
+    array('h', [
+        2545, 2626, 2740, 2898, 3103, 1261, 1458, 1606,
+        2424, 2490, 2593, 2763, 3036, 1347, 1598, 1752,
+        2283, 2317, 2378, 2506, 2849, 1571, 1849, 1957,
+    ]),
+)
+
+# minute pointers of the circle poses
+circle_m = (
+    array('h', [
+        229, 312, 480, 884, 3436, 3840, 4008, 4091,
+        2120, 2104, 2068, 1877, 2443, 2252, 2216, 2200,
+        1930, 1847, 1679, 1275, 3045, 2641, 2473, 2390,
+    ]),
+    array('h', [
+        1930, 1847, 1679, 1275, 3045, 2641, 2473, 2390,
+        1768, 1653, 1467, 1181, 3139, 2853, 2667, 2552,
+        1642, 1522, 1357, 1148, 3172, 2963, 2798, 2678,
+    ]),
+    array('h', [
+        437, 527, 651, 821, 1034, 3331, 3537, 3697,
+        321, 400, 521, 716, 1011, 3375, 3651, 3828,
+        184, 235, 324, 506, 946, 3494, 3863, 4019,
+    ]),
+)
+
+# direction of the hour pointers when the circle collapses
+circle_direction_h = (
+    array('b', [
+        -1, -1, -1, -1, 1, 1, 1, 1,
+        1, 1, 1, 1, -1, -1, -1, -1,
+        1, 1, 1, 1, -1, -1, -1, -1,
+    ]),
+    array('b', [
+        1, 1, 1, 1, -1, -1, -1, -1,
+        1, 1, 1, 1, -1, -1, -1, -1,
+        1, 1, 1, 1, -1, -1, -1, -1,
+    ]),
+    array('b', [
+        -1, -1, -1, -1, -1, 1, 1, 1,
+        -1, -1, -1, -1, -1, 1, 1, 1,
+        -1, -1, -1, -1, -1, 1, 1, 1,
+    ]),
+)
+
+# direction of the minute pointers when the circle collapses
+circle_direction_m = (
+    array('b', [
+        1, 1, 1, 1, -1, -1, -1, -1,
+        -1, -1, -1, -1, 1, 1, 1, 1,
+        -1, -1, -1, -1, 1, 1, 1, 1,
+    ]),
+    array('b', [
+        -1, -1, -1, -1, 1, 1, 1, 1,
+        -1, -1, -1, -1, 1, 1, 1, 1,
+        -1, -1, -1, -1, 1, 1, 1, 1,
+    ]),
+    array('b', [
+        1, 1, 1, 1, 1, -1, -1, -1,
+        1, 1, 1, 1, 1, -1, -1, -1,
+        1, 1, 1, 1, 1, -1, -1, -1,
+    ]),
+)
+
+# field lines, one pose per pair of charges [[[-1, -1.5], [-1, -5.5]], [[0.5, 0.5], [0.5, -7.5]], [[-2.5, 0.5], [-2.5, -7.5]]]
+field_lines_h = (
+    array('h', [
+        1515, 1873, 2541, 3032, 3447, 3938, 286, 644,
+        1080, 1080, 3240, 3240, 3240, 3240, 1080, 1080,
+        644, 286, 3938, 3447, 3032, 2541, 1873, 1515,
+    ]),
+    array('h', [
+        3775, 3446, 3341, 3271, 3208, 3138, 3033, 2704,
+        4069, 3724, 3502, 3324, 3155, 2977, 2755, 2410,
+        4112, 3834, 3588, 3355, 3124, 2891, 2645, 2367,
+    ]),
+    array('h', [
+        2367, 2645, 2891, 3124, 3355, 3588, 3834, 4112,
+        2410, 2755, 2977, 3155, 3324, 3502, 3724, 4069,
+        2704, 3033, 3138, 3208, 3271, 3341, 3446, 3775,
+    ]),
+)
+
+# minute pointers of the field line poses
+field_lines_m = (
+    array('h', [
+        3675, 4033, 381, 872, 1287, 1778, 2446, 2804,
+        3240, 3240, 1080, 1080, 1080, 1080, 3240, 3240,
+        2804, 2446, 1778, 1287, 872, 381, 4033, 3675,
+    ]),
+    array('h', [
+        1615, 1286, 1181, 1111, 1048, 978, 873, 544,
+        1909, 1564, 1342, 1164, 995, 817, 595, 250,
+        1952, 1674, 1428, 1195, 964, 731, 485, 207,
+    ]),
+    array('h', [
+        207, 485, 731, 964, 1195, 1428, 1674, 1952,
+        250, 595, 817, 995, 1164, 1342, 1564, 1909,
+        544, 873, 978, 1048, 1111, 1181, 1286, 1615,
+    ]),
+)
+
+# equipotential lines, index 3 * point 1 index + point 2 index, points 1 [[-1, -1.5], [0.5, 0.5], [-2.5, 0.5]], points 2 [[-1, -5.5], [0.5, -7.5], [-2.5, -7.5]]
+equipotential_h = (
+    array('h', [
+        2595, 2953, 3621, 4112, 207, 698, 1366, 1724,
+        2160, 2160, 0, 0, 0, 0, 2160, 2160,
+        1724, 1366, 698, 207, 4112, 3621, 2953, 2595,
+    ]),
+    array('h', [
+        2589, 2940, 3582, 3959, 4118, 4165, 4106, 3786,
+        2165, 2160, 4318, 4300, 4236, 4099, 3872, 3513,
+        1745, 1386, 737, 333, 78, 4133, 3834, 3516,
+    ]),
+    array('h', [
+        2574, 2933, 3582, 3986, 4241, 186, 485, 803,
+        2154, 2159, 1, 19, 83, 220, 447, 806,
+        1730, 1379, 737, 360, 201, 154, 213, 533,
+    ]),
+    array('h', [
+        533, 213, 154, 201, 360, 737, 1379, 1730,
+        806, 447, 220, 83, 19, 1, 2159, 2154,
+        803, 485, 186, 4241, 3986, 3582, 2933, 2574,
+    ]),
+    array('h', [
+        535, 206, 101, 31, 4288, 4218, 4113, 3784,
+        829, 484, 262, 84, 4235, 4057, 3835, 3490,
+        872, 594, 348, 115, 4204, 3971, 3725, 3447,
+    ]),
+    array('h', [
+        537, 222, 159, 177, 260, 404, 608, 870,
+        833, 506, 332, 255, 255, 332, 506, 833,
+        870, 608, 404, 260, 177, 159, 222, 537,
+    ]),
+    array('h', [
+        3516, 3834, 4133, 78, 333, 737, 1386, 1745,
+        3513, 3872, 4099, 4236, 4300, 4318, 2160, 2165,
+        3786, 4106, 4165, 4118, 3959, 3582, 2940, 2589,
+    ]),
+    array('h', [
+        3449, 3711, 3915, 4059, 4142, 4160, 4097, 3782,
+        3486, 3813, 3987, 4064, 4064, 3987, 3813, 3486,
+        3782, 4097, 4160, 4142, 4059, 3915, 3711, 3449,
+    ]),
+    array('h', [
+        3447, 3725, 3971, 4204, 115, 348, 594, 872,
+        3490, 3835, 4057, 4235, 84, 262, 484, 829,
+        3784, 4113, 4218, 4288, 31, 101, 206, 535,
+    ]),
+)
+
+# minute pointers of the equipotential poses
+equipotential_m = (
+    array('h', [
+        435, 793, 1461, 1952, 2367, 2858, 3526, 3884,
+        0, 0, 2160, 2160, 2160, 2160, 0, 0,
+        3884, 3526, 2858, 2367, 1952, 1461, 793, 435,
+    ]),
+    array('h', [
+        429, 780, 1422, 1799, 1958, 2005, 1946, 1626,
+        5, 0, 2158, 2140, 2076, 1939, 1712, 1353,
+        3905, 3546, 2897, 2493, 2238, 1973, 1674, 1356,
+    ]),
+    array('h', [
+        414, 773, 1422, 1826, 2081, 2346, 2645, 2963,
+        4314, 4319, 2161, 2179, 2243, 2380, 2607, 2966,
+        3890, 3539, 2897, 2520, 2361, 2314, 2373, 2693,
+    ]),
+    array('h', [
+        2693, 2373, 2314, 2361, 2520, 2897, 3539, 3890,
+        2966, 2607, 2380, 2243, 2179, 2161, 4319, 4314,
+        2963, 2645, 2346, 2081, 1826, 1422, 773, 414,
+    ]),
+    array('h', [
+        2695, 2366, 2261, 2191, 2128, 2058, 1953, 1624,
+        2989, 2644, 2422, 2244, 2075, 1897, 1675, 1330,
+        3032, 2754, 2508, 2275, 2044, 1811, 1565, 1287,
+    ]),
+    array('h', [
+        2697, 2382, 2319, 2337, 2420, 2564, 2768, 3030,
+        2993, 2666, 2492, 2415, 2415, 2492, 2666, 2993,
+        3030, 2768, 2564, 2420, 2337, 2319, 2382, 2697,
+    ]),
+    array('h', [
+        1356, 1674, 1973, 2238, 2493, 2897, 3546, 3905,
+        1353, 1712, 1939, 2076, 2140, 2158, 0, 5,
+        1626, 1946, 2005, 1958, 1799, 1422, 780, 429,
+    ]),
+    array('h', [
+        1289, 1551, 1755, 1899, 1982, 2000, 1937, 1622,
+        1326, 1653, 1827, 1904, 1904, 1827, 1653, 1326,
+        1622, 1937, 2000, 1982, 1899, 1755, 1551, 1289,
+    ]),
+    array('h', [
+        1287, 1565, 1811, 2044, 2275, 2508, 2754, 3032,
+        1330, 1675, 1897, 2075, 2244, 2422, 2644, 2989,
+        1624, 1953, 2058, 2128, 2191, 2261, 2366, 2695,
+    ]),
+)
@@ -0,0 +1,109 @@
+"""
+Low overhead tracing of the path from the minute interrupt to the i2c writes
+
+Every entry is a ticks_us timestamp, an event id, a phase (mark, begin or end of a span) and a small integer argument,
+stored in preallocated arrays used as a ring buffer, so recording doesn't allocate and can happen in interrupts.
+Call sites are wrapped in if __debug__: so the compiler removes them when optimizing (mpy-cross -O1), without
+__debug__ no buffer is allocated either.
+
+    import Trace
+    Trace.dump()                 # over usb serial from the repl
+    Trace.dump("trace.txt")      # or to a file on the flash
+
+The entries of both cores share the buffer, if both record at the very same time one entry can be lost.
+"""
+from array import array
+from utime import ticks_us, ticks_diff
+
+# event ids, index into names
+ALARM = 0
+RUN = 1
+DISPLAY_TIME = 2
+NEW_TIME = 3
+DISPLAY_DIGITS = 4
+I2C_WRITE = 5
+I2C_READ = 6
+GC_COLLECT = 7
+
+names = ("alarm", "run", "display_time", "new_time", "display_digits", "i2c_write", "i2c_read", "gc_collect")
+
+# phases
+MARK = 0
+BEGIN = 1
+END = 2
+
+phase_names = ("mark", "begin", "end")
+
+capacity = 256
+
+if __debug__:
+    __times = array('i', [0] * capacity)
+    __events = bytearray(capacity) # event id << 2 | phase
+    __args = array('h', [0] * capacity)
+else:
+    __times = None
+    __events = None
+    __args = None
+
+__head = 0 # index of the next entry
+__count = 0 # number of valid entries, at most capacity
+
+
+def __record(event, phase, arg):
+    global __head, __count
+    index = __head
+    __head = (index + 1) % capacity
+    if __count < capacity:
+        __count += 1
+
+    __times[index] = ticks_us()
+    __events[index] = event << 2 | phase
+    __args[index] = arg
+
+def mark(event, arg=0):
+    """records a single point in time"""
+    __record(event, MARK, arg)
+
+def begin(event, arg=0):
+    """records the start of a span, should be followed by end with the same event"""
+    __record(event, BEGIN, arg)
+
+def end(event, arg=0):
+    __record(event, END, arg)
+
+def clear():
+    global __head, __count
+    __head = 0
+    __count = 0
+
+def entries():
+    """the recorded entries oldest first as (time_us, event, phase, arg), this allocates so it is not for the hot path"""
+    result = []
+    start = (__head - __count) % capacity
+    for offset in range(__count):
+        index = (start + offset) % capacity
+        result.append((__times[index], __events[index] >> 2, __events[index] & 3, __args[index]))
+    return result
+
+def dump(filename=None):
+    """
+    prints the entries with their time relative to the first one and to the previous one, or writes them to filename
+    """
+    recorded = entries()
+    lines = []
+    if recorded:
+        first_us = recorded[0][0]
+        previous_us = first_us
+        for time_us, event, phase, arg in recorded:
+            lines.append("%10d %8d %-15s %-5s %d" % (ticks_diff(time_us, first_us), ticks_diff(time_us, previous_us),
+                                                     names[event], phase_names[phase], arg))
+            previous_us = time_us
+
+    if filename is None:
+        print("    t [us]  dt [us] event           phase arg")
+        for line in lines:
+            print(line)
+    else:
+        with open(filename, "w") as f:
+            for line in lines:
+                f.write(line + "\n")
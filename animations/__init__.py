@@ -0,0 +1,16 @@
+"""
+Animations of DigitDisplay, one module per animation
+
+Each module has a coroutine new_pose(display, new_positions_h, new_positions_m) that moves the pointers of the
+DigitDisplay display to the new positions. DigitDisplay only imports a module the first time its animation is shown.
+"""
+from array import array
+import PoseTables
+
+def scale_pose(pose, steps_full_rev):
+    """a start pose precalculated by test/generate_pose_tables.py, rescaled if the steppers have a different step count"""
+    if steps_full_rev == PoseTables.steps_full_rev:
+        return pose
+
+    # tables were generated for other steppers, rescale with integers instead of evaluating the geometry every time
+    return array('h', [pos * steps_full_rev // PoseTables.steps_full_rev for pos in pose])
@@ -0,0 +1,34 @@
+"""
+checkerboard animation, checkerboard pattern
+"""
+
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """Animation: Moves clocks in a checkerboard pattern."""
+    extra_revs = 1
+    start_positions_h = [0] * 24
+    start_positions_m = [0] * 24
+
+    for clk_idx in range(24):
+        if 7 < clk_idx < 16:
+            offset = 1
+        else:
+            offset = 0
+
+        if ((clk_idx + offset) % 2) == 0:
+            start_ang_h = 0.0
+            start_ang_m = 0.5
+        else:
+            start_ang_h = 0.25
+            start_ang_m = 0.75
+
+        start_positions_h[clk_idx] = int(display.steps_full_rev * start_ang_h)
+        start_positions_m[clk_idx] = int(display.steps_full_rev * start_ang_m)
+
+    display.clockclock.move_to_pose(start_positions_h, start_positions_m)
+
+    # wait for move to be done
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    display.clockclock.move_to_extra_revs_pose(new_positions_h, new_positions_m, 1, 1, extra_revs)
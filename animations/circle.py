@@ -0,0 +1,36 @@
+"""
+circle animation, a big circle that collapses to the center
+"""
+import random
+import PoseTables
+from animations import scale_pose
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """a big circle that collapses to the center
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    extra_revs = 1
+
+    # each pointers midpoint is tangent to a circle, the start poses for the 3 possible centers are precalculated
+    # the center of the clockclock is picked twice as often
+    pose_index = random.choice([0, 0, 1, 2])
+
+    start_positions_h = scale_pose(PoseTables.circle_h[pose_index], display.steps_full_rev)
+    start_positions_m = scale_pose(PoseTables.circle_m[pose_index], display.steps_full_rev)
+
+    display.clockclock.move_to_pose(start_positions_h, start_positions_m)
+
+    #wait for move to be done
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    directions_h = PoseTables.circle_direction_h[pose_index]
+    directions_m = PoseTables.circle_direction_m[pose_index]
+
+    display.clockclock.move_to_extra_revs_pose(new_positions_h, new_positions_m, directions_h, directions_m, extra_revs)
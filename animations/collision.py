@@ -0,0 +1,51 @@
+"""
+collision animation, bouncing pointers
+"""
+import random
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """EAch row or column comes with a wave from alternating directions."""
+    extra_revs = 1
+    ms_delay = 400
+
+    wave_direction = random.choice([1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+    first_direction = random.choice([0, 1])
+
+    if wave_direction == 0:
+        indices = display.row_indices
+        start_ang = 0.75
+    else:
+        indices = display.column_indices
+        start_ang = 0.0
+
+    if first_direction == 1:
+        start_ang += 0.5
+
+    # move to start position
+    start_positions = [0] * 24
+    for index, lst in enumerate(indices):
+        for clk_index in lst:
+            start_positions[clk_index] = int(display.steps_full_rev * (start_ang + (index % 2) * 0.5))
+
+    display.clockclock.move_to_pose(start_positions, start_positions)
+
+    indices_final = []
+    for index, lst in enumerate(indices):
+        if (index % 2) == first_direction:
+            indices_final.append(lst)
+        else:
+            # reversed list
+            indices_final.append(list(reversed(lst)))
+
+    # wait for move to be done
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    events = []
+    for index in range(len(indices[0])):
+        for lst_t in indices_final:
+            clk_index = lst_t[index]
+            events.append((index * ms_delay, display.timeline_extra_revs, clk_index, new_positions_h[clk_index], 1, extra_revs))
+            events.append((index * ms_delay, display.timeline_extra_revs, clk_index + 24, new_positions_m[clk_index], -1, extra_revs))
+
+    await display.play_timeline(events)
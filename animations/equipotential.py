@@ -0,0 +1,46 @@
+"""
+equipotential animation, visualises equipotential line directions of 2 point charges
+"""
+import random
+import PoseTables
+from animations import scale_pose
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """Display a series of new positions on the clock, visualises directions of equipotential lines with 2 point charges
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    extra_revs = 1
+    ms_delay = 400
+    ms_delay_start = 300
+    direction = random.choice([-1, 1])
+
+    # one pose for each combination of the 3 possible locations of each charge
+    pose_index = random.choice([0, 1, 2]) * 3 + random.choice([0, 1, 2])
+    start_positions_h = scale_pose(PoseTables.equipotential_h[pose_index], display.steps_full_rev)
+    start_positions_m = scale_pose(PoseTables.equipotential_m[pose_index], display.steps_full_rev)
+
+    events = []
+    for col_index, col in enumerate(display.column_indices):
+        for clk_index in col:
+            events.append((col_index * ms_delay_start, display.timeline_move_to, clk_index, start_positions_h[clk_index], 0, 0))
+            events.append((col_index * ms_delay_start, display.timeline_move_to, clk_index + 24, start_positions_m[clk_index], 0, 0))
+
+    await display.play_timeline(events)
+
+    #wait for move to be done
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    events = []
+    for index, col in enumerate(display.column_indices):
+        for clk_index in col:
+            events.append((index * ms_delay, display.timeline_extra_revs, clk_index, new_positions_h[clk_index], direction, extra_revs))
+            events.append((index * ms_delay, display.timeline_extra_revs, clk_index + 24, new_positions_m[clk_index], direction, extra_revs))
+
+    await display.play_timeline(events)
@@ -0,0 +1,23 @@
+"""
+extra revs animation, move with extra revolutions to target
+"""
+import random
+
+async def new_pose(display, new_positions_h, new_positions_m, direction=0, extra_revs=2):
+    """Display a series of new positions on the clock, move stepper the shortest path to its destianation
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    direction : int
+        optional, if direction is 0 the value is chosen randomly
+    extra_revs : int
+        optional, how many etra revs to take to target pos
+    """
+    if direction == 0:
+        direction = random.choice([-1, 1])
+
+    display.clockclock.move_to_extra_revs_pose(new_positions_h, new_positions_m, direction, direction, extra_revs)
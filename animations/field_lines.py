@@ -0,0 +1,33 @@
+"""
+field lines animation, visualize electric vector field of 2 point charges
+"""
+import random
+import PoseTables
+from animations import scale_pose
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """Display a series of new positions on the clock, visualises vectors of electric field with 2 point charges
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    extra_revs = 1
+    direction = random.choice([-1, 1])
+
+    # one pose for each of the 3 possible pairs of charges
+    pose_index = random.choice([0, 1, 2])
+
+    start_positions_h = scale_pose(PoseTables.field_lines_h[pose_index], display.steps_full_rev)
+    start_positions_m = scale_pose(PoseTables.field_lines_m[pose_index], display.steps_full_rev)
+
+    display.clockclock.move_to_pose(start_positions_h, start_positions_m)
+
+    #wait for move to be done
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    display.clockclock.move_to_extra_revs_pose(new_positions_h, new_positions_m, direction, direction, extra_revs)
@@ -0,0 +1,75 @@
+"""
+focus animation, move all pointer to point to center and move with extra rotation to target, maybe change speed depending on how far out
+"""
+import math
+import random
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """Display a series of new positions on the clock, move all pointer to point to center and
+    move with extra rotation to target
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    extra_revs = 1
+    direction = random.choice([1, -1])
+
+    # up is poitive x axis
+    # left is poitive y axis
+    # origin is at the center of top left clock
+    #center, top left, bottom left, bottom right, top right
+    #points = [[-1, -3.5], [-1, -3.5], [0.5, -3.5], [-2.5, -3.5]]
+    #point = random.choice(points)
+    point = [-1, -3.5]
+    start_positions = [0] * 24
+
+    for clk_index in range(24):
+        # this assumes equal vertical and horizontal clock spacing, which is the case obv
+        row = clk_index // 8
+        col = clk_index % 8
+
+        #the locations of the current stepper in units of clock spacing
+        loc_x = -row
+        loc_y = -col
+
+        # the point the steppers should point too in units of clock spacing
+        point_x = point[0]
+        point_y = point[1]
+
+        dist_x = point_x - loc_x # signed distance in vertical direction to point
+        dist_y = point_y - loc_y # signed distance in horizontal direction to point
+
+        theta = (-math.atan2(dist_y, dist_x) + math.pi * 2) % (math.pi * 2)
+        frac_ang = theta / (math.pi * 2)  # angle from 12 o clock position in cw dir
+
+        start_positions[clk_index] = int(frac_ang * display.steps_full_rev)
+
+    display.clockclock.move_to_pose(start_positions, start_positions)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    delay_per_distance = 400 # ms
+    start_delays = [0] * len(display.column_indices)
+    col_indices = list(range(len(display.column_indices)))
+    #calculate time delay of each column to point to scale start time
+    for col_index in col_indices:
+        loc_y = -col_index
+        point_y = point[1]
+        distance = abs(point_y - loc_y)
+
+        start_delays[col_index] = int(distance * delay_per_distance)
+
+    # the columns start relative to the first one
+    first_delay = min(start_delays)
+    events = []
+    for col_index, col in enumerate(display.column_indices):
+        for clk_index in col:
+            events.append((start_delays[col_index] - first_delay, display.timeline_extra_revs, clk_index, new_positions_h[clk_index], direction, extra_revs))
+            events.append((start_delays[col_index] - first_delay, display.timeline_extra_revs, clk_index + 24, new_positions_m[clk_index], direction, extra_revs))
+
+    await display.play_timeline(events)
@@ -0,0 +1,56 @@
+"""
+game of life animation, cellular automaton
+"""
+import random
+import uasyncio as asyncio
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """Animation: Runs Conway's Game of Life."""
+    num_generations = 6
+    alive_frac = (0.0, 0.0) # Pointing up/down
+    dead_frac = (0.25, 0.75) # Horizontal
+
+    # Correct dimensions: 3 rows, 8 columns
+    grid = [[random.choice([True, False]) for _ in range(8)] for _ in range(3)]
+    grid_positions_h = [0] * 24
+    grid_positions_m = [0] * 24
+
+    for _ in range(num_generations):
+        # Display current grid
+        # Corrected loop: iterate through 3 rows and 8 columns
+        for r in range(3):
+            for c in range(8):
+                clk_index = r * 8 + c
+                h_frac, m_frac = alive_frac if grid[r][c] else dead_frac
+                grid_positions_h[clk_index] = int(h_frac * display.steps_full_rev)
+                grid_positions_m[clk_index] = int(m_frac * display.steps_full_rev)
+        display.clockclock.move_to_pose(grid_positions_h, grid_positions_m)
+
+        display.clockclock.clear_movement_done()
+        await display.clockclock.movement_done_event.wait()
+
+        # Calculate next state
+        new_grid = [[False] * 8 for _ in range(3)]
+        # Corrected loop: iterate through 3 rows and 8 columns
+        for r in range(3):
+            for c in range(8):
+                live_neighbors = 0
+                for dr in [-1, 0, 1]:
+                    for dc in [-1, 0, 1]:
+                        if dr == 0 and dc == 0: continue
+                        nr, nc = r + dr, c + dc
+                        # Boundary check must use the correct dimensions
+                        if 0 <= nr < 3 and 0 <= nc < 8 and grid[nr][nc]:
+                            live_neighbors += 1
+
+                if grid[r][c] and live_neighbors in [2, 3]: new_grid[r][c] = True
+                elif not grid[r][c] and live_neighbors == 3: new_grid[r][c] = True
+
+        # check if stable
+        if new_grid == grid:
+            await asyncio.sleep(0.5)
+            break
+        grid = new_grid
+
+    # Move to final positions
+    display.clockclock.move_to_pose(new_positions_h, new_positions_m)
@@ -0,0 +1,57 @@
+"""
+hamiltonian animation, show a hamiltonian path
+"""
+import random
+import uasyncio as asyncio
+from struct import unpack
+
+# packed paths written by test/generate_hamiltonians.py, 3 byte header (count, length) and one byte per clock index
+paths_file = "hamiltonian_paths.bin"
+default_path = bytes([0, 1, 2, 3, 4, 5, 6, 7, 15, 14, 13, 12, 11, 10, 9, 8, 16, 17, 18, 19, 20, 21, 22, 23])
+
+# only the header is read when the animation is first imported, a single path is read from flash when it is needed
+path_count = 0
+path_length = 0
+try:
+    with open(paths_file, 'rb') as f:
+        path_count, path_length = unpack("<HB", f.read(3))
+    print(f"Found {path_count} Hamiltonian paths.")
+except OSError:
+    print(f"Warning: {paths_file} not found. Hamiltonian animation will use a fixed path.")
+
+def read_path(path_index):
+    if path_count == 0:
+        return default_path
+
+    with open(paths_file, 'rb') as f:
+        f.seek(3 + path_index * path_length)
+        return f.read(path_length)
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """Animation: Draws a random continuous Hamiltonian path."""
+    path = read_path(random.randrange(path_count or 1))
+
+    direction_to_frac = {-8: 0.0, 8: 0.5, -1: 0.75, 1: 0.25}
+
+    for i, clk_index in enumerate(path):
+        in_dir = path[i-1] - clk_index if i > 0 else path[i+1] - clk_index
+        out_dir = path[i+1] - clk_index if i < len(path) - 1 else path[i-1] - clk_index
+
+        pos_h_frac = direction_to_frac.get(in_dir, 0.0)
+        pos_m_frac = direction_to_frac.get(out_dir, 0.5)
+
+        display.hour_steppers[clk_index].move_to(int(pos_h_frac * display.steps_full_rev), 0)
+        display.minute_steppers[clk_index].move_to(int(pos_m_frac * display.steps_full_rev), 0)
+
+        await asyncio.sleep(0.3)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    await asyncio.sleep(0.7)
+
+    for i, clk_index in enumerate(path):
+        display.hour_steppers[clk_index].move_to(new_positions_h[clk_index], 0)
+        display.minute_steppers[clk_index].move_to(new_positions_m[clk_index], 0)
+
+        await asyncio.sleep(0.3)
@@ -0,0 +1,34 @@
+"""
+handoff animation, all move pointing down, then bottom row starts opposing pointer thing, when done second row starts ("handoff") and so on
+"""
+import uasyncio as asyncio
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """all move pointing down, then bottom row starts opposing pointer thing, when done second row starts ("handoff") and so on
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    start_pos = 0
+    end_pos = int(display.steps_full_rev * 0.5)
+
+    display.clockclock.move_to_all(start_pos, 0)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    for clk_indices in display.row_indices:
+        for clk_index in clk_indices:
+            display.hour_steppers[clk_index].move_to(end_pos, 1)
+            display.minute_steppers[clk_index].move_to(end_pos, -1)
+
+        await asyncio.sleep(4.65)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    display.clockclock.move_to_pose(new_positions_h, new_positions_m)
@@ -0,0 +1,26 @@
+"""
+opposing pointers animation, align all pointers at bottom and start moving minute and hours opposite direction with extra rotations to target
+"""
+import random
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """Display a series of new positions on the clock, align all pointers at bottom and start moving minute and hours
+    opposite direction with extra rotations to target
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    extra_revs = 1
+    start_ang = random.choice([0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875])
+    start_pos = int(display.steps_full_rev * start_ang)
+
+    display.clockclock.move_to_all(start_pos, 0)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    display.clockclock.move_to_extra_revs_pose(new_positions_h, new_positions_m, 1, -1, extra_revs)
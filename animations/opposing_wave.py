@@ -0,0 +1,38 @@
+"""
+opposing wave animation, like opposing pointers but starts from left with delay between columns
+"""
+import random
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """like opposing pointers but starts from left with delay between columns
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    direction = random.randint(0, 1)
+    ms_delay = 450
+    extra_revs = 1
+
+    if direction == 0:
+        start_pos = int(display.steps_full_rev * 0.75)
+        column_indices = display.column_indices
+    else:
+        start_pos = int(display.steps_full_rev * 0.25)
+        column_indices = reversed(display.column_indices)
+
+    display.clockclock.move_to_all(start_pos, 0)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    events = []
+    for index, col in enumerate(column_indices):
+        for clk_index in col:
+            events.append((index * ms_delay, display.timeline_extra_revs, clk_index, new_positions_h[clk_index], 1, extra_revs))
+            events.append((index * ms_delay, display.timeline_extra_revs, clk_index + 24, new_positions_m[clk_index], -1, extra_revs))
+
+    await display.play_timeline(events)
@@ -0,0 +1,20 @@
+"""
+opposites animation, simply rotate pointers in opposing directions to target
+"""
+
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """Display a series of new positions on the clock, simply rotate minute and hour pointers in opposing directions to target
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    extra_revs : int
+        optional parameter for extra revs
+    """
+    extra_revs = 2
+
+    display.clockclock.move_to_extra_revs_pose(new_positions_h, new_positions_m, 1, -1, extra_revs)
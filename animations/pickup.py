@@ -0,0 +1,51 @@
+"""
+pickup animation
+"""
+import random
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    # pointers start moving from one of randomly chosen 4 positions (3,6,9,12) into random direction
+    # any pointers at the chosen position start moving immediately in chosen direction,
+    # any pointers in other position start moving with a delay so they are in phase
+    # they then do one full rotation when arriving at initial position
+    # then they move the less than 1*full_rotation in the same direction to their target
+    # i think max amount of rotation will be 2.875 rotations
+
+    speed = display.clockclock.current_speed
+
+    # pick random quadrant (3, 6, 9, 12)
+    start_pos = random.choice([display.steps_full_rev // 4 * k for k in (0, 2)])
+    direction = random.choice([-1, 1]) # 1 is clockwise, -1 is counterclockwise
+
+    delays_ms = [0] * 48
+    min_steps = [0] * 48
+
+    current_pos = [0] * 48
+    target_pos = [0] * 48
+
+    for clk_idx in range(24):
+        current_pos[clk_idx] = display.hour_steppers[clk_idx].current_target_pos % display.steps_full_rev
+        current_pos[clk_idx + 24] = display.minute_steppers[clk_idx].current_target_pos % display.steps_full_rev
+
+        target_pos[clk_idx] = new_positions_h[clk_idx]
+        target_pos[clk_idx + 24] = new_positions_m[clk_idx]
+
+    for ptr_idx in range(48):
+        pos = current_pos[ptr_idx]
+
+        # distance from start_pos to current_pos
+        if direction == 1:
+            dist_start_to_pos = (pos - start_pos) % display.steps_full_rev
+        else:
+            dist_start_to_pos = (start_pos - pos) % display.steps_full_rev
+
+        # delay so all pointers line up at start_pos together
+        delays_ms[ptr_idx] = int(dist_start_to_pos / speed * 1000)
+
+        # after delay: move (steps_full_rev - dist_start_to_pos) + 1 full rev + final leg (-10 is just so i dont make some off by 1 error that forces a full rotation, i dont think its needed but it doesnt hurt)
+        min_steps[ptr_idx] = (display.steps_full_rev - dist_start_to_pos) + display.steps_full_rev - 10
+
+    # start each pointer after its delay, the hour and minute pointers that are due together go out in one pose frame
+    # min steps means at least this many steps will be done when moving to target
+    events = [(delays_ms[ptr_idx], display.timeline_min_steps, ptr_idx, target_pos[ptr_idx], direction, min_steps[ptr_idx]) for ptr_idx in range(48)]
+    await display.play_timeline(events)
@@ -0,0 +1,43 @@
+"""
+random animation, all clocks move to unique radnom position, once all clocks reach the move to correct one with shortest path
+"""
+import random
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """all clocks move to unique radnom position, once all clocks reach the move to correct one with shortest path
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    extra_revs : int
+        optional parameter for extra revs
+    """
+    ms_delay = 300
+
+    events = []
+    for col_index, col in enumerate(display.column_indices):
+        for clk_index in col:
+            direction = random.choice([-1, 1])
+            position = random.randrange(display.steps_full_rev)
+            events.append((col_index * ms_delay, display.timeline_move_to, clk_index, position, direction, 0))
+            direction = random.choice([-1, 1])
+            position = random.randrange(display.steps_full_rev)
+            events.append((col_index * ms_delay, display.timeline_move_to, clk_index + 24, position, direction, 0))
+
+    await display.play_timeline(events)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    ms_delay = 400
+
+    events = []
+    for col_index, col in enumerate(display.column_indices):
+        for clk_index in col:
+            events.append((col_index * ms_delay, display.timeline_move_to, clk_index, new_positions_h[clk_index], 0, 0))
+            events.append((col_index * ms_delay, display.timeline_move_to, clk_index + 24, new_positions_m[clk_index], 0, 0))
+
+    await display.play_timeline(events)
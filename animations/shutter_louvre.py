@@ -0,0 +1,89 @@
+"""
+shutter louvre animation
+"""
+import random
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    # clock must move at least a bit, if both stay in the same place both do a full rotation in a random direction
+    # minute pointer moves, picks up hour, drops off hours, stops
+    # hour and minute assignment is non strict
+
+    # minute moves to hour, drops off hour, stops
+    # maximum 1.5 rotations by minute pointer
+
+    # calculate the distances between the minute and hour pointer in the chosen direction
+    delays_ms = [0] * 24
+
+    steps_h = [0] * 24
+    steps_m = [0] * 24
+
+    directions = [0] * 24
+
+    speed = display.clockclock.current_speed
+
+    final_pos_m = [0] * 24
+    final_pos_h = [0] * 24
+
+    for clk_idx in range(24):
+        pos_h = display.hour_steppers[clk_idx].current_target_pos % display.steps_full_rev
+        pos_m = display.minute_steppers[clk_idx].current_target_pos % display.steps_full_rev
+
+        distance_cw = (pos_h - pos_m) % display.steps_full_rev
+        distance_ccw = (pos_m - pos_h) % display.steps_full_rev
+
+        if distance_cw < distance_ccw:
+            directions[clk_idx] = 1
+        elif distance_cw == distance_ccw:
+            directions[clk_idx] = random.choice([-1, 1])
+        else:
+            directions[clk_idx] = -1
+
+        if directions[clk_idx] == 1:
+            distance = distance_cw
+        else:
+            distance = distance_ccw
+
+        # calculate both distances from from pickup to dropoff
+        if directions[clk_idx] == 1:
+            distance_pickup_to_dropoff_1 = (new_positions_h[clk_idx] - pos_h) % display.steps_full_rev
+            distance_pickup_to_dropoff_2 = (new_positions_m[clk_idx] - pos_h) % display.steps_full_rev
+        else:
+            distance_pickup_to_dropoff_1 = (pos_h - new_positions_h[clk_idx]) % display.steps_full_rev
+            distance_pickup_to_dropoff_2 = (pos_h - new_positions_m[clk_idx]) % display.steps_full_rev
+
+        # hour pointer is dropped off at first non-zero dropoff point, minute pointer at the other one
+        if distance_pickup_to_dropoff_1 == 0 and distance_pickup_to_dropoff_2 == 0:
+            steps_h[clk_idx] = display.steps_full_rev
+            steps_m[clk_idx] = display.steps_full_rev + distance
+            final_pos_h[clk_idx] = new_positions_h[clk_idx]
+            final_pos_m[clk_idx] = new_positions_m[clk_idx]
+        elif distance_pickup_to_dropoff_1 == 0:
+            steps_h[clk_idx] = distance_pickup_to_dropoff_2
+            steps_m[clk_idx] = display.steps_full_rev + distance
+            final_pos_h[clk_idx] = new_positions_m[clk_idx]
+            final_pos_m[clk_idx] = new_positions_h[clk_idx]
+        elif distance_pickup_to_dropoff_2 == 0:
+            steps_h[clk_idx] = distance_pickup_to_dropoff_1
+            steps_m[clk_idx] = display.steps_full_rev + distance
+            final_pos_h[clk_idx] = new_positions_h[clk_idx]
+            final_pos_m[clk_idx] = new_positions_m[clk_idx]
+        elif distance_pickup_to_dropoff_1 < distance_pickup_to_dropoff_2:
+            steps_h[clk_idx] = distance_pickup_to_dropoff_1
+            steps_m[clk_idx] = distance_pickup_to_dropoff_2 + distance
+            final_pos_h[clk_idx] = new_positions_h[clk_idx]
+            final_pos_m[clk_idx] = new_positions_m[clk_idx]
+        else:
+            steps_h[clk_idx] = distance_pickup_to_dropoff_2
+            steps_m[clk_idx] = distance_pickup_to_dropoff_1 + distance
+            final_pos_h[clk_idx] = new_positions_m[clk_idx]
+            final_pos_m[clk_idx] = new_positions_h[clk_idx]
+
+        delays_ms[clk_idx] = int(distance / speed * 1000) if speed > 0 else 0
+
+    # minute pointers start right away, each hour pointer once the minute pointer picks it up
+    events = []
+    for clk_idx in range(24):
+        events.append((0, display.timeline_min_steps, clk_idx + 24, final_pos_m[clk_idx], directions[clk_idx], steps_m[clk_idx] - 10))
+        events.append((delays_ms[clk_idx], display.timeline_min_steps, clk_idx, final_pos_h[clk_idx], directions[clk_idx], steps_h[clk_idx] - 10))
+
+    await display.play_timeline(events)
@@ -0,0 +1,37 @@
+"""
+small circles animation, small circles made of 4 clocks each
+"""
+
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """small circles made of 4 clocks each
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    extra_revs = 1
+    start_positions = [0] * 24
+
+    # top and botom row
+    for row in range(2):
+        for col in range(8):
+            clk_index = row * 16 + col
+
+            start_positions[clk_index] = int((0.25 * (col % 2) + 0.375) * display.steps_full_rev)
+
+    # middle row
+    for col in range(8):
+        clk_index = 8 + col
+
+        start_positions[clk_index] = int((0.75 * (col % 2) + 0.125) * display.steps_full_rev)
+
+    display.clockclock.move_to_pose(start_positions, start_positions)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    display.clockclock.move_to_extra_revs_pose(new_positions_h, new_positions_m, 1, -1, extra_revs)
@@ -0,0 +1,39 @@
+"""
+smaller bigger animation
+"""
+
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """idk how to describe
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    extra_revs = 1
+    start_positions_h = [0] * 24
+    start_positions_m = [0] * 24
+
+    for index, clk_lst in enumerate(display.column_indices):
+        if (index % 2) == 0:
+            h_pos = int(0.125 * display.steps_full_rev)
+            m_pos = int(0.375 * display.steps_full_rev)
+        else:
+            h_pos = int(0.625 * display.steps_full_rev)
+            m_pos = int(0.875 * display.steps_full_rev)
+
+        for clk_index in clk_lst:
+            start_positions_h[clk_index] = h_pos
+            start_positions_m[clk_index] = m_pos
+
+    display.clockclock.move_to_pose(start_positions_h, start_positions_m)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+
+    direction = 1
+    display.clockclock.move_to_extra_revs_pose(new_positions_h, new_positions_m, direction, direction, extra_revs)
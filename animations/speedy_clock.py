@@ -0,0 +1,40 @@
+"""
+speedy clock animation, move minute and hour hand at different speeds to move somewhat like a clock althoug hour hand doesnt move as slow
+"""
+import uasyncio as asyncio
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """move minute and hour hand at different speeds to move somewhat like a clock althoug hour hand doesnt move as slow
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    extra_revs : int
+        optional parameter for extra revs
+    """
+    ms_delay = 400
+    oldspeed = display.clockclock.current_speed
+    hour_speed = int(display.clockclock.current_speed * 0.38)
+
+    display.clockclock.set_speed_hour(hour_speed)
+
+    events = []
+    for col_index, col in enumerate(display.column_indices):
+        for clk_index in col:
+            events.append((col_index * ms_delay, display.timeline_extra_revs, clk_index, new_positions_h[clk_index], 1, 1))
+            events.append((col_index * ms_delay, display.timeline_extra_revs, clk_index + 24, new_positions_m[clk_index], 1, 3))
+
+    try:
+        await display.play_timeline(events)
+    except asyncio.CancelledError:
+        display.clockclock.set_speed_hour(oldspeed) # gets called only when task is cancelled
+        raise
+
+    display.clockclock.clear_movement_done()
+    try:
+        await display.clockclock.movement_done_event.wait()
+    finally:
+        display.clockclock.set_speed_hour(oldspeed) #always gets called, even when task is cancelled
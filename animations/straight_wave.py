@@ -0,0 +1,44 @@
+"""
+straight wave animation, align steppers in straight line at 45 degrees and start moving delayed from left to right
+"""
+import random
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """Display a series of new positions on the clock, move all steppers to make
+    minute and hour hands form a line, the start rotating staggered left to right
+    with extra revolutions
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    ms_delay = 400 # movement delay between individual columns
+    extra_revs = 1
+    direction = random.choice([-1, 1])
+    start_ang = random.choice([0.875, 0.625, 0.75])
+
+    wave_direction = random.randint(0, 1)
+    if wave_direction == 0:
+        column_indices = display.column_indices
+    else:
+        column_indices = reversed(display.column_indices)
+
+    start_pos_m = int(display.steps_full_rev * start_ang)
+    start_pos_h = int(display.steps_full_rev * (start_ang - 0.5))
+
+    display.clockclock.move_to_hour(start_pos_h, 0)
+    display.clockclock.move_to_minute(start_pos_m, 0)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+
+    events = []
+    for col_index, col in enumerate(column_indices):
+        for clk_index in col:
+            events.append((col_index * ms_delay, display.timeline_extra_revs, clk_index, new_positions_h[clk_index], direction, extra_revs))
+            events.append((col_index * ms_delay, display.timeline_extra_revs, clk_index + 24, new_positions_m[clk_index], direction, extra_revs))
+
+    await display.play_timeline(events)
@@ -0,0 +1,55 @@
+"""
+uhrenspiel animation, dangling pointers
+"""
+import uasyncio as asyncio
+
+async def new_pose(display, new_positions_h, new_positions_m):
+    """uhrenspiel, dangling pointers
+
+    Parameters
+    ----------
+    new_positions_h : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    new_positions_m : List[int]
+        the positions to display for hour steppers, should int arrays of length 24
+    """
+    oldspeed = display.clockclock.current_speed
+    oldaccel = display.clockclock.current_accel
+
+    # these values are generated with a scipy script
+    # simulating a damped pendulum and taking peak accel and speed values for each period
+    startpos_h = 864
+    targetpos_h = [2628, 1959, 2248, 2160]
+    startpos_m = int(display.steps_full_rev - 864)
+    targetpos_m = [int(display.steps_full_rev/2) + (int(display.steps_full_rev/2) - i) for i in targetpos_h]
+    speed = [int(i * 0.9) for i in [1000, 511, 224, 99]]
+    accel = [int(i * 0.9) for i in [1422, 1072, 490, 217]]
+
+    display.clockclock.move_to_hour(startpos_h, 0)
+    display.clockclock.move_to_minute(startpos_m, 0)
+
+    display.clockclock.clear_movement_done()
+    await display.clockclock.movement_done_event.wait()
+    display.clockclock.set_accel_all(750)
+
+    for i in range(len(speed)):
+        display.clockclock.set_speed_all(speed[i])
+        #display.clockclock.set_accel_all(accel[i])
+
+        display.clockclock.move_to_hour(targetpos_h[i], 0)
+        display.clockclock.move_to_minute(targetpos_m[i], 0)
+
+        display.clockclock.clear_movement_done()
+        try:
+            await display.clockclock.movement_done_event.wait()
+        except asyncio.CancelledError:
+            display.clockclock.set_speed_all(oldspeed) # only gets called when task is cancelled
+            display.clockclock.set_accel_all(oldaccel)
+            raise
+
+    display.clockclock.set_speed_all(oldspeed)
+    display.clockclock.set_accel_all(oldaccel)
+
+    await asyncio.sleep_ms(1000)
+
+    display.clockclock.move_to_pose(new_positions_h, new_positions_m)
@@ -2,7 +2,7 @@ import machine
 import time
 from ClockClock24 import ClockClock24
 import uasyncio as asyncio
-from OneButton import OneButton
+from OneButton import OneButtonIRQ
 from ntpModule import NTPmodule
 
 # button handlers
@@ -30,14 +30,38 @@ def cycle_page(pin):
         if clockclock.get_mode() == ClockClock24.modes["settings"]:
             clockclock.settings_change_page(1)
 
+def wait_for_modules(modules, timeout_ms=10000):
+    """polls the modules with an increasing delay until all of them answer, returns False on timeout"""
+    start_ms = time.ticks_ms()
+    delay_ms = 10
+    waiting = list(modules)
+    
+    while True:
+        waiting = [module for module in waiting if not module.is_ready()]
+        if not waiting:
+            return True
+        
+        if time.ticks_diff(time.ticks_ms(), start_ms) >= timeout_ms:
+            if __debug__:
+                print("Modules not answering:", [module.i2c_address for module in waiting])
+            return False
+        
+        time.sleep_ms(delay_ms)
+        delay_ms = min(delay_ms * 2, 100)
+
+def log_boot_phase(name, start_ms):
+    if __debug__:
+        print("Boot phase", name, "took", time.ticks_diff(time.ticks_ms(), start_ms), "ms")
+    return time.ticks_ms()
+
 #main loop
 async def main_loop():
     global alarm_flag
     
-    button_mode = OneButton(19, True)
-    button_plus = OneButton(21, True)
-    button_minus = OneButton(18, True)
-    button_next_digit = OneButton(20, True)
+    button_mode = OneButtonIRQ(19, True)
+    button_plus = OneButtonIRQ(21, True)
+    button_minus = OneButtonIRQ(18, True)
+    button_next_digit = OneButtonIRQ(20, True)
     buttons = [button_mode, button_plus, button_minus, button_next_digit]
 
     button_mode.attachClick(cycle_mode)
@@ -49,13 +73,17 @@ async def main_loop():
     button_next_digit.attachClick(cycle_field)
     button_next_digit.attachLongPressStop(cycle_page)
 
+    # the buttons run from pin interrupts, their tasks only wake up when a button is used
+    for button in buttons:
+        asyncio.create_task(button.run())
+
     while True:
         await clockclock.run()
 
-        for button in buttons:
-            button.tick()
+        await clockclock.wait_for_work() # sleeps until the minute alarm, a new time to show or the end of a movement
 
-        await asyncio.sleep(0.01)  # Sleep for a short time to yield control
+boot_start_ms = time.ticks_ms()
+phase_start_ms = boot_start_ms
 
 i2c1 = machine.I2C(1, sda=machine.Pin(14), scl=machine.Pin(3), freq=25000)
 i2c0 = machine.I2C(0, sda=machine.Pin(16), scl=machine.Pin(17), freq=25000)
@@ -69,12 +97,26 @@ module_i2c_bus = [i2c1, i2c0, # the bus on which the module is
                   i2c1, i2c0, 
                   i2c1, i2c0]
 
-time.sleep(6) #wait so clock modules have time to setup
-
 clk_interrupt_pin = 13
 
+# the module firmware understands the pose_frame command (cmd id 9), so a new pose is sent as one frame per module
+# instead of one command per stepper. Modules still running firmware without it drop these frames and don't move,
+# set this to False for them
+module_pose_frames = True
+
 ntp = NTPmodule(i2c0, 40)
 
-clockclock = ClockClock24(module_i2c_adr, module_i2c_bus, i2c1, clk_interrupt_pin, ntp, 4320)
+phase_start_ms = log_boot_phase("buses", phase_start_ms)
+
+# settings, rtc and digit display are set up while the clock modules are still booting, nothing is sent to the
+# modules before the main loop runs
+clockclock = ClockClock24(module_i2c_adr, module_i2c_bus, i2c1, clk_interrupt_pin, ntp, 4320, pose_frames=module_pose_frames)
+
+phase_start_ms = log_boot_phase("clockclock", phase_start_ms)
+
+wait_for_modules(clockclock.clock_modules) # instead of a fixed wait so clock modules have time to setup
+
+phase_start_ms = log_boot_phase("modules ready", phase_start_ms)
+log_boot_phase("total", boot_start_ms)
 
 asyncio.run(main_loop())
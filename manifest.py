@@ -0,0 +1,21 @@
+# Freezes the firmware into a micropython build for the pico, so it runs as bytecode from flash instead of being
+# compiled into ram at boot. Only main.py and hamiltonian_paths.bin have to be copied to the pico afterwards.
+#   make -C ports/rp2 BOARD=RPI_PICO FROZEN_MANIFEST=/path/to/this/manifest.py
+# test/build_mpy.py precompiles the same modules to .mpy files instead, which doesn't need a firmware build.
+include("$(PORT_DIR)/boards/manifest.py")
+
+module("BusScheduler.py")
+module("ClockClock24.py")
+module("ClockStepperModule.py")
+module("DS3231_timekeeper.py")
+module("DigitDisplay.py")
+module("I2CMetrics.py")
+module("MotionModel.py")
+module("OneButton.py")
+module("PersistentStorage.py")
+module("PoseTables.py")
+module("Trace.py")
+module("ntpModule.py")
+module("urtc.py")
+
+package("animations")
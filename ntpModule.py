@@ -2,11 +2,14 @@ import machine
 from struct import pack, unpack
 import time
 import uasyncio as asyncio
+from utime import ticks_us
+from I2CMetrics import metrics
 
 class NTPmodule:
     
     def __init__(self, i2c_bus, address, i2c_polling_interval=3):
         self.i2c = i2c_bus
+        self.metrics_bus = i2c_bus # the hardware bus, also once i2c is wrapped so the metrics count it only once
         self.address = address
         
         #how often to check if ntp module has received new time
@@ -38,28 +41,36 @@ class NTPmodule:
         self.i2c_write(buffer)
         
     def __read_ntp(self):
+        start_us = ticks_us()
         try:
             timebuf = self.i2c.readfrom(self.address, 5)
-            checksum_received = unpack("<BBBBB", timebuf)[-1]
-            checksum = self.calculate_Checksum(timebuf[:-1])
-            if checksum == checksum_received:
-                return unpack("<BBBB", timebuf[:-1])
-            else:
-                if __debug__:
-                    print("NTP checksum error")
-                return (0, 0, 0, 0)
         except:
+            metrics.record(self.metrics_bus, self.address, 5, start_us, False)
             if __debug__:
                 print("NTP module not found")
             return (0, 0, 0, 0)
+
+        metrics.record(self.metrics_bus, self.address, 5, start_us, True)
+        checksum_received = unpack("<BBBBB", timebuf)[-1]
+        checksum = self.calculate_Checksum(timebuf[:-1])
+        if checksum == checksum_received:
+            return unpack("<BBBB", timebuf[:-1])
+        else:
+            metrics.checksum_error(self.address)
+            if __debug__:
+                print("NTP checksum error")
+            return (0, 0, 0, 0)
         
     def i2c_write(self, buffer):
         checksum = self.calculate_Checksum(buffer)
         buffer += pack("<B", checksum)
 
+        start_us = ticks_us()
         try:
             self.i2c.writeto(self.address, buffer)
+            metrics.record(self.metrics_bus, self.address, len(buffer), start_us, True)
         except:
+            metrics.record(self.metrics_bus, self.address, len(buffer), start_us, False)
             if __debug__:
                 print("NTP module not found", buffer)
     
@@ -0,0 +1,222 @@
+import argparse
+import datetime
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import emulation
+
+emulation.install() # the clock modules import machine, uasyncio, ... so this has to happen first
+
+from emulation.clock import clock
+from DigitDisplay import DigitDisplay
+from ClockClock24 import ClockClock24
+
+# --- Configuration ---
+START_TIME = datetime.datetime(2000, 1, 21, 12, 0, 10) # daytime, so the default settings start in visual mode
+FROM_DIGITS = [1, 2, 5, 9] # pose the clock shows before every animation
+TO_DIGITS = [1, 3, 0, 0] # pose every animation moves to
+SEED = 1
+TIMEOUT_S = 300 # emulated seconds an animation may take before it counts as not settled
+
+
+def current_commit():
+    """Returns the hash of the checked out commit, or None if it can't be determined."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=emulation.repo_root,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BusCounter:
+    """Counts the transactions and bytes sent to the clock modules on one emulated bus."""
+    def __init__(self, bus, module_addresses):
+        self.bus = bus
+        self.module_addresses = set(module_addresses)
+        self.first_command = None # (host process time, emulated us) of the first write
+        self.reset()
+        bus.state.listeners.append(self.on_transaction)
+
+    def reset(self):
+        self.transactions = 0
+        self.bytes = 0
+        self.writes = 0
+        self.reads = 0
+        self.first_command = None
+
+    def on_transaction(self, bus, address, is_write, byte_count, data, time_us):
+        if address not in self.module_addresses:
+            return
+        self.transactions += 1
+        self.bytes += byte_count + 1 # the address byte is on the wire too
+        if is_write:
+            self.writes += 1
+            if self.first_command is None:
+                self.first_command = (time.process_time(), time_us)
+        else:
+            self.reads += 1
+
+
+def benchmark_animation(animation_id, steps_full_rev, i2c_freq, seed, pose_frames=True):
+    """
+    Runs one animation on a freshly emulated clock, from FROM_DIGITS to TO_DIGITS.
+
+    Args:
+        animation_id (int): index into DigitDisplay.animations.
+        steps_full_rev (int): steps per revolution of the emulated steppers.
+        i2c_freq (int): frequency of the emulated i2c buses.
+        seed (int): seed of the random module, so random animations are reproducible.
+        pose_frames (bool): whether the modules are sent pose frames instead of one command per stepper.
+
+    Returns:
+        dict: the measurements of the animation.
+    """
+    random.seed(seed)
+    board = emulation.Board(steps_full_rev=steps_full_rev, i2c_freq=i2c_freq, start_time=START_TIME)
+    clockclock = board.build_clockclock(pose_frames=pose_frames)
+    clockclock.rtc.enable_minute_alarm = False # a new minute would start another animation in the middle
+    board.run_until_settled(clockclock, TIMEOUT_S)
+
+    clockclock.set_speed_all(ClockClock24.stepper_speed_default)
+    clockclock.set_accel_all(ClockClock24.stepper_accel_default)
+    clockclock.digit_display.display_digits(FROM_DIGITS, DigitDisplay.animations["shortest path"])
+    board.run_until_settled(clockclock, TIMEOUT_S)
+
+    counters = {bus_id: BusCounter(bus, board.module_i2c_adr) for bus_id, bus in board.buses.items()}
+    clockclock.bus_scheduler.peak_depth = 0
+    random.seed(seed)
+
+    start_cpu = time.process_time()
+    start_us = clock.now_us()
+    clockclock.digit_display.display_digits(TO_DIGITS, animation_id)
+    settle_s = board.run_until_settled(clockclock, TIMEOUT_S)
+    settled = board.is_idle(clockclock)
+
+    first_commands = [counter.first_command for counter in counters.values() if counter.first_command is not None]
+    if first_commands:
+        first_cpu, first_us = min(first_commands)
+        cpu_before_first_ms = (first_cpu - start_cpu) * 1000
+        first_command_ms = (first_us - start_us) / 1000
+    else:
+        cpu_before_first_ms = None
+        first_command_ms = None
+
+    hour, minute = board.pointer_positions()
+    return {
+        "transactions": sum(counter.transactions for counter in counters.values()),
+        "bytes": sum(counter.bytes for counter in counters.values()),
+        "buses": {str(bus_id): {"transactions": counter.transactions,
+                                "bytes": counter.bytes,
+                                "writes": counter.writes,
+                                "reads": counter.reads} for bus_id, counter in counters.items()},
+        "peak_queue_depth": clockclock.bus_scheduler.peak_depth,
+        "cpu_before_first_command_ms": cpu_before_first_ms,
+        "first_command_ms": first_command_ms,
+        "settle_s": settle_s,
+        "settled": settled,
+        "rejected_frames": sum(module.rejected for module in board.modules),
+        "final_positions_h": hour,
+        "final_positions_m": minute,
+    }
+
+
+def benchmark_broadcasts(steps_full_rev, i2c_freq, parallel_buses):
+    """
+    Times the broadcast helpers of ClockClock24 that send one batch to every module.
+
+    Args:
+        steps_full_rev (int): steps per revolution of the emulated steppers.
+        i2c_freq (int): frequency of the emulated i2c buses.
+        parallel_buses (bool): whether the second core drains one bus while the first drains the other.
+
+    Returns:
+        dict: emulated ms each helper blocks the calling core.
+    """
+    board = emulation.Board(steps_full_rev=steps_full_rev, i2c_freq=i2c_freq, start_time=START_TIME)
+    clockclock = board.build_clockclock(shadow_refresh_m=0, parallel_buses=parallel_buses) # every command goes out
+    clockclock.rtc.enable_minute_alarm = False
+    board.run_until_settled(clockclock, TIMEOUT_S)
+
+    broadcasts = {
+        "set_speed_all": lambda: clockclock.set_speed_all(ClockClock24.stepper_speed_default),
+        "set_accel_all": lambda: clockclock.set_accel_all(ClockClock24.stepper_accel_default),
+        "move_to_all": lambda: clockclock.move_to_all(0),
+        "send_heartbeat": clockclock.send_heartbeat,
+    }
+    results = {}
+    for name, broadcast in broadcasts.items():
+        start_us = clock.now_us()
+        broadcast()
+        results[name] = (clock.now_us() - start_us) / 1000
+    board.run_until_settled(clockclock, TIMEOUT_S)
+    return results
+
+
+def print_broadcasts(broadcasts):
+    print(f"{'broadcast':<20}{'serial ms':>11}{'parallel ms':>13}{'ratio':>8}")
+    for name, serial_ms in broadcasts["serial"].items():
+        parallel_ms = broadcasts["parallel"][name]
+        print(f"{name:<20}{serial_ms:>11.2f}{parallel_ms:>13.2f}{parallel_ms / serial_ms:>8.2f}")
+
+
+def run_benchmarks(animation_names, steps_full_rev, i2c_freq, seed, pose_frames=True):
+    results = {}
+    for name in animation_names:
+        print(f"Benchmarking '{name}'...", file=sys.stderr)
+        results[name] = benchmark_animation(DigitDisplay.animations[name], steps_full_rev, i2c_freq, seed, pose_frames)
+    return results
+
+
+def print_summary(results):
+    print(f"{'animation':<20}{'trans':>8}{'bytes':>8}{'peak q':>8}{'cpu ms':>9}{'settle s':>10}")
+    for name, result in results.items():
+        cpu = result["cpu_before_first_command_ms"]
+        cpu = "-" if cpu is None else f"{cpu:.1f}"
+        settle = f"{result['settle_s']:.2f}" + ("" if result["settled"] else "!")
+        print(f"{name:<20}{result['transactions']:>8}{result['bytes']:>8}{result['peak_queue_depth']:>8}{cpu:>9}{settle:>10}")
+
+
+# --- Run the benchmark ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the i2c traffic and timing of every animation on the emulated clock.")
+    parser.add_argument("animations", nargs="*", help="names of the animations to run, all if omitted")
+    parser.add_argument("--output", default="bench_output.json", help="json file the results are written to")
+    parser.add_argument("--steps", type=int, default=4320, help="steps per full revolution of the steppers")
+    parser.add_argument("--freq", type=int, default=25000, help="i2c bus frequency")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--per-stepper", dest="pose_frames", action="store_false",
+                        help="send one command per stepper instead of pose frames, like for module firmware without them")
+    args = parser.parse_args()
+
+    names = args.animations or list(DigitDisplay.animations)
+    for name in names:
+        if name not in DigitDisplay.animations:
+            parser.error(f"unknown animation '{name}'")
+
+    output = os.path.abspath(args.output) # the emulated board changes the working directory to its flash
+    results = run_benchmarks(names, args.steps, args.freq, args.seed, args.pose_frames)
+    broadcasts = {"serial": benchmark_broadcasts(args.steps, args.freq, False),
+                  "parallel": benchmark_broadcasts(args.steps, args.freq, True)}
+
+    report = {
+        "commit": current_commit(),
+        "steps_full_rev": args.steps,
+        "i2c_freq": args.freq,
+        "seed": args.seed,
+        "pose_frames": args.pose_frames,
+        "from_digits": FROM_DIGITS,
+        "to_digits": TO_DIGITS,
+        "animations": results,
+        "broadcasts": broadcasts,
+    }
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=1)
+
+    print_summary(results)
+    print()
+    print_broadcasts(broadcasts)
+    print(f"\nSaved results to '{output}'.")
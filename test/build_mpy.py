@@ -0,0 +1,69 @@
+import argparse
+import glob
+import os
+import shutil
+import subprocess
+import sys
+
+# --- Configuration ---
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(REPO_ROOT, "build")
+SOURCE_ONLY = ["main.py", "manifest.py"] # main.py is only run as source by micropython, the manifest is not firmware
+DATA_FILES = ["hamiltonian_paths.bin"]
+
+
+def firmware_modules():
+    """Returns the firmware modules relative to the repository root, the animations package included."""
+    modules = [os.path.basename(path) for path in glob.glob(os.path.join(REPO_ROOT, "*.py"))]
+    modules = [module for module in modules if module not in SOURCE_ONLY]
+    modules += [os.path.join("animations", os.path.basename(path))
+                for path in glob.glob(os.path.join(REPO_ROOT, "animations", "*.py"))]
+    return sorted(modules)
+
+
+def mpy_cross_command(mpy_cross):
+    """Finds mpy-cross, either the given executable, the one on the path or the mpy_cross pip package."""
+    if mpy_cross is not None:
+        return [mpy_cross]
+    if shutil.which("mpy-cross") is not None:
+        return ["mpy-cross"]
+    try:
+        import mpy_cross as _ # noqa: F401
+        return [sys.executable, "-m", "mpy_cross"]
+    except ImportError:
+        sys.exit("mpy-cross not found, install it with 'pip install mpy-cross' (same version as the firmware) or pass --mpy-cross")
+
+
+def build(output_dir, mpy_cross, optimize):
+    """
+    Precompiles the firmware to .mpy files, so the pico doesn't compile the source at every boot.
+
+    Args:
+        output_dir (str): directory the files to copy onto the pico are written to.
+        mpy_cross (list[str]): command that runs mpy-cross.
+        optimize (int): micropython optimisation level, from 1 on __debug__ is False and the debug prints are removed.
+    """
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+
+    for module in firmware_modules():
+        target = os.path.join(output_dir, os.path.splitext(module)[0] + ".mpy")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        subprocess.check_call(mpy_cross + [f"-O{optimize}", "-o", target, module], cwd=REPO_ROOT)
+        print(f"Compiled '{module}'.")
+
+    for name in SOURCE_ONLY[:1] + DATA_FILES:
+        shutil.copy(os.path.join(REPO_ROOT, name), output_dir)
+        print(f"Copied '{name}'.")
+
+    print(f"\nCopy the contents of '{output_dir}' onto the pico.")
+
+# --- Run the build ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompile the firmware to .mpy files with mpy-cross.")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="directory the compiled firmware is written to")
+    parser.add_argument("--mpy-cross", default=None, help="path of the mpy-cross executable")
+    parser.add_argument("-O", "--optimize", type=int, default=0, help="optimisation level, 1 removes the debug prints")
+    args = parser.parse_args()
+
+    build(os.path.abspath(args.output), mpy_cross_command(args.mpy_cross), args.optimize)
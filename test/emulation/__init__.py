@@ -0,0 +1,163 @@
+"""
+Host side emulation of the clock hardware, so the master code runs on CPython faster than real time.
+
+    import emulation
+    emulation.install()              # must happen before any of the clock modules are imported
+    board = emulation.Board()
+    clockclock = board.build_clockclock()
+    board.run(clockclock, seconds=300)
+
+install() registers stand-ins for machine, utime, uasyncio, ucollections, micropython, gc and _thread and puts
+the repository root on sys.path. Board wires two emulated i2c buses with 6 clock modules and a DS3231 the
+same way main.py does and runs the firmware's main loop on the emulated clock.
+emulation.recorder records the frames written to the modules, to replay or diff them later.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+from . import gc, machine, micropython, sim_thread, uasyncio, ucollections, utime
+from .clock import clock
+from .ds3231 import SimulatedDS3231
+from .slave import SimulatedModule
+
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# files the firmware expects on the flash of the pico
+data_files = ["hamiltonian_paths.bin"]
+
+
+def install():
+    import threading # noqa: F401, keeps the real _thread for the threading module
+
+    sys.modules["machine"] = machine
+    sys.modules["utime"] = utime
+    sys.modules["uasyncio"] = uasyncio
+    sys.modules["ucollections"] = ucollections
+    sys.modules["micropython"] = micropython
+    sys.modules["gc"] = gc
+    sys.modules["_thread"] = sim_thread
+
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+
+class Board:
+    """
+    the emulated pcb of the master, layout as in main.py
+
+    Attributes
+    ----------
+    i2c0, i2c1 : machine.I2C
+        the two emulated buses
+    modules : List[SimulatedModule]
+        the 6 emulated clock modules in the order of module_i2c_adr
+    rtc : SimulatedDS3231
+        the emulated rtc on i2c1, its alarm output is connected to clk_interrupt_pin
+    fs_dir : str
+        directory used as the flash filesystem, the working directory while the board exists
+    """
+    module_i2c_adr = [12, 13,
+                      14, 15,
+                      16, 17]
+    module_i2c_bus_id = [1, 0,
+                         1, 0,
+                         1, 0]
+    clk_interrupt_pin = 13
+
+    def __init__(self, steps_full_rev=4320, i2c_freq=25000, fs_dir=None, start_time=None, module_boot_s=0):
+        clock.reset()
+        machine.reset()
+        uasyncio.new_event_loop()
+
+        self.steps_full_rev = steps_full_rev
+        self.i2c1 = machine.I2C(1, sda=machine.Pin(14), scl=machine.Pin(3), freq=i2c_freq)
+        self.i2c0 = machine.I2C(0, sda=machine.Pin(16), scl=machine.Pin(17), freq=i2c_freq)
+        self.buses = {0: self.i2c0, 1: self.i2c1}
+
+        self.modules = []
+        for address, bus_id in zip(self.module_i2c_adr, self.module_i2c_bus_id):
+            module = SimulatedModule(steps_full_rev, clock.now_us() + int(module_boot_s * 1000000))
+            self.buses[bus_id].attach(address, module)
+            self.modules.append(module)
+
+        if start_time is None:
+            self.rtc = SimulatedDS3231(self.clk_interrupt_pin)
+        else:
+            self.rtc = SimulatedDS3231(self.clk_interrupt_pin, start_time)
+        self.i2c1.attach(SimulatedDS3231.address, self.rtc)
+
+        if fs_dir is None:
+            fs_dir = tempfile.mkdtemp(prefix="clockclock_flash_")
+        self.fs_dir = fs_dir
+        for name in data_files:
+            source = os.path.join(repo_root, name)
+            if os.path.exists(source) and not os.path.exists(os.path.join(fs_dir, name)):
+                shutil.copy(source, fs_dir)
+        os.chdir(fs_dir)
+
+    def module_i2c_bus(self):
+        return [self.buses[bus_id] for bus_id in self.module_i2c_bus_id]
+
+    def build_clockclock(self, ntp_module=None, **kwargs):
+        from ClockClock24 import ClockClock24
+
+        return ClockClock24(self.module_i2c_adr, self.module_i2c_bus(), self.i2c1, self.clk_interrupt_pin,
+                            ntp_module, self.steps_full_rev, **kwargs)
+
+    def now_s(self):
+        return clock.now_us() / 1000000
+
+    def run(self, clockclock, seconds):
+        """runs the main loop of main.py for the given emulated time"""
+        end_us = clock.now_us() + int(seconds * 1000000)
+
+        async def main_loop():
+            while clock.now_us() < end_us:
+                await clockclock.run()
+                await clockclock.wait_for_work(max(1, (end_us - clock.now_us()) // 1000))
+
+        uasyncio.run(main_loop())
+
+    def run_until_settled(self, clockclock, timeout_s=120, loop_delay_s=0.01):
+        """runs the main loop until is_idle(), returns the emulated seconds"""
+        start_us = clock.now_us()
+        end_us = start_us + int(timeout_s * 1000000)
+
+        async def main_loop():
+            while clock.now_us() < end_us:
+                await clockclock.run()
+                if self.is_idle(clockclock):
+                    return
+                await clockclock.wait_for_work(int(loop_delay_s * 1000)) # tasks can finish without waking the loop
+
+        uasyncio.run(main_loop())
+        return (clock.now_us() - start_us) / 1000000
+
+    def is_idle(self, clockclock):
+        """no display, mode change or settings task of clockclock is pending and every pointer stands still"""
+        if clockclock.alarm_flag:
+            return False
+        for task in (clockclock.async_display_task, clockclock.async_mode_change_task, clockclock.async_setting_page_task):
+            if task is not None and not task.done():
+                return False
+        return not self.is_running()
+
+    def is_running(self):
+        return any(stepper.is_running() for module in self.modules for stepper in module.steppers)
+
+    def pointer_positions(self):
+        """current positions of the 24 hour and 24 minute pointers, clk index order like ClockClock24"""
+        return pointer_positions(self.modules)
+
+
+def pointer_positions(modules):
+    """positions of the hour and minute pointers of the modules, given in the order of Board.module_i2c_adr"""
+    hour = []
+    minute = []
+    for module in modules:
+        positions = module.positions()
+        minute.extend(positions[:4])
+        hour.extend(positions[4:])
+    return hour, minute
@@ -0,0 +1,80 @@
+import heapq
+import threading
+
+
+class SimClock:
+    """
+    Virtual time shared by all emulated hardware, in microseconds.
+
+    The main thread plays core 0 and owns the global time, every other thread (the emulated core 1)
+    has its own core time that is synchronised through SimLock, so work done on both cores in parallel
+    only advances the global time by the longer of the two.
+    Hardware events (rtc alarms, timers, button edges) are scheduled on the clock and fire on core 0
+    as soon as its time passes them, like an interrupt would.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._now_us = 0
+        self._local = threading.local()
+        self._events = []
+        self._event_counter = 0
+        self._firing = False
+
+    def _is_main(self):
+        return threading.current_thread() is threading.main_thread()
+
+    def now_us(self):
+        if self._is_main():
+            return self._now_us
+        return getattr(self._local, "now_us", self._now_us)
+
+    def advance(self, duration_us):
+        """let time pass on the calling core, fires due hardware events on core 0"""
+        if duration_us <= 0:
+            return
+        if self._is_main():
+            self.advance_to(self._now_us + duration_us)
+        else:
+            self._local.now_us = self.now_us() + duration_us
+
+    def advance_to(self, time_us):
+        if not self._is_main():
+            if time_us > self.now_us():
+                self._local.now_us = time_us
+            return
+
+        # time spent inside an interrupt handler (i2c access of the handler) passes, nested interrupts wait
+        while not self._firing and self._events and self._events[0][0] <= time_us:
+            event_time, _, callback = heapq.heappop(self._events)
+            if event_time > self._now_us:
+                self._now_us = event_time
+            self._fire(callback)
+
+        if time_us > self._now_us:
+            self._now_us = time_us
+
+    def _fire(self, callback):
+        self._firing = True
+        try:
+            callback()
+        finally:
+            self._firing = False
+
+    def _next_counter(self):
+        self._event_counter += 1
+        return self._event_counter
+
+    def schedule(self, time_us, callback):
+        """fire callback on core 0 once the global time reaches time_us"""
+        heapq.heappush(self._events, (time_us, self._next_counter(), callback))
+
+    def next_event_us(self):
+        if self._events:
+            return self._events[0][0]
+        return None
+
+
+clock = SimClock()
@@ -0,0 +1,141 @@
+"""
+Emulation of the DS3231 register map as far as urtc and DS3231_timekeeper use it:
+time keeping registers 0x00-0x06, alarm 1 registers 0x07-0x0a, control 0x0e and status 0x0f.
+Alarm 1 drives the INT/SQW pin low on a match when INTCN and A1IE are set, until A1F is cleared.
+"""
+import datetime as _datetime
+
+from . import machine
+from .clock import clock
+
+_EPOCH = _datetime.datetime(2000, 1, 1)
+
+
+def _bcd(value):
+    return (value // 10) << 4 | (value % 10)
+
+
+def _from_bcd(value):
+    return (value >> 4) * 10 + (value & 0x0f)
+
+
+class SimulatedDS3231:
+    address = 0x68
+
+    def __init__(self, int_pin, start=_datetime.datetime(2000, 1, 21, 12, 0, 0)):
+        self.int_pin = int_pin
+        self.registers = bytearray(0x13)
+        self.registers[0x0e] = 0b00011100 # power on state, INTCN set
+        self._base_seconds = 0
+        self._set_at_us = 0
+        self.set_time(start)
+        machine.drive(self.int_pin, 1)
+        self._schedule_next_second()
+
+    #region time
+
+    def now(self):
+        elapsed = (clock.now_us() - self._set_at_us) // 1000000
+        return _EPOCH + _datetime.timedelta(seconds=self._base_seconds + elapsed)
+
+    def set_time(self, moment):
+        # the countdown chain restarts when the seconds register is written
+        self._base_seconds = int((moment - _EPOCH).total_seconds())
+        self._set_at_us = clock.now_us()
+
+    def _time_registers(self):
+        now = self.now()
+        return bytes((_bcd(now.second), _bcd(now.minute), _bcd(now.hour), now.isoweekday(),
+                      _bcd(now.day), _bcd(now.month), _bcd(now.year - 2000)))
+
+    def _write_time(self, registers):
+        second = _from_bcd(registers[0] & 0x7f)
+        minute = _from_bcd(registers[1] & 0x7f)
+        hour = _from_bcd(registers[2] & 0x3f)
+        day = max(1, _from_bcd(registers[4] & 0x3f))
+        month = max(1, _from_bcd(registers[5] & 0x1f))
+        year = 2000 + _from_bcd(registers[6])
+        self.set_time(_datetime.datetime(year, month, day, hour, minute, second))
+        self._schedule_next_second()
+
+    #endregion
+
+    #region alarm
+
+    def _schedule_next_second(self):
+        self._generation = getattr(self, "_generation", 0) + 1
+        generation = self._generation
+        elapsed_us = clock.now_us() - self._set_at_us
+        next_us = self._set_at_us + (elapsed_us // 1000000 + 1) * 1000000
+
+        def tick():
+            if generation != self._generation:
+                return
+            self._check_alarm()
+            self._schedule_next_second()
+
+        clock.schedule(next_us, tick)
+
+    def _check_alarm(self):
+        now = self.now()
+        alarm = self.registers[0x07:0x0b]
+        if not alarm[0] & 0x80 and _from_bcd(alarm[0] & 0x7f) != now.second:
+            return
+        if not alarm[1] & 0x80 and _from_bcd(alarm[1] & 0x7f) != now.minute:
+            return
+        if not alarm[2] & 0x80 and _from_bcd(alarm[2] & 0x3f) != now.hour:
+            return
+        if not alarm[3] & 0x80:
+            if alarm[3] & 0x40:
+                if (alarm[3] & 0x0f) != now.isoweekday():
+                    return
+            elif _from_bcd(alarm[3] & 0x3f) != now.day:
+                return
+
+        self.registers[0x0f] |= 0b00000001 # A1F
+        self._update_int_pin()
+
+    def _update_int_pin(self):
+        control = self.registers[0x0e]
+        status = self.registers[0x0f]
+        active = control & 0b00000100 and control & status & 0b00000011
+        machine.drive(self.int_pin, 0 if active else 1)
+
+    #endregion
+
+    #region bus
+
+    def read_mem(self, register, nbytes):
+        data = bytearray()
+        time_registers = self._time_registers()
+        for offset in range(nbytes):
+            index = (register + offset) % len(self.registers)
+            if index < 7:
+                data.append(time_registers[index])
+            else:
+                data.append(self.registers[index])
+        return bytes(data)
+
+    def write_mem(self, register, data):
+        time_registers = bytearray(self._time_registers())
+        time_written = False
+        for offset, value in enumerate(data):
+            index = (register + offset) % len(self.registers)
+            if index < 7:
+                time_registers[index] = value
+                time_written = True
+            else:
+                self.registers[index] = value
+        if time_written:
+            self._write_time(time_registers)
+        self._update_int_pin()
+
+    def write(self, data):
+        if len(data) > 1:
+            self.write_mem(data[0], data[1:])
+        self._pointer = data[0] if data else 0
+
+    def read(self, nbytes):
+        return self.read_mem(getattr(self, "_pointer", 0), nbytes)
+
+    #endregion
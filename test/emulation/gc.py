@@ -0,0 +1,25 @@
+"""Stand-in for MicroPython's gc, adds the heap functions CPython's gc doesn't have and forwards everything else."""
+import gc as _gc
+
+heap_size = 192 * 1024 # roughly the heap of the rp2040 port
+
+_threshold = -1
+
+
+def threshold(amount=None):
+    global _threshold
+    if amount is None:
+        return _threshold
+    _threshold = amount
+
+
+def mem_alloc():
+    return 0 # the host heap says nothing about the one on the pico
+
+
+def mem_free():
+    return heap_size - mem_alloc()
+
+
+def __getattr__(name):
+    return getattr(_gc, name)
@@ -0,0 +1,225 @@
+"""
+Stand-in for MicroPython's machine module.
+
+I2C instances with the same id share one emulated bus, devices are attached to a bus with attach().
+Every transaction advances the emulated clock by its time on the wire and is counted per bus,
+listeners(bus, address, is_write, byte_count, data, time_us) added to BusState.listeners see each one.
+Pins with the same id share their level, drive() changes a level from the hardware side and fires irqs.
+"""
+from .clock import clock
+
+_buses = {}
+_pins = {}
+
+
+def reset():
+    _buses.clear()
+    _pins.clear()
+
+
+def freq(hz=None):
+    return 125000000
+
+
+def unique_id():
+    return b"\x00emulated"
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
+
+
+#region i2c
+
+class BusState:
+    """transactions, bytes and busy time of one emulated bus"""
+
+    def __init__(self, bus_id, frequency):
+        self.bus_id = bus_id
+        self.freq = frequency
+        self.devices = {}
+        self.transactions = 0
+        self.bytes = 0
+        self.nacks = 0
+        self.busy_us = 0
+        self.listeners = []
+
+    def transaction_us(self, byte_count):
+        # start, address byte, data bytes, 9 clocks per byte including ack, stop
+        return (2 + 9 * (byte_count + 1)) * 1000000 // self.freq
+
+    def account(self, address, byte_count, is_write, data=None):
+        duration = self.transaction_us(byte_count)
+        self.transactions += 1
+        self.bytes += byte_count + 1
+        self.busy_us += duration
+        for listener in self.listeners:
+            listener(self, address, is_write, byte_count, data, clock.now_us())
+        clock.advance(duration)
+
+    def device(self, address):
+        device = self.devices.get(address)
+        if device is None or clock.now_us() < getattr(device, "ready_us", 0):
+            self.nacks += 1
+            clock.advance(self.transaction_us(0))
+            raise OSError(19) # ENODEV, like a nack on the rp2 port
+        return device
+
+
+class I2C:
+    def __init__(self, id=0, scl=None, sda=None, freq=400000, timeout=50000):
+        self.id = id
+        if id not in _buses:
+            _buses[id] = BusState(id, freq)
+        self.state = _buses[id]
+        self.state.freq = freq
+
+    def attach(self, address, device):
+        self.state.devices[address] = device
+
+    def scan(self):
+        return sorted(self.state.devices)
+
+    def writeto(self, addr, buf, stop=True):
+        device = self.state.device(addr)
+        data = bytes(buf)
+        self.state.account(addr, len(data), True, data)
+        device.write(data)
+        return len(data)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        device = self.state.device(addr)
+        self.state.account(addr, nbytes, False)
+        return bytes(device.read(nbytes))
+
+    def readfrom_into(self, addr, buf, stop=True):
+        data = self.readfrom(addr, len(buf), stop)
+        buf[:] = data
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        device = self.state.device(addr)
+        self.state.account(addr, 1, True, bytes((memaddr,)))
+        self.state.account(addr, nbytes, False)
+        return bytes(device.read_mem(memaddr, nbytes))
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        device = self.state.device(addr)
+        data = bytes(buf)
+        self.state.account(addr, len(data) + 1, True, bytes((memaddr,)) + data)
+        device.write_mem(memaddr, data)
+
+    def __repr__(self):
+        return "I2C(%d, freq=%d)" % (self.id, self.state.freq)
+
+    def __eq__(self, other):
+        return isinstance(other, I2C) and other.state is self.state
+
+    def __hash__(self):
+        return hash(self.id)
+
+#endregion
+
+#region pins
+
+class _PinState:
+    def __init__(self, level):
+        self.level = level
+        self.handler = None
+        self.trigger = 0
+        self.pin = None
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        if id not in _pins:
+            _pins[id] = _PinState(0 if pull == Pin.PULL_DOWN else 1)
+        self.state = _pins[id]
+        if value is not None:
+            self.state.level = value
+
+    def value(self, value=None):
+        if value is None:
+            return self.state.level
+        self.state.level = int(bool(value))
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+        self.state.handler = handler
+        self.state.trigger = trigger
+        self.state.pin = self
+
+
+def drive(pin_id, level):
+    """change the level of a pin from the outside, fires the irq handler on a matching edge"""
+    if pin_id not in _pins:
+        _pins[pin_id] = _PinState(level)
+        return
+    state = _pins[pin_id]
+    old_level = state.level
+    state.level = level
+    if state.handler is None or old_level == level:
+        return
+    if level == 0 and state.trigger & Pin.IRQ_FALLING:
+        state.handler(state.pin)
+    elif level == 1 and state.trigger & Pin.IRQ_RISING:
+        state.handler(state.pin)
+
+#endregion
+
+#region timer
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, mode=PERIODIC, period=-1, callback=None):
+        self._generation = 0
+        if callback is not None:
+            self.init(mode=mode, period=period, callback=callback)
+
+    def init(self, mode=PERIODIC, period=-1, callback=None, freq=-1):
+        self._generation += 1
+        if freq > 0:
+            period = 1000 // freq
+        self._schedule(self._generation, mode, period, callback)
+
+    def _schedule(self, generation, mode, period, callback):
+        def fire():
+            if generation != self._generation:
+                return
+            if mode == Timer.PERIODIC:
+                self._schedule(generation, mode, period, callback)
+            callback(self)
+
+        clock.schedule(clock.now_us() + period * 1000, fire)
+
+    def deinit(self):
+        self._generation += 1
+
+#endregion
+
+
+class WDT:
+    def __init__(self, id=0, timeout=5000):
+        self.timeout = timeout
+
+    def feed(self):
+        pass
@@ -0,0 +1,30 @@
+"""Stand-in for the micropython module, the code emitters are no-ops on the host."""
+
+
+def const(value):
+    return value
+
+
+def native(func):
+    return func
+
+
+def viper(func):
+    return func
+
+
+def schedule(func, arg):
+    func(arg)
+    return True
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def mem_info(*args):
+    pass
+
+
+def opt_level(level=None):
+    return 0
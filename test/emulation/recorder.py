@@ -0,0 +1,158 @@
+"""
+Recording of the command stream the master writes to the clock modules, for replay and diffing.
+
+    recording = Recording.start(board)   # while the pointers stand still
+    ... run an animation ...
+    recording.stop()
+    recording.save("wave.jsonl")
+
+    recording = Recording.load("wave.jsonl")
+    print("\\n".join(recording.describe()))  # one command per line, compare two recordings with any diff tool
+    replay = Replay(recording)              # fresh modules executing the frames at their recorded times
+    replay.advance(2.5)
+    replay.pointer_positions()
+
+The raw frames are recorded as they arrive at the modules, including ones a module rejects, so a replay ends
+exactly where the emulated modules did. Times are in us since the recording started.
+"""
+import json
+
+from . import pointer_positions
+from .clock import clock
+from .slave import SimulatedModule, cmd_names, decode
+
+
+class Recording:
+    """
+    the frames written to the clock modules and the state of the modules when the recording started
+
+    Attributes
+    ----------
+    steps_full_rev : int
+    addresses : List[int]
+        addresses of the modules in the order of Board.module_i2c_adr
+    initial_state : dict
+        address -> list of (position, speed, accel) of the 8 steppers of the module
+    frames : List[tuple]
+        (time_us, address, data) of every frame, data with its checksum byte
+    """
+
+    def __init__(self, steps_full_rev, addresses, initial_state, frames=None):
+        self.steps_full_rev = steps_full_rev
+        self.addresses = addresses
+        self.initial_state = initial_state
+        self.frames = [] if frames is None else frames
+        self.__start_us = clock.now_us()
+        self.__buses = []
+
+    @classmethod
+    def start(cls, board):
+        """records everything written to the modules of board from now on"""
+        initial_state = {}
+        for address, module in zip(board.module_i2c_adr, board.modules):
+            initial_state[address] = [(stepper.position(), stepper.speed, stepper.accel) for stepper in module.steppers]
+
+        recording = cls(board.steps_full_rev, list(board.module_i2c_adr), initial_state)
+        for bus in board.buses.values():
+            bus.state.listeners.append(recording.__on_transaction)
+            recording.__buses.append(bus)
+        return recording
+
+    def stop(self):
+        """stops recording and orders the frames by time, the buses run in parallel on both cores"""
+        for bus in self.__buses:
+            bus.state.listeners.remove(self.__on_transaction)
+        self.__buses = []
+        self.frames.sort(key=lambda frame: frame[0])
+
+    def __on_transaction(self, bus, address, is_write, byte_count, data, time_us):
+        if not is_write or address not in self.initial_state:
+            return
+        # the module sees the frame once it is on the wire
+        self.frames.append((time_us + bus.transaction_us(byte_count) - self.__start_us, address, data))
+
+    def save(self, filename):
+        """json lines, a header with the module state followed by one frame per line"""
+        with open(filename, "w") as f:
+            f.write(json.dumps({"steps_full_rev": self.steps_full_rev,
+                                "addresses": self.addresses,
+                                "initial_state": {str(address): state for address, state in self.initial_state.items()}}) + "\n")
+            for time_us, address, data in self.frames:
+                f.write(json.dumps({"time_us": time_us, "address": address, "data": data.hex()}) + "\n")
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, "r") as f:
+            header = json.loads(f.readline())
+            frames = []
+            for line in f:
+                frame = json.loads(line)
+                frames.append((frame["time_us"], frame["address"], bytes.fromhex(frame["data"])))
+
+        initial_state = {int(address): [tuple(stepper) for stepper in state] for address, state in header["initial_state"].items()}
+        return cls(header["steps_full_rev"], header["addresses"], initial_state, frames)
+
+    def describe(self):
+        """one line per frame with its time in ms, the address and the decoded command"""
+        lines = []
+        for time_us, address, data in self.frames:
+            if len(data) < 2 or sum(data[:-1]) % 256 != data[-1]:
+                description = "bad checksum " + data.hex()
+            else:
+                try:
+                    cmd, args = decode(data[:-1])
+                    description = "%-18s %s" % (cmd_names[cmd], args)
+                except Exception:
+                    description = "undecodable " + data.hex()
+            lines.append("%10.3f %3d %s" % (time_us / 1000, address, description))
+        return lines
+
+    def duration_s(self):
+        """time of the last frame"""
+        if not self.frames:
+            return 0
+        return self.frames[-1][0] / 1000000
+
+
+class Replay:
+    """
+    fresh emulated modules that execute the frames of a recording at their recorded times
+
+    Replaying resets the emulated clock, so it can't run alongside a Board.
+    """
+
+    def __init__(self, recording):
+        clock.reset()
+        self.recording = recording
+        self.modules = []
+        self.modules_by_address = {}
+        for address in recording.addresses:
+            module = SimulatedModule(recording.steps_full_rev)
+            for stepper, (position, speed, accel) in zip(module.steppers, recording.initial_state[address]):
+                stepper.start_pos = position
+                stepper.speed = speed
+                stepper.accel = accel
+            self.modules.append(module)
+            self.modules_by_address[address] = module
+        self.next_frame = 0
+
+    def advance_to(self, time_us):
+        frames = self.recording.frames
+        while self.next_frame < len(frames) and frames[self.next_frame][0] <= time_us:
+            frame_us, address, data = frames[self.next_frame]
+            clock.advance_to(frame_us)
+            self.modules_by_address[address].write(data)
+            self.next_frame += 1
+        clock.advance_to(time_us)
+
+    def advance(self, seconds):
+        self.advance_to(clock.now_us() + int(seconds * 1000000))
+
+    def done(self):
+        """every frame is replayed and every pointer stands still"""
+        return (self.next_frame >= len(self.recording.frames)
+                and not any(stepper.is_running() for module in self.modules for stepper in module.steppers))
+
+    def pointer_positions(self):
+        """current positions of the 24 hour and 24 minute pointers, clk index order like ClockClock24"""
+        return pointer_positions(self.modules)
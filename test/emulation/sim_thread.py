@@ -0,0 +1,64 @@
+"""
+Stand-in for MicroPython's _thread, runs the second core as a real thread with its own virtual time.
+
+A lock carries the virtual time of the core that released it, whoever acquires it continues
+no earlier than that, so work on two cores overlaps in virtual time.
+"""
+import threading
+
+from .clock import clock
+
+error = RuntimeError
+
+
+class SimLock:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._released_us = 0
+
+    def acquire(self, waitflag=1, timeout=-1):
+        if waitflag:
+            acquired = self._lock.acquire(True, timeout)
+        else:
+            acquired = self._lock.acquire(False)
+        if acquired:
+            clock.advance_to(self._released_us)
+        return acquired
+
+    def release(self):
+        self._released_us = clock.now_us()
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+def allocate_lock():
+    return SimLock()
+
+
+def start_new_thread(function, args, kwargs=None):
+    start_us = clock.now_us()
+
+    def run():
+        clock.advance_to(start_us)
+        function(*args, **(kwargs or {}))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread.ident
+
+
+def get_ident():
+    return threading.get_ident()
+
+
+def stack_size(size=None):
+    return 0
@@ -0,0 +1,319 @@
+"""
+Emulation of a clock module (pcb with a mcu and 4 coaxial steppers = 8 steppers) behind one i2c address.
+
+Decodes the ClockStepper command protocol, rejects frames with a bad checksum like the firmware and moves
+each stepper with the firmware's trapezoidal speed/accel profile on the emulated clock.
+"""
+import math
+from struct import unpack_from
+
+from .clock import clock
+
+cmd_id = {
+    "enable_driver": 0,
+    "set_speed": 1,
+    "set_accel": 2,
+    "moveTo": 3,
+    "moveTo_extra_revs": 4,
+    "move": 5,
+    "stop": 6,
+    "wiggle": 7,
+    "moveTo_min_steps": 8,
+    "pose_frame": 9,
+}
+
+cmd_names = {value: key for key, value in cmd_id.items()}
+
+
+def decode(payload):
+    """
+    command id and arguments of a frame without its checksum byte,
+    raises ValueError for unknown commands and bad pose frames, struct.error for frames that are too short
+    """
+    cmd = payload[0]
+
+    if cmd == cmd_id["enable_driver"]:
+        return cmd, unpack_from("<B", payload, 1)
+
+    if cmd == cmd_id["set_speed"] or cmd == cmd_id["set_accel"]:
+        return cmd, unpack_from("<Hb", payload, 1)
+
+    if cmd == cmd_id["moveTo"]:
+        return cmd, unpack_from("<hbb", payload, 1)
+
+    if cmd == cmd_id["moveTo_extra_revs"]:
+        return cmd, unpack_from("<hbBb", payload, 1)
+
+    if cmd == cmd_id["moveTo_min_steps"]:
+        return cmd, unpack_from("<hbHb", payload, 1)
+
+    if cmd == cmd_id["move"] or cmd == cmd_id["wiggle"]:
+        return cmd, unpack_from("<Hbb", payload, 1)
+
+    if cmd == cmd_id["stop"]:
+        return cmd, unpack_from("<b", payload, 1)
+
+    if cmd == cmd_id["pose_frame"]:
+        mode, mask = unpack_from("<BB", payload, 1)
+        offset = 3
+        entries = []
+        for sub_id in range(8):
+            if mask & (1 << sub_id):
+                if mode == cmd_id["moveTo"]: # no extra field
+                    position, direction = unpack_from("<hb", payload, offset)
+                    extra = 0
+                    offset += 3
+                else:
+                    position, direction, extra = unpack_from("<hbH", payload, offset)
+                    offset += 5
+                entries.append((sub_id, position, direction, extra))
+        if offset != len(payload):
+            raise ValueError("bad pose frame length")
+        return cmd, (mode, mask, tuple(entries))
+
+    raise ValueError("unknown command")
+
+
+class SimulatedStepper:
+    def __init__(self, steps_per_rev, max_speed=1000, max_accel=1500):
+        self.steps_per_rev = steps_per_rev
+        self.max_speed = max_speed
+        self.max_accel = max_accel
+        self.speed = 0
+        self.accel = 0
+
+        self.start_us = 0
+        self.start_pos = 0
+        self.distance = 0 # signed, positive is cw
+        self.duration_us = 0
+        self.queued = [] # signed distances started once the current move is done (second half of a wiggle)
+
+    #region kinematics
+
+    def _profile(self, distance):
+        """total duration in us of a move of distance steps from standstill"""
+        if distance <= 0 or self.speed <= 0 or self.accel <= 0:
+            return 0
+        if distance >= self.speed * self.speed / self.accel:
+            return int((distance / self.speed + self.speed / self.accel) * 1000000)
+        return int(2 * math.sqrt(distance / self.accel) * 1000000)
+
+    def _travelled(self, elapsed_us):
+        distance = abs(self.distance)
+        if elapsed_us >= self.duration_us:
+            return distance
+        if elapsed_us <= 0:
+            return 0
+
+        t = elapsed_us / 1000000
+        speed = self.speed
+        accel = self.accel
+        if distance >= speed * speed / accel:
+            t_ramp = speed / accel
+            peak = speed
+        else:
+            t_ramp = math.sqrt(distance / accel)
+            peak = accel * t_ramp
+        t_total = self.duration_us / 1000000
+
+        if t < t_ramp:
+            return 0.5 * accel * t * t
+        if t < t_total - t_ramp:
+            return 0.5 * peak * t_ramp + peak * (t - t_ramp)
+        return distance - 0.5 * accel * (t_total - t) ** 2
+
+    def _update(self):
+        now = clock.now_us()
+        while self.queued and now >= self.start_us + self.duration_us:
+            end = self.start_us + self.duration_us
+            self._begin(end, self.position_at(end), self.queued.pop(0))
+
+    def position_at(self, time_us):
+        travelled = self._travelled(time_us - self.start_us)
+        if self.distance < 0:
+            travelled = -travelled
+        return int(round(self.start_pos + travelled)) % self.steps_per_rev
+
+    def _begin(self, start_us, start_pos, distance):
+        self.start_us = start_us
+        self.start_pos = start_pos
+        self.distance = distance
+        self.duration_us = self._profile(abs(distance))
+
+    #endregion
+
+    def position(self):
+        self._update()
+        return self.position_at(clock.now_us())
+
+    def is_running(self):
+        self._update()
+        return clock.now_us() < self.start_us + self.duration_us or len(self.queued) > 0
+
+    def done_us(self):
+        """time at which the stepper stops if no further commands arrive"""
+        self._update()
+        done = self.start_us + self.duration_us
+        for distance in self.queued:
+            done += self._profile(abs(distance))
+        return done
+
+    def set_speed(self, speed):
+        if 0 < speed <= self.max_speed:
+            self.speed = speed
+
+    def set_accel(self, accel):
+        if 0 < accel <= self.max_accel:
+            self.accel = accel
+
+    def move_to(self, target, direction, extra_revs=0, min_steps=0):
+        start = self.position()
+        distance_cw = (target - start) % self.steps_per_rev
+        distance_ccw = (start - target) % self.steps_per_rev
+
+        if direction == 0:
+            direction = 1 if distance_cw <= distance_ccw else -1
+
+        distance = distance_cw if direction == 1 else distance_ccw
+        distance += extra_revs * self.steps_per_rev
+        while distance < min_steps:
+            distance += self.steps_per_rev
+
+        self.queued = []
+        self._begin(clock.now_us(), start, distance * direction)
+
+    def move(self, distance):
+        self.queued = []
+        self._begin(clock.now_us(), self.position(), distance)
+
+    def wiggle(self, distance, direction):
+        self.move(distance * direction)
+        self.queued = [-distance * direction]
+
+    def stop(self):
+        self.queued = []
+        self._begin(clock.now_us(), self.position(), 0)
+
+
+class SimulatedModule:
+    """
+    one clock module, write() and read() are called by the emulated bus
+
+    received counts valid frames, rejected frames with a bad checksum or unknown command,
+    log records (time_us, command name, arguments) of every accepted command when recording is enabled,
+    the module does not acknowledge its address before ready_us, like while its firmware boots,
+    drop_frames is the number of next frames that are dropped like ones with a corrupted checksum,
+    bytes of a write beyond rx_buffer_size are lost like in the Wire library of the firmware, so the frame is rejected,
+    a read returns the running steppers and then the number of received frames modulo 256
+    """
+
+    rx_buffer_size = 32
+
+    def __init__(self, steps_full_rev=4320, ready_us=0):
+        self.steps_full_rev = steps_full_rev
+        self.ready_us = ready_us
+        self.drop_frames = 0
+        self.steppers = [SimulatedStepper(steps_full_rev) for _ in range(8)]
+        self.driver_enabled = True
+        self.received = 0
+        self.rejected = 0
+        self.heartbeats = 0
+        self.recording = False
+        self.log = []
+
+    def _selected(self, stepper_id):
+        if stepper_id == -1:
+            return self.steppers
+        if stepper_id == -2:
+            return self.steppers[4:]
+        if stepper_id == -3:
+            return self.steppers[:4]
+        if 0 <= stepper_id < 8:
+            return [self.steppers[stepper_id]]
+        return []
+
+    def write(self, data):
+        if self.drop_frames > 0:
+            self.drop_frames -= 1
+            self.rejected += 1
+            return
+
+        data = data[:self.rx_buffer_size]
+        if len(data) < 2 or sum(data[:-1]) % 256 != data[-1]:
+            self.rejected += 1
+            return
+
+        try:
+            cmd, args = decode(data[:-1])
+        except Exception:
+            self.rejected += 1
+            return
+
+        self._execute(cmd, args)
+        self.received += 1
+        if self.recording:
+            self.log.append((clock.now_us(), cmd_names.get(cmd, cmd), args))
+
+    def _execute(self, cmd, args):
+        if cmd == cmd_id["enable_driver"]:
+            self.driver_enabled = bool(args[0])
+
+        elif cmd == cmd_id["set_speed"] or cmd == cmd_id["set_accel"]:
+            value, stepper_id = args
+            for stepper in self._selected(stepper_id):
+                if cmd == cmd_id["set_speed"]:
+                    stepper.set_speed(value)
+                else:
+                    stepper.set_accel(value)
+
+        elif cmd == cmd_id["moveTo"]:
+            position, direction, stepper_id = args
+            for stepper in self._selected(stepper_id):
+                stepper.move_to(position, direction)
+
+        elif cmd == cmd_id["moveTo_extra_revs"]:
+            position, direction, extra_revs, stepper_id = args
+            for stepper in self._selected(stepper_id):
+                stepper.move_to(position, direction, extra_revs=extra_revs)
+
+        elif cmd == cmd_id["moveTo_min_steps"]:
+            position, direction, min_steps, stepper_id = args
+            for stepper in self._selected(stepper_id):
+                stepper.move_to(position, direction, min_steps=min_steps)
+
+        elif cmd == cmd_id["move"] or cmd == cmd_id["wiggle"]:
+            distance, direction, stepper_id = args
+            for stepper in self._selected(stepper_id):
+                if cmd == cmd_id["move"]:
+                    stepper.move(distance * direction)
+                else:
+                    stepper.wiggle(distance, direction)
+
+        elif cmd == cmd_id["stop"]:
+            for stepper in self._selected(args[0]):
+                stepper.stop()
+
+        elif cmd == cmd_id["pose_frame"]:
+            mode, mask, entries = args
+            for sub_id, position, direction, extra in entries:
+                stepper = self.steppers[sub_id]
+                if mode == cmd_id["moveTo_extra_revs"]:
+                    stepper.move_to(position, direction, extra_revs=extra)
+                elif mode == cmd_id["moveTo_min_steps"]:
+                    stepper.move_to(position, direction, min_steps=extra)
+                else:
+                    stepper.move_to(position, direction)
+
+    def read(self, nbytes):
+        self.heartbeats += 1
+        mask = 0
+        for sub_id, stepper in enumerate(self.steppers):
+            if stepper.is_running():
+                mask |= 1 << sub_id
+        return bytes([mask, self.received & 0xff] + [0] * (nbytes - 2))[:nbytes]
+
+    def positions(self):
+        return [stepper.position() for stepper in self.steppers]
+
+    def done_us(self):
+        return max(stepper.done_us() for stepper in self.steppers)
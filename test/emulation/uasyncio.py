@@ -0,0 +1,92 @@
+"""
+Stand-in for MicroPython's uasyncio on top of CPython's asyncio.
+
+The event loop runs on the emulated clock: instead of blocking in select it jumps the virtual time to the
+next timer or hardware event, so the clock runs as fast as the host can execute it.
+Like uasyncio, tasks can be created before the loop is running.
+"""
+import asyncio as _asyncio
+import math as _math
+import selectors as _selectors
+from asyncio import *  # noqa: F401,F403
+
+from .clock import clock
+
+
+class _VirtualTimeSelector(_selectors.SelectSelector):
+    def select(self, timeout=None):
+        next_event = clock.next_event_us()
+
+        if timeout is None:
+            if next_event is None:
+                raise RuntimeError("emulated event loop would wait forever, nothing is scheduled")
+            target = next_event
+        else:
+            # round up, otherwise a timer less than 1us ahead never becomes due
+            target = clock.now_us() + _math.ceil(timeout * 1000000)
+            if next_event is not None and next_event < target:
+                target = next_event
+
+        clock.advance_to(target)
+        return []
+
+
+class VirtualTimeLoop(_asyncio.SelectorEventLoop):
+    def __init__(self):
+        super().__init__(_VirtualTimeSelector())
+        self._clock_resolution = 1e-6
+
+    def time(self):
+        return clock.now_us() / 1000000
+
+
+_loop = None
+
+
+def get_event_loop():
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = VirtualTimeLoop()
+        _asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def new_event_loop():
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        _loop.close()
+    _loop = None
+    return get_event_loop()
+
+
+def create_task(coro):
+    return get_event_loop().create_task(coro)
+
+
+def run(coro):
+    return get_event_loop().run_until_complete(coro)
+
+
+async def sleep_ms(ms):
+    await _asyncio.sleep(ms / 1000)
+
+
+async def wait_for_ms(awaitable, timeout):
+    return await _asyncio.wait_for(awaitable, timeout / 1000)
+
+
+class ThreadSafeFlag:
+    """flag that can be set from an interrupt handler, wait() clears it again"""
+
+    def __init__(self):
+        self._event = _asyncio.Event()
+
+    def set(self):
+        self._event.set()
+
+    def clear(self):
+        self._event.clear()
+
+    async def wait(self):
+        await self._event.wait()
+        self._event.clear()
@@ -0,0 +1,2 @@
+"""Stand-in for MicroPython's ucollections."""
+from collections import deque, namedtuple, OrderedDict
@@ -0,0 +1,53 @@
+"""Stand-in for MicroPython's utime running on the emulated clock, ticks wrap like on the RP2040."""
+import time as _time
+
+from .clock import clock
+
+TICKS_PERIOD = 1 << 30
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALFPERIOD = TICKS_PERIOD // 2
+
+
+def ticks_us():
+    return int(clock.now_us()) & TICKS_MAX
+
+
+def ticks_ms():
+    return int(clock.now_us() // 1000) & TICKS_MAX
+
+
+def ticks_cpu():
+    return ticks_us()
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & TICKS_MAX
+
+
+def ticks_diff(ticks1, ticks2):
+    return ((ticks1 - ticks2 + TICKS_HALFPERIOD) & TICKS_MAX) - TICKS_HALFPERIOD
+
+
+def sleep(seconds):
+    clock.advance(int(seconds * 1000000))
+
+
+def sleep_ms(ms):
+    clock.advance(ms * 1000)
+
+
+def sleep_us(us):
+    clock.advance(us)
+
+
+def time():
+    return int(clock.now_us() // 1000000)
+
+
+def time_ns():
+    return int(clock.now_us() * 1000)
+
+
+mktime = _time.mktime
+localtime = _time.localtime
+gmtime = _time.gmtime
@@ -1,84 +1,267 @@
-import random
+import argparse
 import json # Using JSON is clean and easy to parse
+import os
+import random
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+def _canonical(frontier, ends):
+    """Renumbers the fragment labels in order of appearance, so equal frontiers are one state."""
+    mapping = {}
+    state = []
+    for label in frontier:
+        if label:
+            label = mapping.setdefault(label, len(mapping) + 1)
+        state.append(label)
+    state.append(ends)
+    return tuple(state)
+
+def _transitions(state, row, col, rows, width):
+    """
+    Yields the ways a cell can be added to a partial path, as (choice, next state).
+
+    A state is the frontier between the cells done so far and the rest: for every column the label of the path
+    fragment that leaves the last done cell of that column downwards, then the label of the fragment leaving the
+    previous cell to the right (0 for none) and last the number of path ends placed so far. A label appears twice
+    if both ends of its fragment are still open, once if the other end is one of the two ends of the path.
+    The choice has bit 0 set if the cell connects to its right neighbour and bit 1 if to the one below.
+    """
+    frontier = list(state[:-1])
+    ends = state[-1]
+    up = frontier[col]
+    left = frontier[width]
+    can_right = col < width - 1
+    can_down = row < rows - 1
+    last_cell = row == rows - 1 and col == width - 1
+
+    frontier[col] = 0
+    frontier[width] = 0
+    fresh = max(frontier + [up, left]) + 1
+
+    if up and left:
+        # the cell joins two fragments
+        if up == left:
+            # closes a cycle, only counted as the cycle through every cell
+            if last_cell and ends == 0 and not any(frontier):
+                yield 0, _canonical(frontier, ends)
+            return
+        joined = [up if label == left else label for label in frontier]
+        if up in joined or (last_cell and not any(joined)):
+            yield 0, _canonical(joined, ends)
+        return
 
-def generate_random_hamiltonian_path(rows, cols):
+    incoming = up or left
+    if incoming:
+        # the path ends in this cell or passes through it
+        if ends < 2 and (incoming in frontier or (last_cell and ends == 1 and not any(frontier))):
+            yield 0, _canonical(frontier, ends + 1)
+        if can_right:
+            passed = frontier[:]
+            passed[width] = incoming
+            yield 1, _canonical(passed, ends)
+        if can_down:
+            passed = frontier[:]
+            passed[col] = incoming
+            yield 2, _canonical(passed, ends)
+        return
+
+    # the path starts in this cell, or a new fragment bends through it
+    if ends < 2:
+        if can_right:
+            started = frontier[:]
+            started[width] = fresh
+            yield 1, _canonical(started, ends + 1)
+        if can_down:
+            started = frontier[:]
+            started[col] = fresh
+            yield 2, _canonical(started, ends + 1)
+    if can_right and can_down:
+        bend = frontier[:]
+        bend[col] = fresh
+        bend[width] = fresh
+        yield 3, _canonical(bend, ends)
+
+class HamiltonianPaths:
     """
-    Generates a random Hamiltonian path on a grid using a randomized
-    backtracking algorithm. A Hamiltonian path visits every node (clock)
-    exactly once.
+    Counts the Hamiltonian paths of a grid and samples them uniformly.
+
+    A dynamic program adds one cell after the other and only keeps the frontier between the cells done and the
+    rest (broken profile), so the work grows with the number of cells times the number of frontier states, which
+    only depends on the width of the grid. The grid is scanned along its longer side so the frontier stays
+    narrow, a 6x16 grid has 560 states. The number of partial paths reaching every state is kept per cell, so a
+    path is sampled by walking the cells backwards and picking each predecessor weighted by its count.
 
     Args:
         rows (int): The number of rows in the grid.
         cols (int): The number of columns in the grid.
-
-    Returns:
-        list[int] or None: A list of clock indices representing the path,
-                           or None if a path couldn't be found (unlikely for a grid).
     """
-    total_nodes = rows * cols
-    path = []
-    visited = [False] * total_nodes
-
-    def _get_neighbors(node):
-        """Calculates valid neighbors (up, down, left, right) for a given node index."""
-        r, c = divmod(node, cols)
-        neighbors = []
-        if r > 0: neighbors.append(node - cols)       # Up
-        if r < rows - 1: neighbors.append(node + cols) # Down
-        if c > 0: neighbors.append(node - 1)         # Left
-        if c < cols - 1: neighbors.append(node + 1)   # Right
-        return neighbors
-
-    def _find_path_from(node):
-        """Recursive helper to find a path starting from the current node."""
-        path.append(node)
-        visited[node] = True
-
-        # Base case: If the path is complete, we're done.
-        if len(path) == total_nodes:
-            return True
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.transposed = cols > rows
+        self.scan_rows, self.width = (cols, rows) if self.transposed else (rows, cols)
+        self.cell_count = rows * cols
 
-        neighbors = _get_neighbors(node)
-        random.shuffle(neighbors) # This is the key to getting a random path
+        start = (0,) * (self.width + 1) + (0,)
+        self.path_state = (0,) * (self.width + 1) + (2,)
+        self.cycle_state = start
 
-        for neighbor in neighbors:
-            if not visited[neighbor]:
-                if _find_path_from(neighbor):
-                    return True # Path found, propagate success
+        self.counts = [{start: 1}] # per cell, state -> number of partial paths reaching it
+        self.predecessors = [] # per cell, state -> list of (previous state, choice)
+        for cell in range(self.cell_count):
+            row, col = divmod(cell, self.width)
+            counts = {}
+            predecessors = {}
+            for state, count in self.counts[-1].items():
+                for choice, next_state in _transitions(state, row, col, self.scan_rows, self.width):
+                    counts[next_state] = counts.get(next_state, 0) + count
+                    predecessors.setdefault(next_state, []).append((state, choice))
+            self.counts.append(counts)
+            self.predecessors.append(predecessors)
 
-        # Backtrack if no unvisited neighbor led to a solution
-        visited[node] = False
-        path.pop()
-        return False
+    def count(self):
+        """Number of Hamiltonian paths, a path and its reverse counted once."""
+        return self.counts[-1].get(self.path_state, 0)
+
+    def count_cycles(self):
+        """Number of Hamiltonian cycles."""
+        if self.cell_count < 4:
+            return 0
+        return self.counts[-1].get(self.cycle_state, 0)
+
+    def count_non_adjacent_ends(self):
+        """Number of paths whose ends are not neighbours, every other path is a cycle missing one of its edges."""
+        return self.count() - self.count_cycles() * self.cell_count
+
+    def sample(self, rng):
+        """
+        Draws a path uniformly.
+
+        Args:
+            rng (random.Random): The random number generator to draw with.
+
+        Returns:
+            list[int]: The clock indices along the path, row major in the original grid.
+        """
+        if not self.count():
+            raise ValueError(f"a {self.rows}x{self.cols} grid has no Hamiltonian path")
+
+        neighbors = [[] for _ in range(self.cell_count)]
+        state = self.path_state
+        for cell in reversed(range(self.cell_count)):
+            pick = rng.randrange(self.counts[cell + 1][state])
+            for previous, choice in self.predecessors[cell][state]:
+                pick -= self.counts[cell][previous]
+                if pick < 0:
+                    break
+            state = previous
+
+            if choice & 1:
+                neighbors[cell].append(cell + 1)
+                neighbors[cell + 1].append(cell)
+            if choice & 2:
+                neighbors[cell].append(cell + self.width)
+                neighbors[cell + self.width].append(cell)
+
+        # follow the edges from one of the ends
+        node = next(cell for cell in range(self.cell_count) if len(neighbors[cell]) == 1)
+        path = [node]
+        previous = None
+        while len(path) < self.cell_count:
+            previous, node = node, next(neighbor for neighbor in neighbors[node] if neighbor != previous)
+            path.append(node)
 
-    # Start the search from a random node
-    start_node = random.randint(0, total_nodes - 1)
-    if _find_path_from(start_node):
+        if self.transposed:
+            path = [(cell % self.width) * self.cols + cell // self.width for cell in path]
+        if rng.random() < 0.5:
+            path.reverse()
         return path
-    else:
-        # This should theoretically not happen on a standard grid
-        # unless it's disconnected or 1x1.
-        return None
 
-def create_path_file(num_paths, rows, cols, filename="hamiltonian_paths.json"):
-    """Generates a specified number of unique paths and saves them to a file."""
-    all_paths = set() # Use a set to store paths as tuples to ensure uniqueness
-    print(f"Generating {num_paths} unique paths for a {rows}x{cols} grid...")
+_worker_paths = None
+
+def _init_worker(paths):
+    global _worker_paths
+    _worker_paths = paths
+
+def _sample_chunk(chunk):
+    count, seed = chunk
+    rng = random.Random(seed)
+    return [_worker_paths.sample(rng) for _ in range(count)]
+
+def sample_paths(paths, count, rng, executor=None, workers=1):
+    """Draws count paths, split into one chunk per worker if an executor is given."""
+    if executor is None or workers <= 1:
+        return [paths.sample(rng) for _ in range(count)]
+
+    chunks = [(count // workers + (index < count % workers), rng.getrandbits(32)) for index in range(workers)]
+    return [path for chunk in executor.map(_sample_chunk, chunks) for path in chunk]
+
+def create_path_file(num_paths, rows, cols, filename="hamiltonian_paths.json", workers=None, seed=None):
+    """
+    Samples a specified number of unique paths whose ends are not adjacent and saves them to a file.
+
+    Args:
+        num_paths (int): The number of paths.
+        rows (int): The number of rows in the grid.
+        cols (int): The number of columns in the grid.
+        filename (str): The json file, the binary file for the pico is written next to it.
+        workers (int): The number of processes sampling in parallel, all cpus if None.
+        seed (int): The seed of the sampling, random if None.
+    """
+    rng = random.Random(seed)
+    workers = workers or os.cpu_count() or 1
 
-    while len(all_paths) < num_paths:
-        path = generate_random_hamiltonian_path(rows, cols)
-        if path and not are_path_ends_adjacent(path, rows, cols):
-            all_paths.add(tuple(path)) # Add tuple to set for uniqueness check
-            print(f"  Found path {len(all_paths)}/{num_paths}")
+    paths = HamiltonianPaths(rows, cols)
+    available = 2 * paths.count_non_adjacent_ends() # both directions of a path are drawn
+    print(f"A {rows}x{cols} grid has {paths.count()} Hamiltonian paths, {available} directed ones with non adjacent ends.")
+    if num_paths > available:
+        raise ValueError(f"only {available} paths with non adjacent ends exist, {num_paths} requested")
 
-    # Convert set of tuples back to a list of lists for saving
-    paths_to_save = [list(p) for p in all_paths]
+    print(f"Sampling {num_paths} unique paths with {workers} worker(s)...")
+    found = {} # path tuple -> None, a dict keeps the order of sampling
+    executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(paths,)) if workers > 1 else None
+    try:
+        while len(found) < num_paths:
+            for path in sample_paths(paths, num_paths - len(found), rng, executor, workers):
+                if not are_path_ends_adjacent(path, rows, cols):
+                    found[tuple(path)] = None
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    paths_to_save = [list(path) for path in found][:num_paths]
 
     with open(filename, 'w') as f:
         json.dump(paths_to_save, f)
-    
+
     print(f"\nSuccessfully saved {len(paths_to_save)} paths to '{filename}'.")
 
+    create_binary_path_file(paths_to_save, rows, cols, os.path.splitext(filename)[0] + ".bin")
+
+def create_binary_path_file(paths, rows, cols, filename="hamiltonian_paths.bin"):
+    """
+    Saves paths in the packed format read by animations/hamiltonian.py on the pico.
+
+    Header of 3 bytes, the path count as little endian uint16 and the path length as uint8,
+    followed by one byte per clock index for each path, so every path has a fixed stride
+    and a single one can be read without loading the others.
+    """
+    path_length = rows * cols
+    with open(filename, 'wb') as f:
+        f.write(struct.pack("<HB", len(paths), path_length))
+        for path in paths:
+            if len(path) != path_length:
+                raise ValueError(f"path of length {len(path)}, expected {path_length}")
+            f.write(bytes(path))
+
+    print(f"Successfully saved {len(paths)} paths to '{filename}'.")
+
+def convert_path_file(rows, cols, json_filename="hamiltonian_paths.json", bin_filename="hamiltonian_paths.bin"):
+    """Converts an existing json path file to the binary format."""
+    with open(json_filename, 'r') as f:
+        paths = json.load(f)
+    create_binary_path_file(paths, rows, cols, bin_filename)
+
 def are_path_ends_adjacent(path, rows, cols):
     """Checks if the start and end of the path are adjacent."""
     if not path or len(path) < 2:
@@ -103,9 +286,19 @@ def are_path_ends_adjacent(path, rows, cols):
 
 # --- Run the generator ---
 if __name__ == "__main__":
-    # For your 3x8 clock grid
-    GRID_ROWS = 3
-    GRID_COLS = 8
+    parser = argparse.ArgumentParser(description="Sample Hamiltonian paths of the clock grid for the hamiltonian animation.")
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=8)
+    parser.add_argument("--count", type=int, default=150, help="number of unique paths")
+    parser.add_argument("--output", default="hamiltonian_paths.json", help="json file, the .bin file is written next to it")
+    parser.add_argument("--workers", type=int, default=None, help="processes sampling in parallel, all cpus if omitted")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--convert", action="store_true", help="only convert the existing json file to the binary format")
+    args = parser.parse_args()
 
-    # Generate 150 unique paths and save them
-    create_path_file(num_paths=150, rows=GRID_ROWS, cols=GRID_COLS)
\ No newline at end of file
+    if args.convert:
+        convert_path_file(rows=args.rows, cols=args.cols, json_filename=args.output,
+                          bin_filename=os.path.splitext(args.output)[0] + ".bin")
+    else:
+        create_path_file(num_paths=args.count, rows=args.rows, cols=args.cols, filename=args.output,
+                         workers=args.workers, seed=args.seed)
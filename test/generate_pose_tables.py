@@ -0,0 +1,203 @@
+import math
+import os
+
+# --- Configuration ---
+STEPS_FULL_REV = 4320
+GRID_ROWS = 3
+GRID_COLS = 8
+OUTPUT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "PoseTables.py")
+
+# center of the big circle, coordinate system: origin at center of clockclock, y+ up x+ right, in cm
+CIRCLE_CENTERS = [[0, 0], [0, 20], [9, -20]]
+
+# charges of the field line and equipotential animations
+# up is poitive x axis, left is poitive y axis, origin is at the center of top left clock, in units of clock spacing
+FIELD_LINE_CHARGES = [[[-1, -1.5], [-1, -5.5]], [[0.5, 0.5], [0.5, -7.5]], [[-2.5, 0.5], [-2.5, -7.5]]]
+EQUIPOTENTIAL_POINTS_1 = [[-1, -1.5], [0.5, 0.5], [-2.5, 0.5]]
+EQUIPOTENTIAL_POINTS_2 = [[-1, -5.5], [0.5, -7.5], [-2.5, -7.5]]
+Q_MAGNITUDES = [1, -1]
+
+
+def circle_pose(center, steps_full_rev):
+    """
+    Pointer positions where each pointers midpoint is tangent to a circle around center.
+
+    Args:
+        center (list): [x, y] of the circle center in cm.
+        steps_full_rev (int): steps per full revolution.
+
+    Returns:
+        tuple: hour positions, minute positions, hour directions, minute directions, each of length 24.
+    """
+    x_cc, y_cc = center
+
+    # can be seen as right angle triangle, as tangent are normal to radius
+    # with abc and c the hypotenuse, with x_c center of a clock
+    # a - from center or clock to center of clock pointer - 2cm
+    # c - center of clockclock to center of clock sqrt((x_c - x_cc)**2 + (y_c - y_cc))
+    # b - center of clockclock to center of clock pointer
+    positions_h = []
+    positions_m = []
+    directions_h = []
+    directions_m = []
+
+    for clk_index in range(GRID_ROWS * GRID_COLS):
+        x_c = -35 + clk_index % GRID_COLS * 10  # cm
+        y_c = 10 - clk_index // GRID_COLS * 10  # cm
+
+        #signed distance of clock to center
+        x_dist = (x_c - x_cc)
+        y_dist = (y_c - y_cc)
+
+        a = 2  # cm
+        c = math.sqrt(x_dist ** 2 + y_dist ** 2)
+
+        # angle between a and c
+        alph = math.acos(a / c)
+        # angle between c and horizontal
+        gam = math.atan(y_dist / x_dist) * math.copysign(1, x_dist)
+        # angle between c and vertical
+        lam = math.pi / 2 - gam
+        # angle between vertical and a
+        kap = math.pi - lam - alph
+
+        pos_1 = int(-(steps_full_rev * kap) / (2 * math.pi) * math.copysign(1, x_dist)) % steps_full_rev
+
+        # since the angle of the pointers with respect to c should be equal
+        pos_2 = int(-(steps_full_rev * (kap + 2 * alph)) / (2 * math.pi) * math.copysign(1, x_dist)) % steps_full_rev
+
+        if y_dist > 0:
+            positions_h.append(pos_2)
+            positions_m.append(pos_1)
+        else:
+            positions_h.append(pos_1)
+            positions_m.append(pos_2)
+
+        # pointers unwind away from each other when the circle collapses
+        if (x_dist < 0) == (y_dist > 0):
+            directions_h.append(-1)
+            directions_m.append(1)
+        else:
+            directions_h.append(1)
+            directions_m.append(-1)
+
+    return positions_h, positions_m, directions_h, directions_m
+
+
+def field_angles(q_locations):
+    """
+    Direction of the electric field of 2 point charges at every clock.
+
+    Args:
+        q_locations (list): locations of the positive and the negative charge.
+
+    Returns:
+        list[list[float]]: the field vector [x, y] at each of the 24 clocks.
+    """
+    fields = []
+    for clk_index in range(GRID_ROWS * GRID_COLS):
+        # this assumes equal vertical and horizontal clock spacing, which is the case obv
+        row = clk_index // GRID_COLS
+        col = clk_index % GRID_COLS
+
+        #the locations of the current stepper in units of clock spacing
+        loc_x = -row
+        loc_y = -col
+
+        E_total = [0, 0]
+
+        for q_index, q_magnitude in enumerate(Q_MAGNITUDES):
+            point_x = q_locations[q_index][0]
+            point_y = q_locations[q_index][1]
+
+            dist_x = loc_x - point_x
+            dist_y = loc_y - point_y
+
+            distance = math.sqrt(dist_x**2 + dist_y**2)
+
+            E_vector = [q_magnitude/distance**2*dist_x/distance, q_magnitude/distance**2*dist_y/distance]
+
+            E_total = [E_vector[0] + E_total[0], E_vector[1] + E_total[1]]
+
+        fields.append(E_total)
+    return fields
+
+
+def vector_pose(vectors, steps_full_rev):
+    """Minute pointers point along each vector, hour pointers the opposite way."""
+    positions_h = []
+    positions_m = []
+    for vector in vectors:
+        theta = (-math.atan2(vector[1], vector[0]) + math.pi * 2) % (math.pi * 2)
+        frac_ang = theta / (math.pi * 2)  # angle from 12 o clock position in cw dir
+
+        start_pos_m = frac_ang * steps_full_rev
+        start_pos_h = ((frac_ang + 0.5) * steps_full_rev) % steps_full_rev
+
+        positions_h.append(int(start_pos_h))
+        positions_m.append(int(start_pos_m))
+    return positions_h, positions_m
+
+
+def field_lines_pose(q_locations, steps_full_rev):
+    return vector_pose(field_angles(q_locations), steps_full_rev)
+
+
+def equipotential_pose(q_locations, steps_full_rev):
+    #direction of quipotential lines, normal to field lines
+    return vector_pose([[field[1], -field[0]] for field in field_angles(q_locations)], steps_full_rev)
+
+
+def format_table(name, rows, typecode, comment):
+    """Formats a tuple of arrays, one array per random choice, with one line per grid row."""
+    lines = [f"# {comment}", f"{name} = ("]
+    for values in rows:
+        lines.append(f"    array('{typecode}', [")
+        for row in range(GRID_ROWS):
+            chunk = values[row * GRID_COLS:(row + 1) * GRID_COLS]
+            lines.append("        " + ", ".join(str(value) for value in chunk) + ",")
+        lines.append("    ]),")
+    lines.append(")")
+    return "\n".join(lines)
+
+
+def create_table_file(steps_full_rev, filename=OUTPUT_FILE):
+    """Evaluates every start pose and writes them to a python module of array tables."""
+    circles = [circle_pose(center, steps_full_rev) for center in CIRCLE_CENTERS]
+    field_lines = [field_lines_pose(charges, steps_full_rev) for charges in FIELD_LINE_CHARGES]
+    equipotentials = [equipotential_pose([point_1, point_2], steps_full_rev)
+                      for point_1 in EQUIPOTENTIAL_POINTS_1 for point_2 in EQUIPOTENTIAL_POINTS_2]
+
+    header = "\n".join([
+        '"""',
+        "Precalculated start poses of the circle, field lines and equipotential animations",
+        "",
+        "generated by test/generate_pose_tables.py, do not edit, indices are clk indices like in ClockClock24",
+        '"""',
+        "from array import array",
+        "",
+        f"steps_full_rev = {steps_full_rev}",
+    ])
+
+    sections = [
+        header,
+        format_table("circle_h", [pose[0] for pose in circles], 'h', "circle, one pose per center " + str(CIRCLE_CENTERS)),
+        format_table("circle_m", [pose[1] for pose in circles], 'h', "minute pointers of the circle poses"),
+        format_table("circle_direction_h", [pose[2] for pose in circles], 'b', "direction of the hour pointers when the circle collapses"),
+        format_table("circle_direction_m", [pose[3] for pose in circles], 'b', "direction of the minute pointers when the circle collapses"),
+        format_table("field_lines_h", [pose[0] for pose in field_lines], 'h', "field lines, one pose per pair of charges " + str(FIELD_LINE_CHARGES)),
+        format_table("field_lines_m", [pose[1] for pose in field_lines], 'h', "minute pointers of the field line poses"),
+        format_table("equipotential_h", [pose[0] for pose in equipotentials], 'h',
+                     f"equipotential lines, index {len(EQUIPOTENTIAL_POINTS_2)} * point 1 index + point 2 index, points 1 "
+                     + str(EQUIPOTENTIAL_POINTS_1) + ", points 2 " + str(EQUIPOTENTIAL_POINTS_2)),
+        format_table("equipotential_m", [pose[1] for pose in equipotentials], 'h', "minute pointers of the equipotential poses"),
+    ]
+
+    with open(filename, 'w') as f:
+        f.write("\n\n".join(sections) + "\n")
+
+    print(f"Saved {len(circles) + len(field_lines) + len(equipotentials)} poses to '{filename}'.")
+
+# --- Run the generator ---
+if __name__ == "__main__":
+    create_table_file(STEPS_FULL_REV)
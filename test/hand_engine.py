@@ -0,0 +1,218 @@
+import numpy as np
+
+# --- Configuration ---
+STEPS_FULL_REV = 4320
+STEPPER_SPEED = 585 # ClockClock24.stepper_speed_default
+STEPPER_ACCEL = 210 # ClockClock24.stepper_accel_default
+HAND_COUNT = 48 # 24 hour hands followed by 24 minute hands, clk index order like ClockClock24
+
+HOUR_HANDS = np.arange(0, 24)
+MINUTE_HANDS = np.arange(24, 48)
+
+# a move is planned as up to four phases of constant acceleration: braking a hand that moves away from its new
+# target (or would overshoot it) to standstill, accelerating to the peak speed, cruising and decelerating
+PHASE_COUNT = 4
+
+
+class HandEngine:
+    """
+    Moves the hands of a batch of clocks at once with the trapezoidal speed profile of the steppers.
+
+    Every array has the shape (batch_size, HAND_COUNT), so one call moves the same hands of all clocks of the
+    batch, e.g. 1440 clocks that each show another minute transition. Nothing is stepped, every command plans the
+    phases of the move in closed form (like MotionModel does for a single stepper) and positions are only evaluated
+    when a command or the caller needs them, so advancing the time is free and a batch runs as fast as commands can
+    be planned.
+
+    Positions are in steps and not wrapped, so a move with extra revolutions keeps its full distance. Like the
+    firmware a new target is taken over from the current speed, a hand moving the wrong way brakes and turns around.
+
+    Hands are given as a 1d array of hand indices, the same hands of every row, or as a 2d array with one row of
+    hand indices per batch row. Positions and the other arguments broadcast against the selected hands.
+
+    Commands take effect at the current time, or at at_s which broadcasts against the selected hands like the other
+    arguments, e.g. one time per row to replay recordings whose commands went out at different times. A row has to
+    get its commands in the order of their times.
+    """
+    def __init__(self, batch_size=1, steps_full_rev=STEPS_FULL_REV, speed=STEPPER_SPEED, accel=STEPPER_ACCEL):
+        shape = (batch_size, HAND_COUNT)
+        self.batch_size = batch_size
+        self.steps_full_rev = steps_full_rev
+        self.time_s = 0.0
+
+        self.target = np.zeros(shape)
+        self.speed = np.full(shape, float(speed))
+        self.accel = np.full(shape, float(accel))
+
+        # state at the start of the current move and its phases
+        self.start_s = np.zeros(shape)
+        self.start_position = np.zeros(shape)
+        self.start_velocity = np.zeros(shape)
+        self.phase_durations = np.zeros(shape + (PHASE_COUNT,))
+        self.phase_accels = np.zeros(shape + (PHASE_COUNT,))
+        self.end_s = np.zeros(shape)
+
+        self.rows = np.arange(batch_size)
+
+    def __index(self, hands, rows):
+        hands = np.asarray(hands)
+        if hands.ndim == 2:
+            rows = self.rows if rows is None else np.asarray(rows)
+            return rows[:, None], hands
+
+        # a range of hands of every row, like HOUR_HANDS, indexes a view instead of gathering a copy
+        if rows is None and len(hands) and np.array_equal(hands, np.arange(hands[0], hands[0] + len(hands))):
+            return slice(None), slice(hands[0], hands[0] + len(hands))
+
+        rows = self.rows if rows is None else np.asarray(rows)
+        return np.ix_(rows, hands)
+
+    def __state(self, index, at_s=None):
+        """position and velocity of the indexed hands at the current time or at_s"""
+        now = self.time_s if at_s is None else at_s
+        elapsed = now - self.start_s[index]
+        position = self.start_position[index].copy()
+        velocity = self.start_velocity[index].copy()
+
+        durations = self.phase_durations[index]
+        accels = self.phase_accels[index]
+
+        for phase in range(PHASE_COUNT):
+            duration = durations[..., phase]
+            accel = accels[..., phase]
+            phase_time = np.clip(elapsed, 0, duration)
+            position += velocity * phase_time + accel * phase_time * phase_time / 2
+            velocity += accel * phase_time
+            elapsed = elapsed - duration
+
+        # exactly on target once done, instead of whatever the float error of the phases adds up to
+        done = self.end_s[index] <= now
+        position = np.where(done, self.target[index], position)
+        velocity = np.where(done, 0.0, velocity)
+        return position, velocity
+
+    def __plan(self, index, target, state=None, at_s=None):
+        """plans the move of the indexed hands from their state at the current time or at_s to target"""
+        now = self.time_s if at_s is None else at_s
+        position, velocity = self.__state(index, at_s) if state is None else state
+        speed = self.speed[index]
+        accel = self.accel[index]
+
+        # brake to standstill first if the hand moves away from the target or is too fast to stop before it
+        direction = np.sign(target - position)
+        speed_toward = velocity * direction
+        stopping_distance = speed_toward * speed_toward / (2 * accel)
+        braking = (speed_toward < 0) | (stopping_distance > np.abs(target - position))
+        brake_duration = np.where(braking, np.abs(velocity) / accel, 0)
+        brake_accel = np.where(braking, -np.sign(velocity) * accel, 0)
+        braked_position = np.where(braking, position + np.sign(velocity) * stopping_distance, position)
+        speed_toward = np.where(braking, 0, speed_toward)
+
+        # then a trapezoid (or triangle) from the remaining speed to standstill on the target
+        direction = np.sign(target - braked_position)
+        distance = np.abs(target - braked_position)
+        peak = np.minimum(speed, np.sqrt(accel * distance + speed_toward * speed_toward / 2))
+        ramp_distance = (peak * peak - speed_toward * speed_toward) / (2 * accel)
+        stop_distance = peak * peak / (2 * accel)
+        cruise_distance = np.maximum(distance - ramp_distance - stop_distance, 0)
+        moving = peak > 0
+
+        durations = (brake_duration,
+                     np.abs(peak - speed_toward) / accel,
+                     np.where(moving, cruise_distance / np.where(moving, peak, 1), 0),
+                     peak / accel)
+        accels = (brake_accel,
+                  direction * np.sign(peak - speed_toward) * accel,
+                  np.zeros_like(peak),
+                  -direction * accel)
+
+        self.target[index] = target
+        self.start_s[index] = now
+        self.start_position[index] = position
+        self.start_velocity[index] = velocity
+        self.phase_durations[index] = np.stack(durations, axis=-1)
+        self.phase_accels[index] = np.stack(accels, axis=-1)
+        self.end_s[index] = now + sum(durations)
+
+    def set_pose(self, hands, positions, rows=None):
+        """places the hands at positions in steps without moving them, like pointers that were set by hand"""
+        index = self.__index(hands, rows)
+        self.target[index] = positions
+        self.start_s[index] = self.time_s
+        self.start_position[index] = positions
+        self.start_velocity[index] = 0
+        self.phase_durations[index] = 0
+        self.phase_accels[index] = 0
+        self.end_s[index] = self.time_s
+
+    def set_speed(self, hands, speed, rows=None, at_s=None):
+        """like the firmware the new speed also applies to moves that are underway"""
+        index = self.__index(hands, rows)
+        state = self.__state(index, at_s)
+        self.speed[index] = speed
+        self.__plan(index, self.target[index], state, at_s)
+
+    def set_accel(self, hands, accel, rows=None, at_s=None):
+        index = self.__index(hands, rows)
+        state = self.__state(index, at_s)
+        self.accel[index] = accel
+        self.__plan(index, self.target[index], state, at_s)
+
+    def move_to(self, hands, positions, direction=0, extra_revs=0, min_steps=0, rows=None, at_s=None):
+        """
+        moves the hands to positions in steps, like MotionModel.move_to_distance
+
+        direction 0 takes the shortest path, 1 cw and -1 ccw, the distance is measured from where the hands are now
+        """
+        index = self.__index(hands, rows)
+        state = self.__state(index, at_s)
+        current = np.round(state[0])
+        start = np.mod(current, self.steps_full_rev)
+        positions = np.mod(positions, self.steps_full_rev)
+
+        distance_cw = np.mod(positions - start, self.steps_full_rev)
+        distance_ccw = np.mod(start - positions, self.steps_full_rev)
+
+        direction = np.where(direction == 0, np.where(distance_cw <= distance_ccw, 1, -1), direction)
+        distance = np.where(direction == 1, distance_cw, distance_ccw) + extra_revs * self.steps_full_rev
+
+        missing = np.maximum(min_steps - distance, 0)
+        distance = distance + np.ceil(missing / self.steps_full_rev) * self.steps_full_rev
+
+        self.__plan(index, current + direction * distance, state, at_s)
+
+    def move(self, hands, distance, rows=None, at_s=None):
+        """moves the hands by distance steps from where they are now, positive is cw"""
+        index = self.__index(hands, rows)
+        state = self.__state(index, at_s)
+        self.__plan(index, np.round(state[0]) + distance, state, at_s)
+
+    def stop(self, hands, rows=None, at_s=None):
+        """decelerates the hands to standstill"""
+        index = self.__index(hands, rows)
+        position, velocity = state = self.__state(index, at_s)
+        stopping_distance = velocity * velocity / (2 * self.accel[index])
+        self.__plan(index, np.round(position + np.sign(velocity) * stopping_distance), state, at_s)
+
+    def advance(self, seconds):
+        self.time_s += seconds
+
+    def run_until_settled(self):
+        """advances to the time the last hand of the batch stops"""
+        self.time_s = max(self.time_s, float(self.end_s.max()))
+
+    def settled(self):
+        """bool array, per batch row wether all of its hands stand still at their targets"""
+        return self.end_s.max(axis=1) <= self.time_s
+
+    def settle_times(self):
+        """per batch row the time its last hand stops"""
+        return self.end_s.max(axis=1)
+
+    def positions(self):
+        """positions of all hands in steps at the current time"""
+        return self.__state((slice(None), slice(None)))[0]
+
+    def fractions(self):
+        """positions as fraction of a revolution, 0.0 at 12 o clock, for drawing"""
+        return np.mod(self.positions(), self.steps_full_rev) / self.steps_full_rev
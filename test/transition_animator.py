@@ -1,8 +1,24 @@
-import pygame
+import argparse
+import contextlib
+import datetime
+import glob
+import hashlib
 import math
+import multiprocessing
+import os
 import random
 import time
-import json
+
+import numpy as np
+
+import emulation
+from emulation.recorder import Recording, Replay
+from hand_engine import HandEngine, HAND_COUNT, HOUR_HANDS, MINUTE_HANDS, STEPS_FULL_REV
+
+try:
+    import pygame
+except ImportError:
+    pygame = None # only the window needs it, --sweep runs headless
 
 # --- Configuration ---
 SCREEN_WIDTH = 1000
@@ -18,6 +34,20 @@ CLOCK_FACE_COLOR = (220, 220, 220)
 HAND_COLOR = (20, 20, 20)
 TEXT_COLOR = (50, 50, 50)
 FPS = 60
+SEED = 1
+START_TIME = datetime.datetime(2000, 1, 21, 12, 0, 10) # daytime, so the emulated firmware starts in visual mode
+FROM_DIGITS = [1, 2, 3, 4]
+TO_DIGITS = [1, 2, 3, 5]
+TIMEOUT_S = 300 # emulated seconds the firmware may take to settle
+SWEEP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sweep_recordings") # cached recordings
+# how often the main loop checks if a recorded transition settled, main.py doesn't poll at all and a faster poll only
+# shifts when the tasks send their frames by about a ms
+SWEEP_LOOP_DELAY_S = 0.5
+STEPPER_MAX_SPEED = 1000 # the steppers ignore a speed or accel above, like the emulated ones
+STEPPER_MAX_ACCEL = 1500
+# a recorded command is one line per hand: transition, command of the transition, time, slave.cmd_id and the hand,
+# followed by the value, direction, extra_revs and min_steps like frame_commands returns them
+ENTRY_COLUMNS = ("row", "op", "time_us", "cmd", "hand", "value", "direction", "extra_revs", "min_steps")
 
 # --- Digit Definitions (Ported from your code) ---
 # Fractional position of the pointer, 0.0 at 12 o'clock, 0.5 at 6 o'clock
@@ -34,98 +64,427 @@ digits_pointer_pos_frac = [
     [[[0.5, 0.5, 0.25, 0.5, 0.25, 0], [0.25, 0.75, 0, 0, 0.25, 0.75]]]  # 9
 ]
 
+digit_display_indices = [[0, 1, 8, 9, 16, 17], [2, 3, 10, 11, 18, 19], [4, 5, 12, 13, 20, 21], [6, 7, 14, 15, 22, 23]]
+
 # --- Helper Functions ---
 def frac_to_rad(frac):
     """Converts fractional rotation (0.0-1.0) to radians."""
     return frac * 2 * math.pi
 
-def lerp_angle(start, end, t):
-    """Smoothly interpolate between two angles, handling wraparound."""
-    diff = (end - start + math.pi) % (2 * math.pi) - math.pi
-
-    # if its really close to the target snap
-    if abs(diff) < 0.01:
-        return end
-    return start + diff * t
+def digit_positions(digits):
+    """
+    Returns the hour and minute positions of all clocks for the digits.
+
+    Args:
+        digits: array of shape (batch, 4), one row of digits per clock of the batch.
+
+    Returns:
+        Two arrays of shape (batch, 24), the fractional hour and minute hand positions.
+    """
+    digits = np.asarray(digits)
+    pos_h = np.zeros((len(digits), GRID_ROWS * GRID_COLS))
+    pos_m = np.zeros((len(digits), GRID_ROWS * GRID_COLS))
+    table = np.array([digit[0] for digit in digits_pointer_pos_frac]) # (digit, hand, sub_index), first style
+
+    for field, clk_indices in enumerate(digit_display_indices):
+        pos_h[:, clk_indices] = table[digits[:, field], 0]
+        pos_m[:, clk_indices] = table[digits[:, field], 1]
+
+    return pos_h, pos_m
+
+def minute_digits(minutes):
+    """Returns the digits (batch, 4) of the minutes of the day."""
+    minutes = np.asarray(minutes) % 1440
+    hours = minutes // 60
+    return np.stack([hours // 10, hours % 10, minutes % 60 // 10, minutes % 10], axis=1)
+
+def to_steps(frac):
+    return np.round(np.asarray(frac) * STEPS_FULL_REV)
+
+def wrong_clocks(positions, frac_h, frac_m):
+    """
+    Returns wether each row of positions doesn't show the pose, a clock with its hour and minute hand swapped shows
+    the same.
+
+    Args:
+        positions: array of shape (batch, 48), the hour and then the minute hand positions in steps.
+        frac_h, frac_m: arrays of shape (batch, 24), the fractional hand positions of the pose.
+    """
+    positions = np.mod(np.asarray(positions), STEPS_FULL_REV).reshape(-1, 2, GRID_ROWS * GRID_COLS)
+    targets = np.mod(to_steps(np.stack([frac_h, frac_m], axis=1)), STEPS_FULL_REV)
+    return np.any(np.sort(positions, axis=1) != np.sort(targets, axis=1), axis=(1, 2))
+
+# --- Headless sweep ---
+def print_sweep_header():
+    print(f"{'animation':<18} {'mean [s]':>9} {'p95 [s]':>8} {'max [s]':>8} {'slowest':>8} {'wrong':>6} "
+          f"{'record [s]':>11} {'replay [s]':>11} {'x real time':>12}")
+
+def print_sweep_row(name, minutes, durations, wrong, record_s, replay_s):
+    slowest = int(minutes[durations.argmax()])
+    print(f"{name:<18} {durations.mean():9.2f} {np.percentile(durations, 95):8.2f} {durations.max():8.2f} "
+          f"{slowest // 60:5d}:{slowest % 60:02d} {int(wrong.sum()):6d} {record_s:11.3f} {replay_s:11.3f} "
+          f"{durations.sum() / replay_s:12.0f}")
+
+def stepper_hand(module_order, sub_id):
+    """HandEngine hand of a stepper, the subs 0-3 of a module drive minute hands and 4-7 hour hands"""
+    if sub_id < 4:
+        return len(HOUR_HANDS) + module_order * 4 + sub_id
+    return module_order * 4 + sub_id - 4
+
+def selected_subs(stepper_id):
+    """the subs a command addresses, like SimulatedModule._selected"""
+    if stepper_id == -1:
+        return range(8)
+    if stepper_id == -2:
+        return range(4, 8)
+    if stepper_id == -3:
+        return range(4)
+    if 0 <= stepper_id < 8:
+        return [stepper_id]
+    return []
+
+def frame_commands(recording):
+    """
+    Decodes the frames of a recording into commands of the HandEngine hands, the way the modules execute them.
+
+    Frames a module rejects are left out, like ones with a bad checksum or bytes beyond its receive buffer, and so
+    are commands that don't change the motion of the steppers. moveTo_extra_revs, moveTo_min_steps and pose frames
+    turn into moveTo.
+
+    Returns:
+        List of (time_us, cmd, hands, args), cmd is set_speed, set_accel, moveTo, move or stop of slave.cmd_id and
+        args one (value, direction, extra_revs, min_steps) per hand, the value is the position, distance or speed.
+    """
+    from emulation.slave import SimulatedModule, cmd_id, decode
+
+    module_orders = {address: module_order for module_order, address in enumerate(recording.addresses)}
+    commands = []
+    for time_us, address, data in recording.frames:
+        data = data[:SimulatedModule.rx_buffer_size]
+        if len(data) < 2 or sum(data[:-1]) % 256 != data[-1]:
+            continue
+        try:
+            cmd, args = decode(data[:-1])
+        except Exception:
+            continue
+
+        if cmd == cmd_id["pose_frame"]:
+            mode, _, entries = args
+            subs = [sub_id for sub_id, _, _, _ in entries]
+            args = [(position, direction, extra if mode == cmd_id["moveTo_extra_revs"] else 0,
+                     extra if mode == cmd_id["moveTo_min_steps"] else 0) for _, position, direction, extra in entries]
+            cmd = cmd_id["moveTo"]
+        elif cmd == cmd_id["set_speed"] or cmd == cmd_id["set_accel"]:
+            value, stepper_id = args
+            if not 0 < value <= (STEPPER_MAX_SPEED if cmd == cmd_id["set_speed"] else STEPPER_MAX_ACCEL):
+                continue # ignored by the steppers
+            subs = selected_subs(stepper_id)
+            args = [(value, 0, 0, 0)] * len(subs)
+        elif cmd == cmd_id["moveTo"]:
+            position, direction, stepper_id = args
+            subs = selected_subs(stepper_id)
+            args = [(position, direction, 0, 0)] * len(subs)
+        elif cmd == cmd_id["moveTo_extra_revs"]:
+            position, direction, extra_revs, stepper_id = args
+            subs = selected_subs(stepper_id)
+            args = [(position, direction, extra_revs, 0)] * len(subs)
+            cmd = cmd_id["moveTo"]
+        elif cmd == cmd_id["moveTo_min_steps"]:
+            position, direction, min_steps, stepper_id = args
+            subs = selected_subs(stepper_id)
+            args = [(position, direction, 0, min_steps)] * len(subs)
+            cmd = cmd_id["moveTo"]
+        elif cmd == cmd_id["move"]:
+            distance, direction, stepper_id = args
+            subs = selected_subs(stepper_id)
+            args = [(distance * direction, 0, 0, 0)] * len(subs)
+        elif cmd == cmd_id["stop"]:
+            subs = selected_subs(args[0])
+            args = [(0, 0, 0, 0)] * len(subs)
+        elif cmd == cmd_id["wiggle"]:
+            raise ValueError("the HandEngine has no wiggle, only the settings mode sends it")
+        else:
+            continue # enable_driver
+
+        if subs:
+            hands = [stepper_hand(module_orders[address], sub_id) for sub_id in subs]
+            commands.append((time_us, cmd, hands, args))
+    return commands
+
+def initial_hands(recording):
+    """positions, speeds and accels of the HandEngine hands when the recording started, an array of shape (3, 48)"""
+    state = np.zeros((HAND_COUNT, 3))
+    for module_order, address in enumerate(recording.addresses):
+        for sub_id, stepper in enumerate(recording.initial_state[address]):
+            state[stepper_hand(module_order, sub_id)] = stepper
+    return state.T
+
+def recordings_key(seed, every):
+    """hash of everything the recorded frames depend on, the firmware, its emulation and the sweep arguments"""
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    patterns = ["*.py", os.path.join("animations", "*.py"), "hamiltonian_paths.*", os.path.join("test", "emulation", "*.py")]
+    digest = hashlib.sha1(repr((seed, every, STEPS_FULL_REV, START_TIME, SWEEP_LOOP_DELAY_S)).encode())
+    for filename in sorted(name for pattern in patterns for name in glob.glob(os.path.join(root, pattern))):
+        with open(filename, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+def sweep(names, seed=SEED, every=1, jobs=None):
+    """
+    Sweeps the DigitDisplay animations of the firmware over the minute transitions of a day and prints how long they
+    take.
+
+    The frames the firmware sends are recorded once per transition on the emulated board, split between jobs
+    processes each with its own board, and cached in SWEEP_DIR until the firmware or the emulation change. The
+    recorded commands are then replayed on a HandEngine with one row per transition, so a day is one batch.
+
+    Every transition starts from the settled pose of its minute, the results are in simulated seconds. A transition
+    is wrong if the clocks don't end showing the digits of the next minute.
+
+    Args:
+        names: keys of DigitDisplay.animations to run.
+        seed: seed of the random module, for the random animations.
+        every: only the transition from every this many minutes, 1 for all 1440.
+        jobs: number of processes that record, one per cpu if None.
+    """
+    minutes = np.arange(0, 1440, every)
+    jobs = min(jobs or os.cpu_count() or 1, len(minutes))
+    chunks = np.array_split(minutes, jobs)
+    key = recordings_key(seed, every)
+    to_h, to_m = digit_positions(minute_digits(minutes + 1))
+
+    print_sweep_header()
+    with multiprocessing.Pool(jobs) as pool:
+        for name in names:
+            start_wall = time.perf_counter()
+            filename = os.path.join(SWEEP_DIR, f"{name.replace(' ', '_')}-{key}.npz")
+            if os.path.exists(filename):
+                with np.load(filename) as cached:
+                    entries, initial = cached["entries"], cached["initial"]
+            else:
+                results = pool.starmap(record_minutes, [(name, chunk.tolist(), seed) for chunk in chunks])
+                offsets = np.cumsum([0] + [len(chunk) for chunk in chunks])
+                for offset, (chunk_entries, _) in zip(offsets, results):
+                    chunk_entries[:, 0] += offset
+                entries = np.concatenate([chunk_entries for chunk_entries, _ in results])
+                initial = np.concatenate([chunk_initial for _, chunk_initial in results])
+                os.makedirs(SWEEP_DIR, exist_ok=True)
+                np.savez_compressed(filename, entries=entries, initial=initial)
+            record_s = time.perf_counter() - start_wall
+
+            start_wall = time.perf_counter()
+            engine = replay_commands(entries, initial)
+            replay_s = time.perf_counter() - start_wall
+
+            durations = engine.settle_times()
+            wrong = wrong_clocks(engine.positions(), to_h, to_m)
+            print_sweep_row(name, minutes, durations, wrong, record_s, replay_s)
+
+def record_minutes(name, minutes, seed):
+    """
+    Records the commands of one DigitDisplay animation on a FirmwareClock for the transitions from each of the
+    minutes.
+
+    Consecutive transitions continue from where the last one ended, other ones first move to their minute on the
+    shortest path. The random module is seeded per minute, so a transition is the same whichever process records it.
+
+    Returns:
+        The commands, an int array with one line of ENTRY_COLUMNS per hand of a command, rows are indices into
+        minutes, and the positions, speeds and accels of the hands at the start of each transition, an array of
+        shape (len(minutes), 3, 48).
+    """
+    entries = []
+    initial = np.zeros((len(minutes), 3, HAND_COUNT))
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull): # the firmware prints every new time
+        firmware = FirmwareClock(minute_digits(minutes[:1])[0].tolist(), seed)
+        shown = minutes[0] # minute the hands stand at, None if an animation ended elsewhere
+
+        for row, minute in enumerate(minutes):
+            if shown != minute:
+                firmware.display(minute_digits([minute])[0].tolist(), "shortest path")
+                firmware.run_until_settled(SWEEP_LOOP_DELAY_S)
+
+            to_digits = minute_digits([minute + 1])[0].tolist()
+            firmware.set_default_speed() # a few animations change it
+            random.seed(seed * 1440 + minute)
+            recording = firmware.start_recording()
+            firmware.display(to_digits, name)
+            firmware.run_until_settled(SWEEP_LOOP_DELAY_S)
+            recording.stop()
+
+            initial[row] = initial_hands(recording)
+            for op, (time_us, cmd, hands, args) in enumerate(frame_commands(recording)):
+                entries.extend((row, op, time_us, cmd, hand) + tuple(hand_args) for hand, hand_args in zip(hands, args))
+
+            to_h, to_m = digit_positions([to_digits])
+            shown = None if wrong_clocks([to_steps(firmware.fractions())], to_h, to_m)[0] else minute + 1
+
+    return np.array(entries, dtype=np.int64).reshape(-1, len(ENTRY_COLUMNS)), initial
+
+def replay_commands(entries, initial):
+    """
+    Replays recorded commands on a HandEngine with one row per transition and runs it until every hand settled.
+
+    The k-th command of every row goes out in the k-th round, the commands of a round with the same cmd and number
+    of hands are one vectorized call, each at the time it was recorded.
+
+    Args:
+        entries: int array with one line of ENTRY_COLUMNS per hand of a command, ordered by row and command.
+        initial: positions, speeds and accels of the hands at the start of each row, an array of shape (rows, 3, 48).
+    """
+    from emulation.slave import cmd_id
+
+    engine = HandEngine(len(initial))
+    all_hands = np.arange(HAND_COUNT)
+    engine.set_pose(all_hands, initial[:, 0])
+    engine.set_speed(all_hands, initial[:, 1])
+    engine.set_accel(all_hands, initial[:, 2])
+
+    # the hands of a command are consecutive entries, its round is its index among the commands of its row
+    row, op = entries[:, 0], entries[:, 1]
+    first = np.ones(len(entries), dtype=bool)
+    first[1:] = (row[1:] != row[:-1]) | (op[1:] != op[:-1])
+    starts = np.flatnonzero(first)
+    command = np.cumsum(first) - 1
+    size = np.diff(np.append(starts, len(entries)))[command]
+    rounds = (np.arange(len(starts)) - np.searchsorted(row[starts], row[starts]))[command]
+
+    order = np.lexsort((np.arange(len(entries)), size, entries[:, 3], rounds))
+    entries, size, rounds = entries[order], size[order], rounds[order]
+    group_starts = np.flatnonzero(np.diff(rounds, prepend=-1) | np.diff(entries[:, 3], prepend=-1)
+                                  | np.diff(size, prepend=-1))
+
+    for start, end in zip(group_starts, np.append(group_starts[1:], len(entries))):
+        group = entries[start:end]
+        hand_count = size[start]
+        rows = group[::hand_count, 0]
+        at_s = group[::hand_count, 2, None] / 1000000
+        hands = group[:, 4].reshape(-1, hand_count)
+        value, direction, extra_revs, min_steps = group[:, 5:].reshape(-1, hand_count, 4).transpose(2, 0, 1)
+
+        cmd = group[0, 3]
+        if cmd == cmd_id["set_speed"]:
+            engine.set_speed(hands, value, rows, at_s)
+        elif cmd == cmd_id["set_accel"]:
+            engine.set_accel(hands, value, rows, at_s)
+        elif cmd == cmd_id["moveTo"]:
+            engine.move_to(hands, value, direction, extra_revs, min_steps, rows, at_s)
+        elif cmd == cmd_id["move"]:
+            engine.move(hands, value, rows, at_s)
+        else:
+            engine.stop(hands, rows, at_s)
+
+    engine.run_until_settled()
+    return engine
 
 # --- Classes ---
-class ClockHand:
-    """Represents a single hand of a clock."""
-    def __init__(self, length):
-        self.length = length
-        self.current_angle_rad = 0.0
-        self.target_angle_rad = 0.0
-        self.easing_factor = 0.1 # Controls animation speed
-
-    def set_target_frac(self, frac):
-        self.target_angle_rad = frac_to_rad(frac)
-
-    def update(self):
-        """Smoothly moves the hand towards its target angle."""
-        self.current_angle_rad = lerp_angle(self.current_angle_rad, self.target_angle_rad, self.easing_factor)
-
-    def draw(self, surface, center_x, center_y):
-        end_x = center_x + self.length * math.sin(self.current_angle_rad)
-        end_y = center_y - self.length * math.cos(self.current_angle_rad)
-        pygame.draw.line(surface, HAND_COLOR, (center_x, center_y), (end_x, end_y), 4)
-        pygame.draw.circle(surface, HAND_COLOR, (center_x, center_y), 3)
+class FirmwareClock:
+    """
+    The real ClockClock24 and DigitDisplay on the emulated board, so the window shows exactly the commands the
+    firmware sends, executed by the emulated modules on the emulated time.
+    """
+    def __init__(self, digits, seed=SEED):
+        emulation.install() # the clock modules import machine, uasyncio, ... so this has to happen first
+        from ClockClock24 import ClockClock24
+        from DigitDisplay import DigitDisplay
+
+        random.seed(seed)
+        self.board = emulation.Board(steps_full_rev=STEPS_FULL_REV, start_time=START_TIME)
+        self.clockclock = self.board.build_clockclock()
+        self.clockclock.rtc.enable_minute_alarm = False # the digits are set from here, not by the emulated rtc
+        self.board.run_until_settled(self.clockclock, TIMEOUT_S)
+
+        self.set_default_speed()
+        self.animation_ids = DigitDisplay.animations
+        self.animation_names = list(DigitDisplay.animations)
+        self.display(digits, "shortest path")
+        self.run_until_settled()
+
+    def set_default_speed(self):
+        from ClockClock24 import ClockClock24
+
+        self.clockclock.set_speed_all(ClockClock24.stepper_speed_default)
+        self.clockclock.set_accel_all(ClockClock24.stepper_accel_default)
+
+    def display(self, digits, animation_name):
+        self.clockclock.digit_display.display_digits(digits, self.animation_ids[animation_name])
+
+    def advance(self, seconds):
+        self.board.run(self.clockclock, seconds)
+
+    def run_until_settled(self, loop_delay_s=0.01):
+        return self.board.run_until_settled(self.clockclock, TIMEOUT_S, loop_delay_s)
+
+    def start_recording(self):
+        return Recording.start(self.board)
+
+    def fractions(self):
+        hour, minute = self.board.pointer_positions()
+        return np.array(hour + minute) / STEPS_FULL_REV
+
+class ReplayClock:
+    """Plays back a recorded command stream on fresh emulated modules."""
+    def __init__(self, filename):
+        self.recording = Recording.load(filename)
+        self.replay = Replay(self.recording)
+        self.animation_names = []
+
+    def display(self, digits, animation_name):
+        pass
+
+    def advance(self, seconds):
+        self.replay.advance(seconds)
+
+    def fractions(self):
+        hour, minute = self.replay.pointer_positions()
+        return np.array(hour + minute) / self.recording.steps_full_rev
 
 class Clock:
     """Represents one of the 24 clocks."""
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.hour_hand = ClockHand(HAND_LENGTH_H)
-        self.minute_hand = ClockHand(HAND_LENGTH_M)
 
-    def update(self):
-        self.hour_hand.update()
-        self.minute_hand.update()
+    def draw_hand(self, surface, frac, length):
+        angle_rad = frac_to_rad(frac)
+        end_x = self.x + length * math.sin(angle_rad)
+        end_y = self.y - length * math.cos(angle_rad)
+        pygame.draw.line(surface, HAND_COLOR, (self.x, self.y), (end_x, end_y), 4)
+        pygame.draw.circle(surface, HAND_COLOR, (self.x, self.y), 3)
 
-    def draw(self, surface):
+    def draw(self, surface, frac_h, frac_m):
         pygame.draw.circle(surface, CLOCK_FACE_COLOR, (self.x, self.y), CLOCK_RADIUS)
         pygame.draw.circle(surface, HAND_COLOR, (self.x, self.y), CLOCK_RADIUS, 1) # Border
-        self.hour_hand.draw(surface, self.x, self.y)
-        self.minute_hand.draw(surface, self.x, self.y)
+        self.draw_hand(surface, frac_h, HAND_LENGTH_H)
+        self.draw_hand(surface, frac_m, HAND_LENGTH_M)
 
 class Simulator:
-    """Manages the entire simulation and animation logic."""
-    def __init__(self):
+    """
+    Shows the clock in a window.
+
+    Args:
+        source: FirmwareClock or ReplayClock, moves the hands.
+        digits: digits the source shows at the start.
+    """
+    def __init__(self, source, digits):
+        if pygame is None:
+            raise ImportError("the window needs pygame, use --sweep to run headless")
+
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("ClockClock24 Simulator")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 24)
         self.font_small = pygame.font.SysFont("Arial", 16)
-        
-        self.clocks = []
-        self.digit_display_indices = [[0, 1, 8, 9, 16, 17], [2, 3, 10, 11, 18, 19], [4, 5, 12, 13, 20, 21], [6, 7, 14, 15, 22, 23]]
-        self.column_indices = [[r * 8 + c for r in range(GRID_ROWS)] for c in range(GRID_COLS)]
-        self.row_indices = [[r * 8 + c for c in range(GRID_COLS)] for r in range(GRID_ROWS)]
 
-        self.current_animation = None
-        self.animation_generator = None
-        self.digits_to_display = [0, 0, 0, 0]
-        self.animation_name = "Shortest Path"
+        self.clocks = []
+        self.source = source
+        self.digits_to_display = digits
+        self.selected = 0 # index into source.animation_names
+        self.animation_name = ""
 
         self._setup_clocks()
-        self.set_digits([1, 2, 3, 4]) # Initial time
-
-        self.hamiltonian_paths = []
-        self._load_paths()
-
-        # ... (rest of your __init__ code) ...
-
-    def _load_paths(self):
-        """Loads pre-generated paths from a file."""
-        try:
-            with open("hamiltonian_paths.json", 'r') as f:
-                self.hamiltonian_paths = json.load(f)
-            print(f"Loaded {len(self.hamiltonian_paths)} Hamiltonian paths.")
-        except FileNotFoundError:
-            print("Warning: hamiltonian_paths.json not found. Hamiltonian animation will not work.")
-            self.hamiltonian_paths = [] # Ensure it's an empty list if file not found
-    
 
     def _setup_clocks(self):
         """Creates and positions the 24 clock objects."""
@@ -140,46 +499,16 @@ class Simulator:
                 y = start_y + r * (2 * CLOCK_RADIUS + CLOCK_PADDING)
                 self.clocks.append(Clock(x, y))
 
-    def set_digits(self, digits):
-        """Sets the target positions for all clocks based on the desired digits."""
-        self.digits_to_display = digits
-        for field, digit in enumerate(digits):
-            if not (0 <= digit < len(digits_pointer_pos_frac)): continue
-            
-            digit_data = digits_pointer_pos_frac[digit][0] # Using first style for each digit
-            hour_positions = digit_data[0]
-            minute_positions = digit_data[1]
-
-            for sub_index, clk_index in enumerate(self.digit_display_indices[field]):
-                self.clocks[clk_index].hour_hand.set_target_frac(hour_positions[sub_index])
-                self.clocks[clk_index].minute_hand.set_target_frac(minute_positions[sub_index])
-
-    def _get_digit_positions(self, digits):
-        """Returns the target positions for all clocks based on the desired digits."""
-        new_positions_h = [0.0] * len(self.clocks)
-        new_positions_m = [0.0] * len(self.clocks)
-
-        for field, digit in enumerate(digits):
-            if not (0 <= digit < len(digits_pointer_pos_frac)): continue
-            
-            digit_data = digits_pointer_pos_frac[digit][0] # Using first style for each digit
-            hour_positions = digit_data[0]
-            minute_positions = digit_data[1]
-
-            for sub_index, clk_index in enumerate(self.digit_display_indices[field]):
-                new_positions_h[clk_index] = hour_positions[sub_index]
-                new_positions_m[clk_index] = minute_positions[sub_index]
-
-        return new_positions_h, new_positions_m
-
-    def run_animation(self, animation_func, new_digits, *args):
-        """Starts a new animation using a generator."""
-        pos_h, pos_m = self._get_digit_positions(new_digits)
-        self.animation_generator = animation_func(pos_h, pos_m, *args)
-        self.animation_name = animation_func.__name__.replace("animate_", " ").replace("_", " ").title()
+    def run_animation(self, animation_name, new_digits):
+        """Starts a new animation on the source."""
+        self.digits_to_display = new_digits
+        self.animation_name = animation_name
+        self.source.display(new_digits, animation_name)
 
     def run(self):
         """Main simulation loop."""
+        names = self.source.animation_names
+
         running = True
         while running:
             # --- Event Handling ---
@@ -189,48 +518,44 @@ class Simulator:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
                         running = False
+                    if not names:
+                        continue
                     # Set time with number keys
                     if pygame.K_0 <= event.key <= pygame.K_6:
                         num = event.key - pygame.K_0
-                        self.digits_to_display = [num, num+1, num+2, num+3] # e.g., 04:40
-                        self.run_animation(self.animate_shortest_path, self.digits_to_display)
-                    # Trigger animations with letter keys
-                    if event.key == pygame.K_s: self.run_animation(self.animate_shortest_path, self.digits_to_display)
-                    if event.key == pygame.K_w: self.run_animation(self.animate_straight_wave, self.digits_to_display)
-                    if event.key == pygame.K_o: self.run_animation(self.animate_opposing_pointers, self.digits_to_display)
-                    if event.key == pygame.K_f: self.run_animation(self.animate_focus, self.digits_to_display)
-                    if event.key == pygame.K_p: self.run_animation(self.animate_path_draw, self.digits_to_display)
-                    if event.key == pygame.K_g: self.run_animation(self.animate_game_of_life, self.digits_to_display)
-                    if event.key == pygame.K_z: self.run_animation(self.animate_zig_zag, self.digits_to_display)
-
-
-            # --- Animation Logic ---
-            if self.animation_generator:
-                try:
-                    next(self.animation_generator)
-                except StopIteration:
-                    self.animation_generator = None
-
-            # --- Update ---
-            for clock in self.clocks:
-                clock.update()
+                        self.run_animation(names[0], [num, num+1, num+2, num+3]) # e.g., 04:40
+                    # Select and trigger animations
+                    if event.key == pygame.K_RIGHT:
+                        self.selected = (self.selected + 1) % len(names)
+                    if event.key == pygame.K_LEFT:
+                        self.selected = (self.selected - 1) % len(names)
+                    if event.key == pygame.K_SPACE:
+                        self.run_animation(names[self.selected], self.digits_to_display)
 
             # --- Drawing ---
+            fractions = self.source.fractions()
             self.screen.fill(BACKGROUND_COLOR)
-            for clock in self.clocks:
-                clock.draw(self.screen)
+            for clk_index, clock in enumerate(self.clocks):
+                clock.draw(self.screen, fractions[HOUR_HANDS[clk_index]], fractions[MINUTE_HANDS[clk_index]])
             self._draw_ui()
             pygame.display.flip()
 
-            self.clock.tick(FPS)
+            # --- Update ---
+            self.source.advance(self.clock.tick(FPS) / 1000)
 
         pygame.quit()
 
     def _draw_ui(self):
         """Draws informational text on the screen."""
-        time_str = f"Displaying: {self.digits_to_display[0]}{self.digits_to_display[1]}:{self.digits_to_display[2]}{self.digits_to_display[3]}"
-        anim_str = f"Animation: {self.animation_name}"
-        controls_str = "Controls: [0-9] Set Time | [S,W,O,F,P,G] Animations | [Q] Quit"
+        names = self.source.animation_names
+        if names:
+            time_str = f"Displaying: {self.digits_to_display[0]}{self.digits_to_display[1]}:{self.digits_to_display[2]}{self.digits_to_display[3]}"
+            anim_str = f"Animation: {self.animation_name} | Selected: {names[self.selected]}"
+            controls_str = "Controls: [0-6] Set Time | [Left, Right] Select Animation | [Space] Run | [Q] Quit"
+        else:
+            time_str = "Replay"
+            anim_str = ""
+            controls_str = "Controls: [Q] Quit"
 
         time_surf = self.font.render(time_str, True, TEXT_COLOR)
         anim_surf = self.font.render(anim_str, True, TEXT_COLOR)
@@ -240,173 +565,71 @@ class Simulator:
         self.screen.blit(anim_surf, (20, 50))
         self.screen.blit(controls_surf, (20, SCREEN_HEIGHT - 40))
 
-    # --- ANIMATION GENERATORS ---
-    # Each animation is a generator that yields control back to the main loop each frame.
-    
-    def animate_shortest_path(self, pos_h, pos_m):
-        """Animation: Instantly sets targets for smooth interpolation."""
-        for clock_idx in range(len(self.clocks)):
-            self.clocks[clock_idx].hour_hand.set_target_frac(pos_h[clock_idx])
-            self.clocks[clock_idx].minute_hand.set_target_frac(pos_m[clock_idx])
-        yield
-
-    def animate_straight_wave(self, pos_h, pos_m):
-        """Animation: Aligns hands, then moves in a wave."""
-        start_ang_frac = 0.875
-        
-        # 1. Move all hands to starting line
-        for clock in self.clocks:
-            clock.hour_hand.set_target_frac(start_ang_frac - 0.5)
-            clock.minute_hand.set_target_frac(start_ang_frac)
-        yield from self._wait_for_clocks_to_settle(1.5)
-
-        # 2. Set final targets and trigger wave
-
-
-        for col in self.column_indices:
-            for clk_index in col:
-                self.clocks[clk_index].hour_hand.set_target_frac(pos_h[clk_index])
-                self.clocks[clk_index].minute_hand.set_target_frac(pos_m[clk_index])
-            yield from self._wait_for_duration(0.1) # Delay between columns
-        yield
-
-    def animate_opposing_pointers(self, pos_h, pos_m):
-        """Animation: All hands meet, then move out in opposite directions."""
-        start_ang_frac = 0.5 # 6 o'clock
-
-        # 1. Move all hands to the bottom
-        for clock in self.clocks:
-            clock.hour_hand.set_target_frac(start_ang_frac)
-            clock.minute_hand.set_target_frac(start_ang_frac)
-        yield from self._wait_for_clocks_to_settle(1.5)
-
-        for clk_index in range(len(self.clocks)):
-            self.clocks[clk_index].hour_hand.set_target_frac(pos_h[clk_index])
-            self.clocks[clk_index].minute_hand.set_target_frac(pos_m[clk_index])
-        yield
-
-    def animate_focus(self, pos_h, pos_m):
-        """Animation: All hands point to the center of the grid."""
-        center_x = SCREEN_WIDTH / 2
-        center_y = SCREEN_HEIGHT / 2
-
-        # 1. Point all hands to the center
-        for clock in self.clocks:
-            dx = center_x - clock.x
-            dy = center_y - clock.y
-            angle_rad = math.atan2(dx, -dy) # atan2(x, -y) for graphical angle
-            angle_frac = (angle_rad / (2 * math.pi)) % 1.0
-            clock.hour_hand.set_target_frac(angle_frac)
-            clock.minute_hand.set_target_frac(angle_frac)
-        yield from self._wait_for_clocks_to_settle(2.0)
-
-        for clk_index in range(len(self.clocks)):
-            self.clocks[clk_index].hour_hand.set_target_frac(pos_h[clk_index])
-            self.clocks[clk_index].minute_hand.set_target_frac(pos_m[clk_index])
-        yield
-
-    def animate_path_draw(self, pos_h, pos_m):
-        """Animation: Draws a continuous snake-like path."""
-        path = random.choice(self.hamiltonian_paths)
-        
-        direction_to_frac = {-8: 0.0, 8: 0.5, -1: 0.75, 1: 0.25}
-
-        for i, clk_index in enumerate(path):
-            in_dir = path[i-1] - clk_index if i > 0 else path[i+1] - clk_index
-            out_dir = path[i+1] - clk_index if i < len(path) - 1 else path[i-1] - clk_index
-
-            pos_h_frac = direction_to_frac.get(in_dir, 0.0)
-            pos_m_frac = direction_to_frac.get(out_dir, 0.5)
-
-            self.clocks[clk_index].hour_hand.set_target_frac(pos_h_frac)
-            self.clocks[clk_index].minute_hand.set_target_frac(pos_m_frac)
-            yield from self._wait_for_duration(0.07)
-        
-        yield from self._wait_for_duration(1.0) # Pause on the full path
-
-        for i, clk_index in enumerate(path):
-            pos_h_t = pos_h[clk_index]
-            pos_m_t = pos_m[clk_index]
-            self.clocks[clk_index].hour_hand.set_target_frac(pos_h_t)
-            self.clocks[clk_index].minute_hand.set_target_frac(pos_m_t)
-            yield from self._wait_for_duration(0.07)
-
-        yield
-
-    def animate_game_of_life(self, pos_h, pos_m):
-        """Animation: Runs Conway's Game of Life."""
-        num_generations = 10
-        alive_frac = (0.0, 0.5) # Pointing up
-        dead_frac = (0.25, 0.75) # Horizontal
-
-        grid = [[random.choice([True, False]) for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
-
-        for _ in range(num_generations):
-            # Display current grid
-            for r in range(GRID_ROWS):
-                for c in range(GRID_COLS):
-                    clk_index = r * GRID_COLS + c
-                    h_frac, m_frac = alive_frac if grid[r][c] else dead_frac
-                    self.clocks[clk_index].hour_hand.set_target_frac(h_frac)
-                    self.clocks[clk_index].minute_hand.set_target_frac(m_frac)
-            
-            yield from self._wait_for_clocks_to_settle(0.6)
-
-            # Calculate next state
-            new_grid = [[False] * GRID_COLS for _ in range(GRID_ROWS)]
-            for r in range(GRID_ROWS):
-                for c in range(GRID_COLS):
-                    live_neighbors = 0
-                    for dr in [-1, 0, 1]:
-                        for dc in [-1, 0, 1]:
-                            if dr == 0 and dc == 0: continue
-                            nr, nc = r + dr, c + dc
-                            if 0 <= nr < GRID_ROWS and 0 <= nc < GRID_COLS and grid[nr][nc]:
-                                live_neighbors += 1
-                    
-                    if grid[r][c] and live_neighbors in [2, 3]: new_grid[r][c] = True
-                    elif not grid[r][c] and live_neighbors == 3: new_grid[r][c] = True
-
-            # check if stable
-            if new_grid == grid:
-                yield from self._wait_for_clocks_to_settle(1.0)
-                break
-            grid = new_grid
-
-        # Move to final positions
-        for clk_index in range(len(self.clocks)):
-            self.clocks[clk_index].hour_hand.set_target_frac(pos_h[clk_index])
-            self.clocks[clk_index].minute_hand.set_target_frac(pos_m[clk_index])
-        yield
-
-    def animate_zig_zag(self, pos_h, pos_m):
-        zig_zag_pose_h = [
-            0.125, 0.125, 0.375, 0.875, 0.875, 0.125, 0.125, 0.125,
-            0.125, 0.125, 0.375, 0.875, 0.875, 0.125, 0.125, 0.125,
-            0.125, 0.125, 0.375, 0.875, 0.875, 0.125, 0.125, 0.125
-        ]
-        zig_zag_pose_m = [
-            0.625, 0.625, 0.625, 0.375, 0.375, 0.875, 0.625, 0.625,
-            0.625, 0.625, 0.625, 0.375, 0.375, 0.875, 0.625, 0.625,
-            0.625, 0.625, 0.625, 0.375, 0.375, 0.875, 0.625, 0.625
-        ]
-
-        for clk_index in range(len(self.clocks)):
-            self.clocks[clk_index].hour_hand.set_target_frac(zig_zag_pose_h[clk_index])
-            self.clocks[clk_index].minute_hand.set_target_frac(zig_zag_pose_m[clk_index])
-
-    def _wait_for_clocks_to_settle(self, duration_s):
-        """Helper generator to wait for a fixed duration."""
-        start_time = time.time()
-        while time.time() - start_time < duration_s:
-            yield
-
-    def _wait_for_duration(self, duration_s):
-        """Helper generator to wait for a fixed duration."""
-        start_time = time.time()
-        while time.time() - start_time < duration_s:
-            yield
-
+def record_transition(animation_name, from_digits, to_digits, filename, seed=SEED):
+    """
+    Records the commands the firmware sends for one transition, without a window.
+
+    Args:
+        animation_name: key of DigitDisplay.animations.
+        from_digits: digits shown before the animation.
+        to_digits: digits the animation moves to.
+        filename: json lines file the recording is written to.
+        seed: seed of the random module, so random animations are reproducible.
+    """
+    firmware = FirmwareClock(from_digits, seed)
+    random.seed(seed)
+    recording = firmware.start_recording()
+    firmware.display(to_digits, animation_name)
+    settle_s = firmware.run_until_settled()
+    recording.stop()
+    recording.save(filename)
+    print(f"Recorded {len(recording.frames)} frames, settled after {settle_s:.2f} s, to '{filename}'.")
+
+def parse_digits(text):
+    if len(text) != 4 or not text.isdigit():
+        raise argparse.ArgumentTypeError("expected 4 digits like 1234")
+    return [int(digit) for digit in text]
+
+# --- Run the simulator ---
 if __name__ == "__main__":
-    sim = Simulator()
-    sim.run()
+    parser = argparse.ArgumentParser(description="Show the clock transitions in a window, or sweep them headless.")
+    parser.add_argument("--sweep", nargs="*", metavar="ANIMATION", default=None,
+                        help="record the commands of the DigitDisplay animations on the emulated firmware for all 1440 "
+                             "minute transitions and replay them batched without a window, all if none are given")
+    parser.add_argument("--every", type=int, default=1, metavar="N",
+                        help="sweep only the transition from every N-th minute of the day")
+    parser.add_argument("--jobs", type=int, default=None, help="processes the sweep records in, one per cpu by default")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record the commands the firmware sends, of the window session or of --animation")
+    parser.add_argument("--animation", help="record this DigitDisplay animation from --from to --to without a window")
+    parser.add_argument("--from", dest="from_digits", type=parse_digits, default=FROM_DIGITS)
+    parser.add_argument("--to", dest="to_digits", type=parse_digits, default=TO_DIGITS)
+    parser.add_argument("--replay", metavar="FILE", help="show a recording")
+    parser.add_argument("--describe", metavar="FILE", help="print the decoded commands of a recording, for diffing")
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+
+    # the emulated board changes the working directory to its flash
+    record_file = os.path.abspath(args.record) if args.record else None
+
+    if args.sweep is not None:
+        emulation.install()
+        from DigitDisplay import DigitDisplay
+
+        for name in args.sweep:
+            if name not in DigitDisplay.animations:
+                parser.error(f"unknown animation '{name}'")
+        sweep(args.sweep or list(DigitDisplay.animations), seed=args.seed, every=args.every, jobs=args.jobs)
+    elif args.describe:
+        print("\n".join(Recording.load(args.describe).describe()))
+    elif args.animation:
+        record_transition(args.animation, args.from_digits, args.to_digits, record_file or "recording.jsonl", args.seed)
+    elif args.replay:
+        Simulator(ReplayClock(args.replay), args.from_digits).run()
+    else:
+        firmware = FirmwareClock(args.from_digits, args.seed)
+        recording = firmware.start_recording() if record_file else None
+        Simulator(firmware, args.from_digits).run()
+        if recording:
+            recording.stop()
+            recording.save(record_file)